@@ -0,0 +1,93 @@
+"""Comparaison des codecs de sauvegarde: taille du fichier, temps d'écriture et de lecture
+
+    python benchmark_compression.py --saisons 5
+    python benchmark_compression.py --saisons 20 --repetitions 3 --json compression.json
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+
+import persistance
+from generateur_ligue import generer_ligue
+
+
+# Codec -> extension du fichier de sauvegarde
+EXTENSIONS = {
+    'aucun': '.json',
+    'gzip': '.json.gz',
+    'lzma': '.json.xz',
+    'zstd': '.json.zst',
+}
+
+
+def codecs_disponibles():
+    """Codecs utilisables ici (zstd seulement si le paquet zstandard est installé)"""
+    codecs = ['aucun', 'gzip', 'lzma']
+    try:
+        import zstandard  # noqa: F401
+        codecs.append('zstd')
+    except ImportError:
+        pass
+    return codecs
+
+
+def mesurer(systeme, codec, repertoire, repetitions):
+    """Écrire puis relire la sauvegarde avec un codec; retourne taille et meilleurs temps"""
+    chemin = os.path.join(repertoire, 'ligue' + EXTENSIONS[codec])
+    ecritures, lectures, chargements = [], [], []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        persistance.sauvegarder(systeme, chemin)
+        ecritures.append(time.perf_counter() - debut)
+
+        debut = time.perf_counter()
+        donnees = persistance.lire_fichier(chemin)
+        lectures.append(time.perf_counter() - debut)
+
+        debut = time.perf_counter()
+        persistance.importer_donnees(donnees)
+        chargements.append(time.perf_counter() - debut)
+
+    return {
+        'codec': codec,
+        'octets': os.path.getsize(chemin),
+        'ecriture_s': min(ecritures),
+        'lecture_s': min(lectures),
+        'import_s': min(chargements),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparer les codecs de compression des sauvegardes")
+    parser.add_argument('--saisons', type=int, default=5)
+    parser.add_argument('--stats-par-saison', type=int, default=60,
+                        help="Lignes de statistiques par joueur et par saison")
+    parser.add_argument('--repetitions', type=int, default=1)
+    parser.add_argument('--graine', type=int, default=42)
+    parser.add_argument('--json', help="Fichier où écrire les résultats")
+    args = parser.parse_args()
+
+    systeme = generer_ligue(nb_saisons=args.saisons, stats_par_joueur=args.stats_par_saison * args.saisons,
+                            graine=args.graine)
+    resultats = []
+    with tempfile.TemporaryDirectory() as repertoire:
+        for codec in codecs_disponibles():
+            resultats.append(mesurer(systeme, codec, repertoire, args.repetitions))
+
+    reference = resultats[0]['octets']
+    print(f"{'Codec':<8} {'taille (Mo)':>12} {'ratio':>7} {'écriture (s)':>13} {'lecture (s)':>12} {'import (s)':>11}")
+    for r in resultats:
+        print(f"{r['codec']:<8} {r['octets'] / 1e6:>12.2f} {reference / r['octets']:>6.1f}x "
+              f"{r['ecriture_s']:>13.2f} {r['lecture_s']:>12.2f} {r['import_s']:>11.2f}")
+    if 'zstd' not in [r['codec'] for r in resultats]:
+        print("(zstd non mesuré: paquet zstandard absent)")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
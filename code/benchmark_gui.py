@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import time
+from generateur_ligue import generer_ligue
+
+
+# Tailles de ligue prédéfinies: (équipes, joueurs/équipe, saisons, matchs/saison, stats/joueur)
+TAILLES = {
+    'petite': (10, 10, 1, 200, 20),
+    'moyenne': (30, 15, 1, 1230, 60),
+    'grande': (120, 15, 3, 5000, 150),
+}
+
+
+def demarrer_affichage_virtuel(numero=99, timeout=5.0):
+    """Démarrer un serveur Xvfb si aucun affichage n'est disponible
+
+    Retourne le processus Xvfb lancé, ou None si un affichage existe déjà.
+    """
+    if os.environ.get('DISPLAY'):
+        return None
+
+    executable = shutil.which('Xvfb')
+    if not executable:
+        raise RuntimeError("Aucun affichage disponible et Xvfb est introuvable")
+
+    processus = subprocess.Popen(
+        [executable, f":{numero}", "-screen", "0", "1280x1024x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Attendre que le socket X11 soit prêt
+    socket_x11 = f"/tmp/.X11-unix/X{numero}"
+    limite = time.monotonic() + timeout
+    while not os.path.exists(socket_x11):
+        if processus.poll() is not None or time.monotonic() > limite:
+            processus.kill()
+            raise RuntimeError(f"Impossible de démarrer Xvfb sur :{numero}")
+        time.sleep(0.05)
+
+    os.environ['DISPLAY'] = f":{numero}"
+    return processus
+
+
+def creer_gui_benchmark(root, systeme):
+    """Créer une interface NBAGui sans popups bloquants, branchée sur le système fourni"""
+    from nba_gui import NBAGui
+
+    class NBAGuiBenchmark(NBAGui):
+        """NBAGui dont les popups sont neutralisés pour une exécution sans interaction"""
+
+        def charger_donnees_exemple(self):
+            pass
+
+        def show_success_popup(self, title, message):
+            pass
+
+        def show_error_popup(self, title, message):
+            pass
+
+        def show_warning_popup(self, title, message):
+            pass
+
+        def show_info_popup(self, title, message):
+            pass
+
+    gui = NBAGuiBenchmark(root)
+    gui.nba_system = systeme
+    gui.actualiser_comboboxes()
+    root.update()
+    return gui
+
+
+def mesurer(root, operation, repetitions):
+    """Mesurer une opération de bout en bout, rendu Tk inclus (en millisecondes)"""
+    durees = []
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = operation()
+        root.update()
+        durees.append((time.perf_counter() - debut) * 1000)
+
+        # Les fenêtres popup sont détruites hors du temps mesuré
+        for fenetre in root.winfo_children():
+            if fenetre.winfo_class() == 'Toplevel':
+                fenetre.destroy()
+        root.update()
+        del resultat
+
+    return {
+        'repetitions': repetitions,
+        'min_ms': min(durees),
+        'mediane_ms': statistics.median(durees),
+        'max_ms': max(durees),
+    }
+
+
+def scenarios(gui):
+    """Construire les opérations mesurées pour une interface donnée"""
+    systeme = gui.nba_system
+    equipe = max(systeme._equipes.values(), key=lambda e: len(e.joueurs))
+    joueur = max(systeme._joueurs_index.values(), key=lambda j: len(j._statistiques))
+    match = systeme._matchs[-1] if systeme._matchs else None
+
+    operations = {
+        'actualiser_equipes': gui.actualiser_equipes,
+        'actualiser_joueurs': gui.actualiser_joueurs,
+        'actualiser_matchs': gui.actualiser_matchs,
+        'actualiser_classement': gui.actualiser_classement,
+        'actualiser_top_joueurs': gui.actualiser_top_joueurs,
+        'actualiser_stats_generales': gui.actualiser_stats_generales,
+        'actualiser_comboboxes': gui.actualiser_comboboxes,
+        'create_equipe_details_window': lambda: gui.create_equipe_details_window(equipe),
+        'create_equipe_stats_window': lambda: gui.create_equipe_stats_window(equipe),
+        'create_joueur_stats_window': lambda: gui.create_joueur_stats_window(joueur),
+    }
+    if match:
+        operations['create_match_analysis_window'] = lambda: gui.create_match_analysis_window(match)
+    return operations
+
+
+def executer_benchmark(tailles, repetitions=5, graine=42):
+    """Exécuter le benchmark pour chaque taille de ligue et retourner les résultats"""
+    import tkinter as tk
+
+    resultats = {}
+    for nom_taille in tailles:
+        nb_equipes, joueurs, saisons, matchs, stats = TAILLES[nom_taille]
+        systeme = generer_ligue(nb_equipes, joueurs, saisons, matchs, stats, graine=graine)
+
+        root = tk.Tk()
+        try:
+            gui = creer_gui_benchmark(root, systeme)
+            resultats[nom_taille] = {
+                'equipes': len(systeme._equipes),
+                'joueurs': len(systeme._joueurs_index),
+                'matchs': len(systeme._matchs),
+                'operations': {nom: mesurer(root, operation, repetitions)
+                               for nom, operation in scenarios(gui).items()}
+            }
+        finally:
+            root.destroy()
+
+    return resultats
+
+
+def afficher_resultats(resultats):
+    """Afficher les résultats sous forme de tableau"""
+    for nom_taille, resultat in resultats.items():
+        print(f"=== Ligue {nom_taille}: {resultat['equipes']} équipes, "
+              f"{resultat['joueurs']} joueurs, {resultat['matchs']} matchs ===")
+        print(f"{'Opération':<32} {'min (ms)':>10} {'médiane':>10} {'max':>10}")
+        for nom, mesure in resultat['operations'].items():
+            print(f"{nom:<32} {mesure['min_ms']:>10.1f} {mesure['mediane_ms']:>10.1f} {mesure['max_ms']:>10.1f}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de latence de l'interface NBA (Tk sans écran)")
+    parser.add_argument('--tailles', default='petite,moyenne',
+                        help=f"Tailles de ligue séparées par des virgules parmi: {', '.join(TAILLES)}")
+    parser.add_argument('--repetitions', type=int, default=5)
+    parser.add_argument('--graine', type=int, default=42)
+    parser.add_argument('--json', help="Fichier où écrire les résultats pour le suivi dans le temps")
+    args = parser.parse_args()
+
+    tailles = [t.strip() for t in args.tailles.split(',') if t.strip()]
+    inconnues = [t for t in tailles if t not in TAILLES]
+    if inconnues:
+        parser.error(f"Taille(s) inconnue(s): {', '.join(inconnues)}")
+
+    xvfb = demarrer_affichage_virtuel()
+    try:
+        resultats = executer_benchmark(tailles, args.repetitions, args.graine)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+            xvfb.wait()
+
+    afficher_resultats(resultats)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(resultats, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""Comparaison de l'ajout ligne à ligne et de l'ajout en masse des matchs et statistiques
+
+Les lignes d'une ligue générée sont ajoutées à un système ne contenant que
+les équipes et les joueurs, une fois par ajouter_match / ajouter_statistiques,
+une fois par ajouter_matchs_en_masse / ajouter_statistiques_en_masse; les deux
+systèmes obtenus doivent être identiques. Une vérification préalable
+ajoute des points, passes et rebonds décimaux (moyennes).
+
+    python benchmark_ingestion.py --saisons 3
+    python benchmark_ingestion.py --saisons 10 --facteur 10
+"""
+import argparse
+import sys
+import time
+from datetime import datetime
+
+import persistance
+from generateur_ligue import generer_ligue
+from nba_system import NBASystem
+from statistique_joueur import HistoriqueStatistiques
+
+# Moyennes décimales, comme celles des données d'exemple de l'interface
+LIGNES_DECIMALES = [
+    ("Michael Jordan", 38.2, 30.1, 6.2, 5.2, datetime(2024, 1, 15)),
+    ("Michael Jordan", 40.5, 33, 7, 6, datetime(2024, 1, 20)),
+    ("LeBron James", 36.9, 27, 7, 7, datetime(2024, 1, 15)),
+    ("LeBron James", 38.0, 29.0, 8.0, 7.0, datetime(2024, 1, 20)),
+]
+
+
+def _systeme_decimales():
+    systeme = NBASystem()
+    systeme.ajouter_equipe("Chicago Bulls", "Chicago")
+    for nom in ("Michael Jordan", "LeBron James"):
+        systeme.ajouter_joueur_a_equipe("Chicago Bulls", nom, "USA", 2003, "Small Forward")
+    return systeme
+
+
+def verifier_valeurs_decimales():
+    """Non-régression: des points, passes ou rebonds décimaux n'altèrent pas l'alignement des historiques
+
+    Les deux modes d'ajout doivent les accepter et donner le même système.
+    """
+    en_masse = _systeme_decimales()
+    en_masse.ajouter_statistiques_en_masse(LIGNES_DECIMALES)
+    systeme = _systeme_decimales()
+    for ligne in LIGNES_DECIMALES:
+        systeme.ajouter_statistiques(*ligne)
+    if persistance.exporter_donnees(systeme) != persistance.exporter_donnees(en_masse):
+        raise AssertionError("Les deux modes d'ajout ne donnent pas le même système avec des valeurs décimales")
+    for nom, joueur in systeme._joueurs_index.items():
+        for colonne in ('points', 'passes', 'rebonds'):
+            if (getattr(joueur._statistiques, colonne).typecode
+                    != getattr(en_masse.rechercher_joueur(nom)._statistiques, colonne).typecode):
+                raise AssertionError(f"Colonne {colonne} de {nom} de type différent selon le mode d'ajout")
+
+    historique = systeme.rechercher_joueur("Michael Jordan")._statistiques
+    try:
+        historique.etendre((30.0,), (30,), (1,), (1,), (2 ** 40,))
+    except OverflowError:
+        pass
+    for joueur in systeme._joueurs_index.values():
+        historique = joueur._statistiques
+        if {len(getattr(historique, nom)) for nom in HistoriqueStatistiques.__slots__} != {2}:
+            raise AssertionError(f"Historique désaligné pour {joueur.nom}")
+    if systeme.rechercher_joueur("Michael Jordan").calculer_moyennes()['points'] != (30.1 + 33) / 2:
+        raise AssertionError("Moyenne de points décimaux incorrecte")
+    # Valeurs entières (même écrites 29.0) gardées en colonnes entières
+    if systeme.rechercher_joueur("LeBron James")._statistiques.points.typecode != 'i':
+        raise AssertionError("Colonne entière passée en réels sans valeur décimale")
+
+
+def systeme_vide(donnees):
+    """Système avec les équipes et joueurs de la ligue, sans matchs ni statistiques"""
+    return persistance.importer_donnees({
+        'equipes': donnees['equipes'],
+        'joueurs': [dict(joueur, statistiques=[]) for joueur in donnees['joueurs']],
+    })
+
+
+def mesurer(donnees, matchs, statistiques, repetitions):
+    """Meilleurs temps des deux modes d'ajout; vérifie qu'ils donnent le même système"""
+    temps = {'ligne_a_ligne': [], 'en_masse': []}
+    exports = {}
+    for _ in range(repetitions):
+        systeme = systeme_vide(donnees)
+        debut = time.perf_counter()
+        for ligne in statistiques:
+            systeme.ajouter_statistiques(*ligne)
+        for ligne in matchs:
+            systeme.ajouter_match(*ligne)
+        temps['ligne_a_ligne'].append(time.perf_counter() - debut)
+        exports['ligne_a_ligne'] = persistance.exporter_donnees(systeme)
+
+        systeme = systeme_vide(donnees)
+        debut = time.perf_counter()
+        systeme.ajouter_statistiques_en_masse(statistiques)
+        systeme.ajouter_matchs_en_masse(matchs)
+        temps['en_masse'].append(time.perf_counter() - debut)
+        exports['en_masse'] = persistance.exporter_donnees(systeme)
+
+    if exports['ligne_a_ligne'] != exports['en_masse']:
+        raise AssertionError("Les deux modes d'ajout ne donnent pas le même système")
+    return {mode: min(durees) for mode, durees in temps.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparer l'ajout ligne à ligne et l'ajout en masse")
+    parser.add_argument('--saisons', type=int, default=3)
+    parser.add_argument('--stats-par-saison', type=int, default=60,
+                        help="Lignes de statistiques par joueur et par saison")
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--graine', type=int, default=42)
+    parser.add_argument('--facteur', type=float, default=1.0,
+                        help="Accélération minimale exigée de l'ajout en masse")
+    args = parser.parse_args()
+
+    import numpy  # noqa: F401  (import hors mesure: utilisé par l'ajout en masse)
+
+    verifier_valeurs_decimales()
+
+    donnees = persistance.exporter_donnees(generer_ligue(
+        nb_saisons=args.saisons, stats_par_joueur=args.stats_par_saison * args.saisons, graine=args.graine))
+    matchs = list(persistance.iterer_lignes_matchs(donnees))
+    statistiques = list(persistance.iterer_lignes_statistiques(donnees))
+
+    resultats = mesurer(donnees, matchs, statistiques, args.repetitions)
+    acceleration = resultats['ligne_a_ligne'] / resultats['en_masse']
+    print(f"{len(statistiques)} statistiques, {len(matchs)} matchs")
+    print(f"ligne à ligne {resultats['ligne_a_ligne']:>8.3f} s")
+    print(f"en masse      {resultats['en_masse']:>8.3f} s   ({acceleration:.1f}x)")
+    if acceleration < args.facteur:
+        print(f"Accélération inférieure au facteur demandé ({args.facteur}x)")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Rejeu historique en parallèle sur un instantané de la ligue en mémoire partagée
+
+Le classement et le top des joueurs sont recalculés à une série de dates,
+une fois dans le processus courant, une fois répartis sur plusieurs processus
+attachés à l'instantané; les résultats doivent être identiques. Le coût de
+l'attachement est comparé à celui de l'envoi du moteur sérialisé (pickle)
+à chaque processus.
+
+    python benchmark_instantane.py --saisons 5 --processus 4
+"""
+import argparse
+import os
+import pickle
+import time
+
+import numpy as np
+
+from generateur_ligue import generer_ligue
+from instantane_partage import InstantanePartage, attacher
+from moteur_analytique import CRITERES, MoteurAnalytique
+
+
+def rejouer(moteur, jour):
+    """Classement et meilleurs joueurs de chaque critère après les matchs joués jusqu'au jour"""
+    return (moteur.classement(jour),
+            {critere: moteur.meilleurs_joueurs(critere, 10, jour) for critere in CRITERES})
+
+
+def chronometrer(fonction, repetitions):
+    meilleur = None
+    for _ in range(repetitions):
+        debut = time.perf_counter()
+        resultat = fonction()
+        duree = time.perf_counter() - debut
+        meilleur = duree if meilleur is None else min(meilleur, duree)
+    return meilleur, resultat
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rejeu historique multi-processus sur mémoire partagée")
+    parser.add_argument('--saisons', type=int, default=5)
+    parser.add_argument('--stats-par-saison', type=int, default=60,
+                        help="Lignes de statistiques par joueur et par saison")
+    parser.add_argument('--dates', type=int, default=200, help="Nombre de dates rejouées")
+    parser.add_argument('--processus', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--graine', type=int, default=42)
+    args = parser.parse_args()
+
+    systeme = generer_ligue(nb_saisons=args.saisons, stats_par_joueur=args.stats_par_saison * args.saisons,
+                            graine=args.graine)
+    moteur = MoteurAnalytique.depuis_systeme(systeme)
+    jours = moteur.matchs['jour']
+    dates = [(int(j),) for j in np.linspace(jours.min(), jours.max(), args.dates).astype(np.int64)]
+
+    debut = time.perf_counter()
+    instantane = InstantanePartage.publier(moteur)
+    duree_publication = time.perf_counter() - debut
+    with instantane:
+        duree_attachement, _ = chronometrer(lambda: attacher(instantane.manifeste), 1)
+        serialise = pickle.dumps(moteur, protocol=pickle.HIGHEST_PROTOCOL)
+        duree_pickle, _ = chronometrer(lambda: pickle.loads(pickle.dumps(moteur, protocol=pickle.HIGHEST_PROTOCOL)),
+                                       args.repetitions)
+
+        duree_local, attendu = chronometrer(lambda: [rejouer(moteur, *d) for d in dates], args.repetitions)
+        duree_parallele, obtenu = chronometrer(lambda: instantane.executer(rejouer, dates, args.processus),
+                                               args.repetitions)
+        if obtenu != attendu:
+            raise AssertionError("Le rejeu sur l'instantané partagé ne donne pas les mêmes résultats")
+
+        print(f"{len(moteur.lignes['joueur'])} statistiques, {len(jours)} matchs, {len(dates)} dates, "
+              f"{args.processus} processus ({os.cpu_count()} coeurs)")
+        print(f"segment partagé   {instantane.taille / 1e6:>8.2f} Mo   publication {duree_publication:.3f} s")
+        print(f"attachement       {duree_attachement * 1000:>8.2f} ms   "
+              f"(pickle aller-retour du moteur: {duree_pickle * 1000:.2f} ms, {len(serialise) / 1e6:.2f} Mo)")
+        print(f"rejeu local       {duree_local:>8.3f} s")
+        print(f"rejeu parallèle   {duree_parallele:>8.3f} s   ({duree_local / duree_parallele:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""Mesure de la mémoire occupée par une ligue générée (tracemalloc)
+
+La ligue est générée dans un interpréteur neuf, pour la version courante du
+code et éventuellement pour une version de référence (autre extraction du
+dépôt); le script échoue (code 1) si le gain obtenu est inférieur au facteur
+demandé.
+
+    python benchmark_memoire.py --saisons 20
+    python benchmark_memoire.py --saisons 20 --reference /tmp/ancienne/code --facteur 3
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+
+REPERTOIRE = os.path.dirname(os.path.abspath(__file__))
+
+# Exécuté dans l'interpréteur neuf: seule la ligue reste allouée au moment de la mesure
+_SCRIPT = """
+import gc, json, sys, time, tracemalloc
+from generateur_ligue import generer_ligue
+tracemalloc.start()
+debut = time.perf_counter()
+systeme = generer_ligue(nb_saisons={saisons}, stats_par_joueur={stats}, graine={graine})
+duree = time.perf_counter() - debut
+gc.collect()
+actuelle, pic = tracemalloc.get_traced_memory()
+print(json.dumps({{'octets': actuelle, 'pic': pic, 'duree': duree,
+                  'matchs': len(systeme._matchs),
+                  'statistiques': sum(len(j._statistiques) for j in systeme._joueurs_index.values())}}))
+"""
+
+
+def mesurer(repertoire, saisons, stats_par_saison, graine):
+    """Générer la ligue avec le code du répertoire et retourner les mesures mémoire"""
+    script = _SCRIPT.format(saisons=saisons, stats=stats_par_saison * saisons, graine=graine)
+    resultat = subprocess.run([sys.executable, '-c', script], cwd=repertoire,
+                              capture_output=True, text=True, check=True)
+    return json.loads(resultat.stdout.strip().splitlines()[-1])
+
+
+def afficher(libelle, mesure):
+    print(f"{libelle:<12} {mesure['octets'] / 1e6:>10.1f} Mo (pic {mesure['pic'] / 1e6:.1f} Mo, "
+          f"{mesure['matchs']} matchs, {mesure['statistiques']} statistiques, {mesure['duree']:.1f} s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesurer la mémoire occupée par une ligue générée")
+    parser.add_argument('--saisons', type=int, default=20)
+    parser.add_argument('--stats-par-saison', type=int, default=60,
+                        help="Lignes de statistiques par joueur et par saison")
+    parser.add_argument('--graine', type=int, default=42)
+    parser.add_argument('--reference', help="Répertoire code/ d'une autre version à comparer")
+    parser.add_argument('--facteur', type=float, default=1.0,
+                        help="Gain minimal exigé par rapport à la référence")
+    args = parser.parse_args()
+
+    courante = mesurer(REPERTOIRE, args.saisons, args.stats_par_saison, args.graine)
+    afficher('courante', courante)
+    if not args.reference:
+        return 0
+
+    reference = mesurer(os.path.abspath(args.reference), args.saisons, args.stats_par_saison, args.graine)
+    afficher('référence', reference)
+    gain = reference['octets'] / courante['octets']
+    print(f"Gain: {gain:.2f}x")
+    if gain < args.facteur:
+        print(f"ÉCHEC - gain de {gain:.2f}x inférieur à {args.facteur:.2f}x")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import functools
+from collections import OrderedDict
+
+
+class CacheRequetes:
+    """Cache LRU des résultats de requêtes, avec compteurs de succès et d'échecs
+
+    Les clés incluent un numéro de version des données consultées: une
+    mutation change la version, si bien que les anciens résultats ne sont
+    plus jamais relus et finissent évincés par l'ordre LRU.
+    """
+
+    def __init__(self, taille_max=256):
+        if taille_max < 1:
+            raise ValueError("La taille du cache doit être strictement positive")
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()
+        self.succes = 0
+        self.echecs = 0
+        self.evictions = 0
+
+    def obtenir(self, cle, calcul):
+        """Retourner le résultat associé à la clé, en le calculant au premier appel"""
+        try:
+            valeur = self._entrees[cle]
+        except KeyError:
+            self.echecs += 1
+            valeur = self._entrees[cle] = calcul()
+            if len(self._entrees) > self.taille_max:
+                self._entrees.popitem(last=False)
+                self.evictions += 1
+            return valeur
+
+        self.succes += 1
+        self._entrees.move_to_end(cle)
+        return valeur
+
+    def vider(self):
+        """Oublier tous les résultats (les compteurs sont conservés)"""
+        self._entrees.clear()
+
+    def statistiques(self):
+        """Taille, succès, échecs, évictions et taux de succès du cache"""
+        total = self.succes + self.echecs
+        return {
+            'taille': len(self._entrees),
+            'taille_max': self.taille_max,
+            'succes': self.succes,
+            'echecs': self.echecs,
+            'evictions': self.evictions,
+            'taux_succes': self.succes / total if total else 0.0
+        }
+
+
+def _copier(valeur):
+    """Copie des conteneurs du résultat (listes, tuples, dictionnaires, à toute profondeur)
+
+    Les autres objets (équipes, joueurs, matchs) sont ceux du système et ne
+    sont pas copiés.
+    """
+    if type(valeur) is list:
+        return [_copier(v) for v in valeur]
+    if type(valeur) is tuple:
+        return tuple(_copier(v) for v in valeur)
+    if type(valeur) is dict:
+        return {cle: _copier(v) for cle, v in valeur.items()}
+    return valeur
+
+
+def memoiser(version):
+    """Décorateur de méthode: mémoriser le résultat selon les arguments et version(self, *args)
+
+    L'objet décoré doit avoir un attribut _cache (CacheRequetes). Les
+    conteneurs du résultat sont copiés à chaque appel, y compris ceux
+    imbriqués (dictionnaire de moyennes de obtenir_top_joueurs), pour qu'un
+    appelant qui modifie ce qu'il reçoit n'altère pas le cache.
+    """
+    def decorateur(methode):
+        @functools.wraps(methode)
+        def wrapper(self, *args, **kwargs):
+            cle = (methode.__name__, args, tuple(sorted(kwargs.items())), version(self, *args, **kwargs))
+            return _copier(self._cache.obtenir(cle, lambda: methode(self, *args, **kwargs)))
+        return wrapper
+    return decorateur
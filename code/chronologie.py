@@ -0,0 +1,143 @@
+from bisect import bisect_right
+
+
+class SerieCumulee:
+    """Sommes cumulées de valeurs datées, triées par date
+
+    cumuls[i] contient la somme des i premières lignes, ce qui donne les
+    totaux à n'importe quelle date par une seule bissection.
+    """
+
+    def __init__(self, largeur):
+        self.largeur = largeur
+        self.dates = []
+        self.cumuls = [(0,) * largeur]
+
+    def peut_etendre(self, lignes):
+        """Vrai si les lignes (date, valeurs) prolongent la série dans l'ordre chronologique"""
+        precedente = self.dates[-1] if self.dates else None
+        for date, _ in lignes:
+            if precedente is not None and date < precedente:
+                return False
+            precedente = date
+        return True
+
+    def etendre(self, lignes):
+        """Ajouter des lignes (date, valeurs); retourne False si l'ordre chronologique serait rompu"""
+        if not self.peut_etendre(lignes):
+            return False
+        for date, valeurs in lignes:
+            self.dates.append(date)
+            self.cumuls.append(tuple(c + v for c, v in zip(self.cumuls[-1], valeurs)))
+        return True
+
+    def au(self, date):
+        """Nombre de lignes et totaux à la date incluse"""
+        i = bisect_right(self.dates, date)
+        return i, self.cumuls[i]
+
+
+def _ligne_statistique(stat):
+    return stat.date_match, (stat.temps_jeu, stat.points, stat.passes, stat.rebonds, stat.calculer_efficacite())
+
+
+class Chronologie:
+    """Vues historiques du système: classement et moyennes à une date donnée
+
+    Les séries cumulées sont construites à la première requête puis étendues
+    avec les seuls matchs et statistiques ajoutés depuis (détectés par leur
+    nombre); un ajout antérieur à la dernière date connue entraîne la
+    reconstruction de la série concernée.
+    """
+
+    def __init__(self, systeme):
+        self._systeme = systeme
+        self._nb_matchs = 0
+        self._bilans = {}
+        # Nom du joueur -> (série, nombre de lignes de statistiques couvertes)
+        self._series_joueurs = {}
+
+    def invalider(self):
+        """Oublier toutes les séries (matchs ou statistiques retirés du système)"""
+        self._nb_matchs = 0
+        self._bilans = {}
+        self._series_joueurs = {}
+
+    def _synchroniser_matchs(self):
+        matchs = self._systeme._matchs
+        if self._nb_matchs == len(matchs):
+            return
+        if self._nb_matchs > len(matchs) or not self._integrer(matchs[self._nb_matchs:]):
+            # Match arrivé en retard: reconstruire toutes les séries dans l'ordre chronologique
+            self._bilans = {}
+            # Tri stable: les matchs d'une même date gardent leur ordre d'enregistrement
+            self._integrer(sorted(matchs, key=lambda m: m.date))
+        self._nb_matchs = len(matchs)
+
+    def _integrer(self, matchs):
+        lignes = {}
+        for match in matchs:
+            gagnant = match.get_equipe_gagnante()
+            for equipe in (match.equipe_domicile, match.equipe_exterieur):
+                if gagnant is None:
+                    valeurs = (0, 0)
+                else:
+                    valeurs = (1, 0) if equipe is gagnant else (0, 1)
+                lignes.setdefault(equipe.nom, []).append((match.date, valeurs))
+
+        # Vérifier l'ordre avant toute modification, pour ne jamais étendre partiellement
+        for nom, lignes_equipe in lignes.items():
+            if not self._bilans.get(nom, SerieCumulee(2)).peut_etendre(lignes_equipe):
+                return False
+        for nom, lignes_equipe in lignes.items():
+            self._bilans.setdefault(nom, SerieCumulee(2)).etendre(lignes_equipe)
+        return True
+
+    def bilan_au(self, nom_equipe, date):
+        """Victoires et défaites d'une équipe après les matchs joués jusqu'à la date incluse"""
+        self._synchroniser_matchs()
+        serie = self._bilans.get(nom_equipe)
+        if serie is None:
+            return 0, 0
+        return serie.au(date)[1]
+
+    def classement_au(self, date):
+        """Classement à la date: liste de (équipe, victoires, défaites), trié comme obtenir_classement"""
+        self._synchroniser_matchs()
+        classement = []
+        for nom, serie in self._bilans.items():
+            victoires, defaites = serie.au(date)[1]
+            if victoires + defaites > 0:
+                classement.append((self._systeme._equipes.get(nom), victoires, defaites))
+
+        return sorted([c for c in classement if c[0] is not None],
+                      key=lambda c: (c[1] / (c[1] + c[2]), c[1]), reverse=True)
+
+    def _serie_joueur(self, joueur):
+        serie, couvertes = self._series_joueurs.get(joueur.nom, (None, 0))
+        statistiques = joueur._statistiques
+        if serie is not None and couvertes == len(statistiques):
+            return serie
+
+        if serie is None or couvertes > len(statistiques):
+            serie, couvertes = SerieCumulee(5), 0
+        if not serie.etendre([_ligne_statistique(s) for s in statistiques[couvertes:]]):
+            # Ligne arrivée en retard: reconstruire la série du joueur dans l'ordre chronologique
+            serie = SerieCumulee(5)
+            serie.etendre(sorted((_ligne_statistique(s) for s in statistiques), key=lambda l: l[0]))
+        self._series_joueurs[joueur.nom] = (serie, len(statistiques))
+        return serie
+
+    def moyennes_au(self, joueur, date):
+        """Moyennes du joueur sur les matchs joués jusqu'à la date incluse (None si aucun)"""
+        nb_matchs, (temps, points, passes, rebonds, efficacite) = self._serie_joueur(joueur).au(date)
+        if nb_matchs == 0:
+            return None
+        return {
+            'temps_jeu': temps / nb_matchs,
+            'points': points / nb_matchs,
+            'passes': passes / nb_matchs,
+            'rebonds': rebonds / nb_matchs,
+            'matchs_joues': nb_matchs,
+            'efficacite_moyenne': efficacite / nb_matchs
+        }
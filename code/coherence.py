@@ -0,0 +1,155 @@
+class VerificateurCoherence:
+    """Vérification incrémentale des invariants du système NBA
+
+    Le système signale chaque mutation (joueur, équipe ou match modifié); seules
+    les entités signalées depuis la dernière vérification sont réexaminées, les
+    incohérences déjà connues des autres entités étant conservées. L'audit
+    complet reste disponible pour détecter les modifications faites hors du
+    système (par exemple directement sur un objet Equipe).
+    """
+
+    def __init__(self, systeme):
+        self._systeme = systeme
+        self._joueurs_modifies = set()
+        self._equipes_modifiees = set()
+        self._matchs_a_verifier = []
+        # Bilans déduits des matchs enregistrés: nom d'équipe -> [victoires, défaites]
+        self._bilans_attendus = {}
+        # Incohérences connues par entité, dans l'ordre d'apparition
+        self._incoherences_joueurs = {}
+        self._incoherences_equipes = {}
+        self._incoherences_matchs = {}
+
+    def joueur_modifie(self, nom_joueur):
+        """Signaler qu'un joueur a été ajouté ou a changé d'équipe"""
+        self._joueurs_modifies.add(nom_joueur)
+
+    def equipe_modifiee(self, nom_equipe):
+        """Signaler qu'une équipe a été ajoutée ou que son effectif a changé"""
+        self._equipes_modifiees.add(nom_equipe)
+
+    def match_ajoute(self, numero, match):
+        """Signaler l'ajout d'un match (numero commence à 1)"""
+        self._matchs_a_verifier.append((numero, match))
+
+        gagnant = match.get_equipe_gagnante()
+        perdant = match.get_equipe_perdante()
+        if gagnant is not None:
+            self._bilans_attendus.setdefault(gagnant.nom, [0, 0])[0] += 1
+            self._bilans_attendus.setdefault(perdant.nom, [0, 0])[1] += 1
+            self._equipes_modifiees.add(gagnant.nom)
+            self._equipes_modifiees.add(perdant.nom)
+
+    def matchs_retires(self, matchs):
+        """Signaler le retrait des derniers matchs du système (annulation d'une transaction)"""
+        for match in matchs:
+            gagnant = match.get_equipe_gagnante()
+            perdant = match.get_equipe_perdante()
+            if gagnant is not None:
+                self._bilans_attendus[gagnant.nom][0] -= 1
+                self._bilans_attendus[perdant.nom][1] -= 1
+                self._equipes_modifiees.add(gagnant.nom)
+                self._equipes_modifiees.add(perdant.nom)
+        nb_matchs = len(self._systeme._matchs)
+        self._matchs_a_verifier = [(numero, m) for numero, m in self._matchs_a_verifier if numero <= nb_matchs]
+        for numero in [n for n in self._incoherences_matchs if n > nb_matchs]:
+            del self._incoherences_matchs[numero]
+
+    def matchs_renumerotes(self):
+        """Signaler que des matchs ont été retirés ou réinsérés: tous les numéros changent"""
+        self._incoherences_matchs.clear()
+        self._matchs_a_verifier = list(enumerate(self._systeme._matchs, 1))
+
+    def verifier(self):
+        """Réexaminer les entités modifiées et retourner toutes les incohérences connues"""
+        for nom in self._joueurs_modifies:
+            self._mettre_a_jour(self._incoherences_joueurs, nom, self._verifier_joueur(nom))
+        for nom in self._equipes_modifiees:
+            self._mettre_a_jour(self._incoherences_equipes, nom, self._verifier_equipe(nom))
+        for numero, match in self._matchs_a_verifier:
+            self._mettre_a_jour(self._incoherences_matchs, numero, self._verifier_match(numero, match))
+
+        self._joueurs_modifies.clear()
+        self._equipes_modifiees.clear()
+        self._matchs_a_verifier.clear()
+
+        return self._incoherences_connues()
+
+    def audit_complet(self):
+        """Réexaminer toutes les entités du système, en recalculant les bilans depuis les matchs"""
+        self._bilans_attendus = {}
+        self._incoherences_joueurs.clear()
+        self._incoherences_equipes.clear()
+        self._incoherences_matchs.clear()
+
+        for numero, match in enumerate(self._systeme._matchs, 1):
+            self.match_ajoute(numero, match)
+        # Les matchs des saisons compactées ne sont plus des objets: reprendre leurs bilans
+        for saison in self._systeme._saisons.values():
+            if saison.etat in ('compactee', 'dechargee'):
+                for nom, (victoires, defaites) in saison._bilans.items():
+                    bilan = self._bilans_attendus.setdefault(nom, [0, 0])
+                    bilan[0] += victoires
+                    bilan[1] += defaites
+        self._joueurs_modifies.update(self._systeme._joueurs_index)
+        self._equipes_modifiees.update(self._systeme._equipes)
+
+        return self.verifier()
+
+    def _incoherences_connues(self):
+        incoherences = []
+        for index in (self._incoherences_joueurs, self._incoherences_equipes, self._incoherences_matchs):
+            for messages in index.values():
+                incoherences.extend(messages)
+        return incoherences
+
+    @staticmethod
+    def _mettre_a_jour(index, cle, messages):
+        if messages:
+            index[cle] = messages
+        else:
+            index.pop(cle, None)
+
+    def _verifier_joueur(self, nom):
+        joueur = self._systeme._joueurs_index.get(nom)
+        if joueur is None:
+            return []
+
+        # Vérifier les joueurs sans équipe
+        if joueur.equipe is None:
+            return [f"Joueur {nom} n'appartient à aucune équipe"]
+
+        # Vérifier si le joueur est bien dans l'équipe associée
+        if not joueur.equipe.contient_joueur(joueur):
+            return [f"Incohérence: {nom} associé à {joueur.equipe.nom} mais pas dans la liste des joueurs"]
+
+        return []
+
+    def _verifier_equipe(self, nom_equipe):
+        equipe = self._systeme._equipes.get(nom_equipe)
+        if equipe is None:
+            return []
+
+        messages = []
+
+        # Vérifier les équipes avec trop de joueurs
+        nb_joueurs = len(equipe.joueurs)
+        if nb_joueurs > equipe.MAX_JOUEURS:
+            messages.append(f"Équipe {nom_equipe} a {nb_joueurs} joueurs (max: {equipe.MAX_JOUEURS})")
+
+        # Vérifier que le bilan correspond aux résultats des matchs
+        victoires, defaites = self._bilans_attendus.get(nom_equipe, (0, 0))
+        if (equipe.victoires, equipe.defaites) != (victoires, defaites):
+            messages.append(f"Équipe {nom_equipe}: bilan {equipe.victoires}V/{equipe.defaites}D "
+                            f"différent des résultats des matchs ({victoires}V/{defaites}D)")
+
+        return messages
+
+    def _verifier_match(self, numero, match):
+        # Vérifier les matchs avec des équipes inexistantes
+        messages = []
+        if match.equipe_domicile.nom not in self._systeme._equipes:
+            messages.append(f"Match {numero}: équipe domicile {match.equipe_domicile.nom} n'existe pas")
+        if match.equipe_exterieur.nom not in self._systeme._equipes:
+            messages.append(f"Match {numero}: équipe extérieur {match.equipe_exterieur.nom} n'existe pas")
+        return messages
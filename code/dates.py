@@ -0,0 +1,16 @@
+from datetime import datetime
+
+# Ordinaux partagés: un seul objet int par jour, quel que soit le nombre de
+# matchs ou de lignes de statistiques datés de ce jour
+_JOURS = {}
+
+
+def vers_jour(date):
+    """Ordinal du jour (date.toordinal) d'une date ou d'un datetime; l'heure est ignorée"""
+    jour = date.toordinal()
+    return _JOURS.setdefault(jour, jour)
+
+
+def depuis_jour(jour):
+    """datetime à minuit correspondant à un ordinal de jour"""
+    return datetime.fromordinal(jour)
@@ -0,0 +1,141 @@
+from bisect import bisect_right
+
+
+NOTE_INITIALE = 1500.0
+
+
+class NotesElo:
+    """Notes Elo des équipes, mises à jour à chaque match
+
+    La variation tient compte de l'avantage du terrain et de l'écart de points
+    (multiplicateur amorti selon l'écart de notes, pour limiter l'inflation des
+    favoris). L'historique de chaque équipe est conservé par date croissante,
+    ce qui permet d'interroger les notes à n'importe quelle date par bissection.
+    Un match plus ancien que le dernier traité impose de rejouer l'historique,
+    une seule fois, à la requête suivante.
+    """
+
+    def __init__(self, k=20.0, avantage_domicile=100.0, note_initiale=NOTE_INITIALE):
+        if k <= 0:
+            raise ValueError("Le facteur K doit être strictement positif")
+
+        self.k = k
+        self.avantage_domicile = avantage_domicile
+        self.note_initiale = note_initiale
+        # Matchs enregistrés: (date, domicile, extérieur, score domicile, score extérieur)
+        self._matchs = []
+        self._notes = {}
+        # Historique par équipe: nom -> ([dates], [notes après chaque match])
+        self._historique = {}
+        self._derniere_date = None
+        self._a_rejouer = False
+
+    def enregistrer_match(self, match):
+        """Intégrer le résultat d'un match"""
+        ligne = (match.date, match.equipe_domicile.nom, match.equipe_exterieur.nom,
+                 match.score_domicile, match.score_exterieur)
+        self._matchs.append(ligne)
+
+        if self._a_rejouer:
+            return
+        if self._derniere_date is not None and match.date < self._derniere_date:
+            # Match arrivé en retard: l'historique sera rejoué dans l'ordre chronologique
+            self._a_rejouer = True
+            return
+        self._appliquer(*ligne)
+
+    def retirer_derniers(self, nombre):
+        """Oublier les derniers matchs enregistrés (annulation d'une transaction)"""
+        if nombre <= 0:
+            return
+        retires = self._matchs[-nombre:]
+        del self._matchs[-nombre:]
+        if self._a_rejouer:
+            return
+
+        # Matchs intégrés dans l'ordre: leurs notes sont en fin d'historique
+        for date, domicile, exterieur, _, _ in reversed(retires):
+            for nom in (domicile, exterieur):
+                dates, notes = self._historique[nom]
+                dates.pop()
+                notes.pop()
+                if notes:
+                    self._notes[nom] = notes[-1]
+                else:
+                    del self._historique[nom]
+                    del self._notes[nom]
+        self._derniere_date = max((dates[-1] for dates, _ in self._historique.values()), default=None)
+        if self._derniere_date is not None and min(ligne[0] for ligne in retires) < self._derniere_date:
+            # Historique rejoué entre-temps dans l'ordre des dates: les notes retirées n'étaient pas les dernières
+            self._a_rejouer = True
+
+    def rejouer(self):
+        """Recalculer toutes les notes en un seul passage sur les matchs triés par date"""
+        self._notes = {}
+        self._historique = {}
+        self._derniere_date = None
+
+        # Tri stable: les matchs d'une même date gardent leur ordre d'enregistrement
+        ordre = sorted(range(len(self._matchs)), key=lambda i: self._matchs[i][0])
+        for i in ordre:
+            self._appliquer(*self._matchs[i])
+        self._a_rejouer = False
+
+    def _appliquer(self, date, domicile, exterieur, score_domicile, score_exterieur):
+        note_domicile = self._notes.get(domicile, self.note_initiale)
+        note_exterieur = self._notes.get(exterieur, self.note_initiale)
+
+        attendu = self._probabilite(note_domicile + self.avantage_domicile - note_exterieur)
+        if score_domicile > score_exterieur:
+            resultat, ecart_notes = 1.0, note_domicile + self.avantage_domicile - note_exterieur
+        elif score_exterieur > score_domicile:
+            resultat, ecart_notes = 0.0, note_exterieur - note_domicile - self.avantage_domicile
+        else:
+            resultat, ecart_notes = 0.5, 0.0
+
+        # Multiplicateur d'écart de points, réduit quand le favori l'emporte
+        ecart_points = abs(score_domicile - score_exterieur)
+        multiplicateur = (ecart_points + 3) ** 0.8 / (7.5 + 0.006 * ecart_notes)
+        variation = self.k * multiplicateur * (resultat - attendu)
+
+        self._notes[domicile] = note_domicile + variation
+        self._notes[exterieur] = note_exterieur - variation
+        for nom in (domicile, exterieur):
+            dates, notes = self._historique.setdefault(nom, ([], []))
+            dates.append(date)
+            notes.append(self._notes[nom])
+        self._derniere_date = date
+
+    @staticmethod
+    def _probabilite(ecart):
+        return 1.0 / (1.0 + 10 ** (-ecart / 400.0))
+
+    def _a_jour(self):
+        if self._a_rejouer:
+            self.rejouer()
+
+    def note(self, nom_equipe, date=None):
+        """Note d'une équipe, actuelle ou après les matchs joués jusqu'à la date incluse"""
+        self._a_jour()
+        if date is None:
+            return self._notes.get(nom_equipe, self.note_initiale)
+
+        dates, notes = self._historique.get(nom_equipe, ((), ()))
+        i = bisect_right(dates, date)
+        return notes[i - 1] if i else self.note_initiale
+
+    def historique(self, nom_equipe):
+        """Historique des notes d'une équipe: liste de (date, note) par date croissante"""
+        self._a_jour()
+        dates, notes = self._historique.get(nom_equipe, ((), ()))
+        return list(zip(dates, notes))
+
+    def classement(self, noms_equipes, date=None):
+        """Classement de puissance: liste de (nom, note) par note décroissante"""
+        notes = [(nom, self.note(nom, date)) for nom in noms_equipes]
+        return sorted(notes, key=lambda x: x[1], reverse=True)
+
+    def probabilite_victoire(self, domicile, exterieur, date=None):
+        """Probabilité de victoire de l'équipe à domicile"""
+        ecart = self.note(domicile, date) + self.avantage_domicile - self.note(exterieur, date)
+        return self._probabilite(ecart)
@@ -1,3 +1,4 @@
+import sys
 from joueur import Joueur
 
 class Equipe:
@@ -5,17 +6,25 @@ class Equipe:
 
     MAX_JOUEURS = 15
 
+    __slots__ = ('_nom', '_ville', '_joueurs', '_index_noms', '_victoires', '_defaites', '_statistiques_cache')
+
     def __init__(self, nom, ville):
         if not nom or not isinstance(nom, str):
             raise ValueError("Le nom de l'équipe doit être une chaîne non vide")
         if not ville or not isinstance(ville, str):
             raise ValueError("La ville doit être une chaîne non vide")
 
-        self._nom = nom
-        self._ville = ville
-        self._joueurs = []
+        self._nom = sys.intern(nom)
+        self._ville = sys.intern(ville)
+        # Dictionnaire ordonné utilisé comme ensemble: appartenance et retrait en O(1)
+        self._joueurs = {}
+        # Index des noms normalisés (insensible à la casse) pour rechercher_joueur: nom -> joueurs
+        # dans l'ordre de l'effectif (deux noms peuvent ne différer que par la casse)
+        self._index_noms = {}
         self._victoires = 0
         self._defaites = 0
+        # (versions des joueurs de l'effectif, résultat) de obtenir_statistiques_equipe
+        self._statistiques_cache = None
 
     @property
     def nom(self):
@@ -27,7 +36,8 @@ class Equipe:
 
     @property
     def joueurs(self):
-        return self._joueurs.copy()
+        """Vue en lecture seule (sans copie) de l'effectif, dans l'ordre d'arrivée"""
+        return self._joueurs.keys()
 
     @property
     def victoires(self):
@@ -51,24 +61,41 @@ class Equipe:
         if joueur.equipe is not None:
             raise ValueError(f"Le joueur {joueur.nom} appartient déjà à une équipe")
 
-        self._joueurs.append(joueur)
+        self._joueurs[joueur] = None
+        self._index_noms.setdefault(joueur.nom.casefold(), []).append(joueur)
         joueur.equipe = self
         return True
 
     def retirer_joueur(self, joueur):
         """Retirer un joueur de l'équipe"""
         if joueur in self._joueurs:
-            self._joueurs.remove(joueur)
+            del self._joueurs[joueur]
+            cle = joueur.nom.casefold()
+            homonymes = self._index_noms[cle]
+            homonymes.remove(joueur)
+            if not homonymes:
+                del self._index_noms[cle]
             joueur.equipe = None
             return True
         return False
 
+    def reinserer_joueur(self, joueur, position):
+        """Remettre un joueur retiré à sa place dans l'effectif (annulation d'un transfert)"""
+        joueurs = list(self._joueurs)
+        joueurs.insert(position, joueur)
+        self._joueurs = dict.fromkeys(joueurs)
+        cle = joueur.nom.casefold()
+        self._index_noms[cle] = [j for j in joueurs if j.nom.casefold() == cle]
+        joueur.equipe = self
+
+    def contient_joueur(self, joueur):
+        """Vérifier si le joueur fait partie de l'effectif"""
+        return joueur in self._joueurs
+
     def rechercher_joueur(self, nom):
         """Rechercher un joueur par nom dans l'équipe"""
-        for joueur in self._joueurs:
-            if joueur.nom.lower() == nom.lower():
-                return joueur
-        return None
+        homonymes = self._index_noms.get(nom.casefold())
+        return homonymes[0] if homonymes else None
 
     def ajouter_victoire(self):
         """Ajouter une victoire à l'équipe"""
@@ -78,6 +105,14 @@ class Equipe:
         """Ajouter une défaite à l'équipe"""
         self._defaites += 1
 
+    def retirer_victoire(self):
+        """Retirer une victoire (annulation d'un match)"""
+        self._victoires -= 1
+
+    def retirer_defaite(self):
+        """Retirer une défaite (annulation d'un match)"""
+        self._defaites -= 1
+
     def calculer_pourcentage_victoires(self):
         """Calculer le pourcentage de victoires"""
         total_matchs = self._victoires + self._defaites
@@ -90,6 +125,17 @@ class Equipe:
         if not self._joueurs:
             return None
 
+        # Le résultat ne dépend que de l'effectif et des statistiques de ses joueurs
+        cle = tuple((id(j), j._version) for j in self._joueurs)
+        if self._statistiques_cache is not None and self._statistiques_cache[0] == cle:
+            resultat = self._statistiques_cache[1]
+            return dict(resultat) if resultat else None
+
+        resultat = self._calculer_statistiques_equipe()
+        self._statistiques_cache = (cle, resultat)
+        return dict(resultat) if resultat else None
+
+    def _calculer_statistiques_equipe(self):
         joueurs_avec_stats = [j for j in self._joueurs if j.calculer_moyennes()]
         if not joueurs_avec_stats:
             return None
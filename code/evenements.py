@@ -0,0 +1,407 @@
+"""Bus d'événements des mutations de NBASystem
+
+Chaque mutation réussie publie un événement typé. Les abonnés le reçoivent:
+
+- en mode synchrone, dans le thread de la mutation, avant qu'elle ne rende
+  la main (index et structures dérivées du système);
+- en mode asynchrone, dans un thread dédié au bus (journaux, métriques,
+  exports), sans ralentir la mutation.
+
+Un abonné « par lots » reçoit une liste d'événements: en synchrone, tous ceux
+publiés dans un bloc `with bus.lot():` (un seul appel à la sortie du bloc);
+en asynchrone, ceux accumulés dans la file depuis le dernier appel.
+
+Dans un bloc `with bus.transaction():`, seuls les abonnés internes (structures
+dérivées du système, remises en état avec lui en cas d'annulation) reçoivent
+les événements tout de suite; les autres les reçoivent à la sortie du bloc,
+et jamais s'il se termine par une exception. L'erreur d'un de ces abonnés à
+la sortie du bloc est affichée sans empêcher la livraison aux suivants ni
+remettre en cause les modifications validées.
+
+    bus.abonner(lambda e: print(e), types=(MatchAjoute,))
+    bus.abonner(journaliser, mode='asynchrone', par_lots=True)
+"""
+import queue
+import sys
+import threading
+import traceback
+from contextlib import contextmanager
+
+
+class Evenement:
+    """Événement de mutation; equipes: noms des équipes dont les données ont changé"""
+
+    __slots__ = ()
+
+    @property
+    def equipes(self):
+        return ()
+
+    def __repr__(self):
+        valeurs = ', '.join(f"{nom}={getattr(self, nom)!r}" for nom in self.__slots__)
+        return f"{type(self).__name__}({valeurs})"
+
+
+class EquipeAjoutee(Evenement):
+    __slots__ = ('nom', 'ville')
+
+    def __init__(self, nom, ville):
+        self.nom = nom
+        self.ville = ville
+
+    @property
+    def equipes(self):
+        return (self.nom,)
+
+
+class JoueurAjoute(Evenement):
+    __slots__ = ('nom_equipe', 'nom_joueur', 'origine', 'annee_debut', 'poste')
+
+    def __init__(self, nom_equipe, nom_joueur, origine, annee_debut, poste):
+        self.nom_equipe = nom_equipe
+        self.nom_joueur = nom_joueur
+        self.origine = origine
+        self.annee_debut = annee_debut
+        self.poste = poste
+
+    @property
+    def equipes(self):
+        return (self.nom_equipe,)
+
+
+class JoueurTransfere(Evenement):
+    __slots__ = ('nom_joueur', 'nom_nouvelle_equipe', 'nom_ancienne_equipe')
+
+    def __init__(self, nom_joueur, nom_nouvelle_equipe, nom_ancienne_equipe=None):
+        self.nom_joueur = nom_joueur
+        self.nom_nouvelle_equipe = nom_nouvelle_equipe
+        self.nom_ancienne_equipe = nom_ancienne_equipe
+
+    @property
+    def equipes(self):
+        if self.nom_ancienne_equipe:
+            return (self.nom_nouvelle_equipe, self.nom_ancienne_equipe)
+        return (self.nom_nouvelle_equipe,)
+
+
+class MatchAjoute(Evenement):
+    __slots__ = ('match', 'numero')
+
+    def __init__(self, match, numero):
+        self.match = match
+        # Rang du match dans la liste des matchs du système (à partir de 1)
+        self.numero = numero
+
+    @property
+    def equipes(self):
+        return (self.match.equipe_domicile.nom, self.match.equipe_exterieur.nom)
+
+
+class StatistiquesAjoutees(Evenement):
+    __slots__ = ('joueur', 'stat')
+
+    def __init__(self, joueur, stat):
+        self.joueur = joueur
+        self.stat = stat
+
+
+class MatchsAjoutes(Evenement):
+    """Série de matchs ajoutée en une fois (ajouter_matchs_en_masse)"""
+
+    __slots__ = ('matchs', 'premier_numero')
+
+    def __init__(self, matchs, premier_numero):
+        self.matchs = matchs
+        # Rang du premier match de la série dans la liste des matchs du système
+        self.premier_numero = premier_numero
+
+    @property
+    def equipes(self):
+        noms = set()
+        for match in self.matchs:
+            noms.add(match.equipe_domicile.nom)
+            noms.add(match.equipe_exterieur.nom)
+        return tuple(sorted(noms))
+
+
+class StatistiquesAjouteesEnMasse(Evenement):
+    """Lignes de statistiques ajoutées en une fois (ajouter_statistiques_en_masse)
+
+    colonnes: (noms des joueurs, temps, points, passes, rebonds, jours ordinaux).
+    """
+
+    __slots__ = ('joueurs', 'colonnes')
+
+    def __init__(self, joueurs, colonnes):
+        self.joueurs = joueurs
+        self.colonnes = colonnes
+
+    @property
+    def lignes(self):
+        """Lignes (nom du joueur, temps, points, passes, rebonds, jour ordinal)"""
+        return zip(*self.colonnes)
+
+
+class SaisonGelee(Evenement):
+    """Saison gelée: plus aucun match ni statistique ne peut y être ajouté"""
+
+    __slots__ = ('annee',)
+
+    def __init__(self, annee):
+        self.annee = annee
+
+
+class SaisonReorganisee(Evenement):
+    """Saison compactée, déchargée ou restaurée: matchs et historiques ont été retirés ou recréés en bloc
+
+    operation: 'compactee', 'dechargee' ou 'restauree', publiée une fois
+    l'état final de la saison atteint; chemin: fichier des colonnes d'une
+    saison déchargée.
+    """
+
+    __slots__ = ('annee', 'operation', 'noms_equipes', 'chemin')
+
+    def __init__(self, annee, operation, noms_equipes, chemin=None):
+        self.annee = annee
+        self.operation = operation
+        self.noms_equipes = tuple(noms_equipes)
+        self.chemin = chemin
+
+    @property
+    def equipes(self):
+        return self.noms_equipes
+
+
+MODES = ('synchrone', 'asynchrone')
+
+
+class Abonnement:
+    """Abonné du bus: fonction appelée, types d'événements filtrés, mode de livraison"""
+
+    __slots__ = ('rappel', 'types', 'mode', 'par_lots', 'interne')
+
+    def __init__(self, rappel, types, mode, par_lots, interne=False):
+        self.rappel = rappel
+        self.types = tuple(types) if types else None
+        self.mode = mode
+        self.par_lots = par_lots
+        self.interne = interne
+
+    def accepte(self, evenement):
+        return self.types is None or isinstance(evenement, self.types)
+
+    def livrer(self, evenements):
+        evenements = [e for e in evenements if self.accepte(e)]
+        if not evenements:
+            return
+        if self.par_lots:
+            self.rappel(evenements)
+        else:
+            for evenement in evenements:
+                self.rappel(evenement)
+
+
+class BusEvenements:
+    """Diffusion des événements de mutation aux abonnés synchrones et asynchrones"""
+
+    def __init__(self, taille_lot=1000):
+        if taille_lot < 1:
+            raise ValueError("La taille des lots doit être strictement positive")
+        self.taille_lot = taille_lot
+        self._abonnements = []
+        # Événements retenus pour les abonnés synchrones par lots (bloc lot() en cours):
+        # couples (événement, destinataires) où destinataires vaut None (tous) ou l'attribut
+        # interne des abonnements visés
+        self._en_lot = None
+        self._profondeur_lot = 0
+        # Événements réservés aux abonnés non internes jusqu'à la fin de la transaction en cours
+        self._retenus = None
+        self._file = None
+        self._thread = None
+        self.erreurs_asynchrones = 0
+        # Erreurs d'abonnés lors de la livraison des événements d'une transaction validée
+        self.erreurs_livraison = 0
+
+    def abonner(self, rappel, types=None, mode='synchrone', par_lots=False, interne=False):
+        """Abonner une fonction aux événements (de types donnés, ou à tous); retourne l'abonnement"""
+        if mode not in MODES:
+            raise ValueError(f"Mode de livraison invalide: {mode}")
+        if interne and mode == 'asynchrone':
+            raise ValueError("Un abonné interne doit être synchrone")
+        abonnement = Abonnement(rappel, types, mode, par_lots, interne)
+        self._abonnements = self._abonnements + [abonnement]
+        if mode == 'asynchrone' and self._thread is None:
+            self._demarrer()
+        return abonnement
+
+    def desabonner(self, abonnement):
+        """Retirer un abonnement (sans effet s'il n'est pas abonné)"""
+        self._abonnements = [a for a in self._abonnements if a is not abonnement]
+
+    def publier(self, evenement):
+        """Diffuser un événement à tous les abonnés intéressés"""
+        if self._retenus is None:
+            self._diffuser(evenement, None)
+        else:
+            self._retenus.append(evenement)
+            self._diffuser(evenement, True)
+
+    def _diffuser(self, evenement, destinataires, isoler=False):
+        # destinataires: None (tous les abonnés), True (internes) ou False (non internes);
+        # isoler: l'erreur d'un abonné est affichée et comptée au lieu d'être propagée
+        asynchrones = False
+        for abonnement in self._abonnements:
+            if destinataires is not None and abonnement.interne != destinataires:
+                continue
+            if abonnement.mode == 'asynchrone':
+                asynchrones = True
+            elif abonnement.par_lots and self._en_lot is not None:
+                continue
+            elif abonnement.accepte(evenement):
+                try:
+                    if abonnement.par_lots:
+                        abonnement.rappel([evenement])
+                    else:
+                        abonnement.rappel(evenement)
+                except Exception:
+                    if not isoler:
+                        raise
+                    self.erreurs_livraison += 1
+                    traceback.print_exc(file=sys.stderr)
+        if self._en_lot is not None:
+            self._en_lot.append((evenement, destinataires))
+        if asynchrones:
+            if self._thread is None:
+                self._demarrer()
+            self._file.put(evenement)
+
+    @contextmanager
+    def transaction(self):
+        """Réserver aux abonnés internes les événements du bloc jusqu'à sa sortie sans exception
+
+        En cas d'exception, les événements du bloc ne sont jamais livrés aux
+        autres abonnés. Une transaction imbriquée annulée n'écarte que ses
+        propres événements.
+        """
+        with self.retenir() as valides:
+            yield
+        self.livrer(valides)
+
+    @contextmanager
+    def retenir(self):
+        """Première moitié de transaction(): retenir les événements du bloc sans les livrer
+
+        La liste produite reçoit, à la sortie sans exception du bloc le plus
+        externe, les événements validés; l'appelant les passe ensuite à
+        livrer(), hors de la portée de sa propre annulation.
+        """
+        englobante = self._retenus is not None
+        if not englobante:
+            self._retenus = []
+        debut = len(self._retenus)
+        debut_lot = len(self._en_lot) if self._en_lot is not None else None
+        valides = []
+        try:
+            yield valides
+        except BaseException:
+            del self._retenus[debut:]
+            if debut_lot is not None and self._en_lot is not None:
+                del self._en_lot[debut_lot:]
+            if not englobante:
+                self._retenus = None
+            raise
+        if not englobante:
+            valides.extend(self._retenus)
+            self._retenus = None
+
+    def livrer(self, evenements):
+        """Livrer aux abonnés non internes les événements d'une transaction validée
+
+        L'erreur d'un abonné est affichée et comptée (erreurs_livraison): les
+        modifications sont déjà validées et les autres abonnés doivent
+        recevoir les événements.
+
+        Les abonnés par lots reçoivent tous les événements du bloc en un seul
+        appel: un abonné qui agit sur l'état complet du système (point de
+        contrôle du journal) ne le voit jamais à moitié livré.
+        """
+        with self.lot(isoler=True):
+            for evenement in evenements:
+                self._diffuser(evenement, False, isoler=True)
+
+    @contextmanager
+    def lot(self, isoler=False):
+        """Regrouper les événements publiés dans le bloc pour les abonnés synchrones par lots
+
+        isoler: à la sortie du bloc le plus externe, l'erreur d'un abonné par
+        lots est affichée et comptée (erreurs_livraison) au lieu d'être propagée.
+        """
+        self._profondeur_lot += 1
+        if self._en_lot is None:
+            self._en_lot = []
+        try:
+            yield
+        finally:
+            self._profondeur_lot -= 1
+            if self._profondeur_lot == 0:
+                evenements, self._en_lot = self._en_lot, None
+                for abonnement in self._abonnements:
+                    if abonnement.mode == 'synchrone' and abonnement.par_lots:
+                        try:
+                            abonnement.livrer([e for e, destinataires in evenements
+                                               if destinataires is None or destinataires == abonnement.interne])
+                        except Exception:
+                            if not isoler:
+                                raise
+                            self.erreurs_livraison += 1
+                            traceback.print_exc(file=sys.stderr)
+
+    def _demarrer(self):
+        self._file = queue.Queue()
+        self._thread = threading.Thread(target=self._boucle, args=(self._file,), name='bus-evenements',
+                                        daemon=True)
+        self._thread.start()
+
+    def _boucle(self, file):
+        while True:
+            evenements = []
+            arret = False
+            element = file.get()
+            # Regrouper ce qui est déjà en file, dans la limite d'un lot
+            while True:
+                if element is None:
+                    arret = True
+                    break
+                evenements.append(element)
+                if len(evenements) >= self.taille_lot:
+                    break
+                try:
+                    element = file.get_nowait()
+                except queue.Empty:
+                    break
+            for abonnement in self._abonnements:
+                if abonnement.mode != 'asynchrone':
+                    continue
+                try:
+                    abonnement.livrer(evenements)
+                except Exception:
+                    # Une erreur d'abonné ne doit ni arrêter le thread ni toucher les mutations
+                    self.erreurs_asynchrones += 1
+                    traceback.print_exc(file=sys.stderr)
+            for _ in range(len(evenements) + arret):
+                file.task_done()
+            if arret:
+                return
+
+    def attendre(self):
+        """Attendre que tous les événements publiés aient été livrés aux abonnés asynchrones"""
+        if self._file is not None:
+            self._file.join()
+
+    def fermer(self):
+        """Livrer les événements en attente puis arrêter le thread asynchrone"""
+        if self._thread is not None:
+            self._file.put(None)
+            self._thread.join()
+            self._thread = None
+            self._file = None
@@ -0,0 +1,273 @@
+"""Export des données à plat pour l'analyse: tables CSV et fichiers colonnaires par blocs
+
+Quatre tables sont produites (equipes, joueurs, statistiques, matchs), en
+parcourant directement les itérateurs de NBASystem: aucune liste de toutes
+les lignes n'est construite, la mémoire utilisée ne dépend que de la taille
+d'un bloc.
+
+Format colonnaire (.nbac), inspiré de Parquet:
+
+    MAGIE
+    bloc 1: colonne 1 | colonne 2 | ...      (valeurs typées, petit-boutiste)
+    bloc 2: ...
+    pied: JSON (schéma, position et taille de chaque colonne de chaque bloc,
+          nombre de lignes et dates min/max du bloc)
+    taille du pied (8 octets) | MAGIE
+
+Une colonne de texte est écrite comme les positions de fin de chaque valeur
+(entiers non signés 32 bits) suivies des valeurs encodées en UTF-8. Les
+dates sont des ordinaux de jour (date.toordinal).
+"""
+import csv
+import json
+import os
+import struct
+import sys
+from array import array
+from datetime import date
+
+from dates import vers_jour, depuis_jour
+from match import parser_date
+
+
+MAGIE = b'NBAC1\n'
+EXTENSION_COLONNES = '.nbac'
+
+# Type de colonne -> code de array (None: texte)
+TYPES = {'texte': None, 'entier': 'i', 'reel': 'd', 'jour': 'i'}
+
+# Table -> colonnes (nom, type); la colonne 'date' porte les statistiques min/max des blocs
+SCHEMAS = {
+    'equipes': (('nom', 'texte'), ('ville', 'texte'), ('victoires', 'entier'), ('defaites', 'entier')),
+    'joueurs': (('nom', 'texte'), ('origine', 'texte'), ('annee_debut', 'entier'), ('poste', 'texte'),
+                ('equipe', 'texte')),
+    # Points, passes et rebonds peuvent être décimaux (moyennes): colonnes réelles
+    'statistiques': (('joueur', 'texte'), ('temps_jeu', 'reel'), ('points', 'reel'), ('passes', 'reel'),
+                     ('rebonds', 'reel'), ('date', 'jour')),
+    'matchs': (('equipe_domicile', 'texte'), ('equipe_exterieur', 'texte'), ('score_domicile', 'entier'),
+               ('score_exterieur', 'entier'), ('date', 'jour')),
+}
+
+
+def lignes_table(systeme, table):
+    """Lignes d'une table dans l'ordre de son schéma (dates en datetime)"""
+    if table == 'equipes':
+        return ((e.nom, e.ville, e.victoires, e.defaites) for e in systeme._equipes.values())
+    if table == 'joueurs':
+        return ((j.nom, j.origine, j.annee_debut, j.poste.value, j.equipe.nom if j.equipe else '')
+                for j in systeme._joueurs_index.values())
+    if table == 'statistiques':
+        return systeme.iterer_statistiques()
+    if table == 'matchs':
+        return systeme.iterer_matchs()
+    raise ValueError(f"Table inconnue: {table}")
+
+
+def exporter_csv(systeme, repertoire, tables=None):
+    """Écrire une table par fichier CSV (dates au format YYYY-MM-DD); retourne {table: nombre de lignes}"""
+    os.makedirs(repertoire, exist_ok=True)
+    comptes = {}
+    for table in tables or SCHEMAS:
+        schema = SCHEMAS[table]
+        indices_dates = [i for i, (_, type_colonne) in enumerate(schema) if type_colonne == 'jour']
+        nb_lignes = 0
+        with open(os.path.join(repertoire, f'{table}.csv'), 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow([nom for nom, _ in schema])
+            for ligne in lignes_table(systeme, table):
+                if indices_dates:
+                    ligne = list(ligne)
+                    for i in indices_dates:
+                        ligne[i] = ligne[i].date().isoformat()
+                writer.writerow(ligne)
+                nb_lignes += 1
+        comptes[table] = nb_lignes
+    return comptes
+
+
+class EcrivainColonnes:
+    """Écriture d'une table au format colonnaire, bloc par bloc
+
+        with EcrivainColonnes('matchs.nbac', SCHEMAS['matchs']) as ecrivain:
+            for ligne in lignes:
+                ecrivain.ajouter(ligne)
+    """
+
+    def __init__(self, chemin, schema, table=None, taille_bloc=65536):
+        if taille_bloc < 1:
+            raise ValueError("La taille des blocs doit être strictement positive")
+        self.schema = tuple(schema)
+        self.table = table
+        self.taille_bloc = taille_bloc
+        self.nb_lignes = 0
+        self._fichier = open(chemin, 'wb')
+        self._fichier.write(MAGIE)
+        self._blocs = []
+        self._colonne_date = next((i for i, (_, t) in enumerate(self.schema) if t == 'jour'), None)
+        self._vider_tampons()
+
+    def _vider_tampons(self):
+        self._tampons = [[] if TYPES[t] is None else array(TYPES[t]) for _, t in self.schema]
+
+    def ajouter(self, ligne):
+        """Ajouter une ligne (valeurs dans l'ordre du schéma; dates en date, datetime ou ordinal)"""
+        for tampon, (_, type_colonne), valeur in zip(self._tampons, self.schema, ligne):
+            if type_colonne == 'jour' and not isinstance(valeur, int):
+                valeur = vers_jour(valeur)
+            tampon.append(valeur)
+        if len(self._tampons[0]) >= self.taille_bloc:
+            self._ecrire_bloc()
+
+    def ajouter_lignes(self, lignes):
+        """Ajouter toutes les lignes d'un itérable"""
+        for ligne in lignes:
+            self.ajouter(ligne)
+
+    def _ecrire_bloc(self):
+        nb_lignes = len(self._tampons[0])
+        if nb_lignes == 0:
+            return
+        bloc = {'lignes': nb_lignes, 'colonnes': []}
+        for tampon in self._tampons:
+            position = self._fichier.tell()
+            if isinstance(tampon, list):
+                encodees = [valeur.encode('utf-8') for valeur in tampon]
+                fins = array('I')
+                total = 0
+                for valeur in encodees:
+                    total += len(valeur)
+                    fins.append(total)
+                self._ecrire_valeurs(fins)
+                self._fichier.write(b''.join(encodees))
+            else:
+                self._ecrire_valeurs(tampon)
+            bloc['colonnes'].append([position, self._fichier.tell() - position])
+        if self._colonne_date is not None:
+            jours = self._tampons[self._colonne_date]
+            bloc['date_min'] = depuis_jour(min(jours)).date().isoformat()
+            bloc['date_max'] = depuis_jour(max(jours)).date().isoformat()
+        self._blocs.append(bloc)
+        self.nb_lignes += nb_lignes
+        self._vider_tampons()
+
+    def _ecrire_valeurs(self, valeurs):
+        if sys.byteorder == 'big':
+            valeurs = array(valeurs.typecode, valeurs)
+            valeurs.byteswap()
+        self._fichier.write(valeurs.tobytes())
+
+    def fermer(self):
+        """Écrire le dernier bloc et le pied du fichier"""
+        if self._fichier is None:
+            return
+        self._ecrire_bloc()
+        pied = json.dumps({
+            'table': self.table,
+            'colonnes': [list(c) for c in self.schema],
+            'lignes': self.nb_lignes,
+            'blocs': self._blocs,
+        }, ensure_ascii=False).encode('utf-8')
+        self._fichier.write(pied)
+        self._fichier.write(struct.pack('<Q', len(pied)))
+        self._fichier.write(MAGIE)
+        self._fichier.close()
+        self._fichier = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+class LecteurColonnes:
+    """Lecture d'un fichier colonnaire: schéma, blocs et valeurs des colonnes demandées"""
+
+    def __init__(self, chemin):
+        self.chemin = chemin
+        with open(chemin, 'rb') as f:
+            if f.read(len(MAGIE)) != MAGIE:
+                raise ValueError(f"{chemin} n'est pas un fichier colonnaire NBA")
+            f.seek(-(8 + len(MAGIE)), os.SEEK_END)
+            taille_pied = struct.unpack('<Q', f.read(8))[0]
+            if f.read(len(MAGIE)) != MAGIE:
+                raise ValueError(f"{chemin} est incomplet (pied absent)")
+            f.seek(-(8 + len(MAGIE) + taille_pied), os.SEEK_END)
+            pied = json.loads(f.read(taille_pied).decode('utf-8'))
+        self.table = pied['table']
+        self.schema = [tuple(c) for c in pied['colonnes']]
+        self.nb_lignes = pied['lignes']
+        self.blocs = pied['blocs']
+
+    def blocs_dans(self, date_min=None, date_max=None):
+        """Indices des blocs dont l'intervalle de dates recoupe [date_min, date_max]"""
+        debut = _date_iso(date_min)
+        fin = _date_iso(date_max)
+        return [i for i, bloc in enumerate(self.blocs)
+                if 'date_min' not in bloc
+                or ((debut is None or bloc['date_max'] >= debut) and (fin is None or bloc['date_min'] <= fin))]
+
+    def lire(self, colonnes=None, date_min=None, date_max=None):
+        """Produire, bloc par bloc, un dictionnaire {colonne: valeurs}
+
+        Les blocs hors de l'intervalle de dates sont sautés sans être lus
+        (leurs lignes ne sont pas filtrées une à une). Les colonnes numériques
+        sont des array, les colonnes de texte des listes.
+        """
+        noms = [nom for nom, _ in self.schema]
+        colonnes = colonnes or noms
+        inconnues = [c for c in colonnes if c not in noms]
+        if inconnues:
+            raise ValueError(f"Colonne(s) inconnue(s): {', '.join(inconnues)}")
+
+        with open(self.chemin, 'rb') as f:
+            for i in self.blocs_dans(date_min, date_max):
+                bloc = self.blocs[i]
+                valeurs = {}
+                for nom in colonnes:
+                    indice = noms.index(nom)
+                    position, taille = bloc['colonnes'][indice]
+                    f.seek(position)
+                    valeurs[nom] = _decoder(f.read(taille), self.schema[indice][1], bloc['lignes'])
+                yield valeurs
+
+
+def _decoder(donnees, type_colonne, nb_lignes):
+    code = TYPES[type_colonne]
+    if code is None:
+        fins = array('I')
+        fins.frombytes(donnees[:4 * nb_lignes])
+        if sys.byteorder == 'big':
+            fins.byteswap()
+        texte = donnees[4 * nb_lignes:]
+        debut = 0
+        chaines = []
+        for fin in fins:
+            chaines.append(texte[debut:fin].decode('utf-8'))
+            debut = fin
+        return chaines
+    valeurs = array(code)
+    valeurs.frombytes(donnees)
+    if sys.byteorder == 'big':
+        valeurs.byteswap()
+    return valeurs
+
+
+def _date_iso(valeur):
+    if valeur is None:
+        return None
+    if isinstance(valeur, date):
+        return valeur.strftime('%Y-%m-%d')
+    return parser_date(valeur).strftime('%Y-%m-%d')
+
+
+def exporter_colonnes(systeme, repertoire, tables=None, taille_bloc=65536):
+    """Écrire une table par fichier colonnaire (.nbac); retourne {table: nombre de lignes}"""
+    os.makedirs(repertoire, exist_ok=True)
+    comptes = {}
+    for table in tables or SCHEMAS:
+        chemin = os.path.join(repertoire, table + EXTENSION_COLONNES)
+        with EcrivainColonnes(chemin, SCHEMAS[table], table, taille_bloc) as ecrivain:
+            ecrivain.ajouter_lignes(lignes_table(systeme, table))
+        comptes[table] = ecrivain.nb_lignes
+    return comptes
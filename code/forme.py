@@ -0,0 +1,196 @@
+import heapq
+from collections import deque
+from datetime import timedelta
+
+
+CRITERES_FORME = ('temps_jeu', 'points', 'passes', 'rebonds', 'efficacite')
+MODES_FORME = ('matchs', 'jours', 'ewma')
+
+
+class FenetreGlissante:
+    """Sommes glissantes sur une file de lignes de statistiques"""
+
+    def __init__(self, taille_max=None):
+        self.lignes = deque(maxlen=taille_max)
+        self.sommes = [0.0] * len(CRITERES_FORME)
+
+    def ajouter(self, ligne):
+        if self.lignes.maxlen is not None and len(self.lignes) == self.lignes.maxlen:
+            self._soustraire(self.lignes[0])
+        self.lignes.append(ligne)
+        for i, valeur in enumerate(ligne[1:]):
+            self.sommes[i] += valeur
+
+    def retirer_avant(self, date_limite):
+        while self.lignes and self.lignes[0][0] < date_limite:
+            self._soustraire(self.lignes.popleft())
+
+    def _soustraire(self, ligne):
+        for i, valeur in enumerate(ligne[1:]):
+            self.sommes[i] -= valeur
+
+    def moyennes(self):
+        n = len(self.lignes)
+        if n == 0:
+            return None
+        return {critere: somme / n for critere, somme in zip(CRITERES_FORME, self.sommes)}
+
+
+class FormeJoueur:
+    """Indicateurs de forme d'un joueur, mis à jour à chaque nouvelle ligne de statistiques
+
+    Les lignes sont supposées arriver par date croissante; une ligne plus
+    ancienne que la dernière connue impose une reconstruction (voir SuiviForme).
+    """
+
+    def __init__(self, nb_matchs, nb_jours, alpha):
+        self.derniers_matchs = FenetreGlissante(nb_matchs)
+        self.derniers_jours = FenetreGlissante()
+        self.nb_jours = nb_jours
+        self.alpha = alpha
+        self.ewma = None
+        self.derniere_date = None
+
+    def ajouter(self, stat):
+        """Intégrer une ligne; retourne False si elle est antérieure à la dernière connue"""
+        date = stat.date_match
+        if self.derniere_date is not None and date < self.derniere_date:
+            return False
+
+        ligne = (date, stat.temps_jeu, stat.points, stat.passes, stat.rebonds, stat.calculer_efficacite())
+        self.derniers_matchs.ajouter(ligne)
+        self.derniers_jours.ajouter(ligne)
+        self.derniers_jours.retirer_avant(date - timedelta(days=self.nb_jours))
+
+        valeurs = ligne[1:]
+        if self.ewma is None:
+            self.ewma = list(valeurs)
+        else:
+            self.ewma = [self.alpha * v + (1 - self.alpha) * e for v, e in zip(valeurs, self.ewma)]
+
+        self.derniere_date = date
+        return True
+
+    def indicateurs(self):
+        """Moyennes sur les N derniers matchs, sur les D derniers jours et moyennes exponentielles"""
+        if self.derniere_date is None:
+            return None
+        return {
+            'matchs': self.derniers_matchs.moyennes(),
+            'jours': self.derniers_jours.moyennes(),
+            'ewma': dict(zip(CRITERES_FORME, self.ewma)),
+            'matchs_fenetre': len(self.derniers_matchs.lignes),
+            'matchs_periode': len(self.derniers_jours.lignes),
+            'derniere_date': self.derniere_date,
+        }
+
+
+class SuiviForme:
+    """Suivi de la forme de tous les joueurs de la ligue
+
+    Chaque ligne de statistiques est intégrée en O(1); le classement des joueurs
+    en forme ne parcourt que l'état courant de chaque joueur, sans relire les
+    carrières. Seuls les joueurs ayant reçu une ligne hors ordre chronologique
+    sont reconstruits, une seule fois, à la requête suivante.
+    """
+
+    def __init__(self, nb_matchs=5, nb_jours=30, alpha=0.3):
+        if nb_matchs < 1 or nb_jours < 1:
+            raise ValueError("Les fenêtres de forme doivent être strictement positives")
+        if not 0 < alpha <= 1:
+            raise ValueError("Le coefficient de lissage doit être dans ]0, 1]")
+
+        self.nb_matchs = nb_matchs
+        self.nb_jours = nb_jours
+        self.alpha = alpha
+        self._formes = {}
+        self._joueurs = {}
+        # Joueurs ayant reçu une ligne hors ordre chronologique, reconstruits à la prochaine requête
+        self._a_reconstruire = set()
+        self._date_reference = None
+
+    def enregistrer(self, joueur, stat):
+        """Intégrer une nouvelle ligne de statistiques du joueur"""
+        forme = self._formes.get(joueur.nom)
+        if forme is None:
+            forme = self._formes[joueur.nom] = FormeJoueur(self.nb_matchs, self.nb_jours, self.alpha)
+            self._joueurs[joueur.nom] = joueur
+
+        if joueur.nom not in self._a_reconstruire and not forme.ajouter(stat):
+            # Ligne arrivée en retard: l'état sera reconstruit dans l'ordre chronologique
+            self._a_reconstruire.add(joueur.nom)
+
+        if self._date_reference is None or stat.date_match > self._date_reference:
+            self._date_reference = stat.date_match
+
+    def differer(self, joueur):
+        """Calculer la forme du joueur à la prochaine requête (historique lu plus tard)"""
+        self._formes.setdefault(joueur.nom, FormeJoueur(self.nb_matchs, self.nb_jours, self.alpha))
+        self._joueurs[joueur.nom] = joueur
+        self._a_reconstruire.add(joueur.nom)
+
+    def oublier(self, nom_joueur):
+        """Retirer un joueur du suivi (joueur ou lignes retirés par une annulation)"""
+        self._formes.pop(nom_joueur, None)
+        self._joueurs.pop(nom_joueur, None)
+        self._a_reconstruire.discard(nom_joueur)
+
+    def recalculer_date_reference(self):
+        """Recalculer la date la plus récente après un retrait de lignes (les joueurs en attente la relèveront)"""
+        dates = [forme.derniere_date for nom, forme in self._formes.items()
+                 if nom not in self._a_reconstruire and forme.derniere_date is not None]
+        self._date_reference = max(dates, default=None)
+
+    def reconstruire(self, joueur):
+        """Recalculer la forme d'un joueur à partir de tout son historique"""
+        forme = self._formes[joueur.nom] = FormeJoueur(self.nb_matchs, self.nb_jours, self.alpha)
+        self._joueurs[joueur.nom] = joueur
+        for stat in sorted(joueur._statistiques, key=lambda s: s.jour):
+            forme.ajouter(stat)
+        if forme.derniere_date and (self._date_reference is None or forme.derniere_date > self._date_reference):
+            self._date_reference = forme.derniere_date
+        self._a_reconstruire.discard(joueur.nom)
+
+    def _reconstruire_en_attente(self):
+        for nom in list(self._a_reconstruire):
+            self.reconstruire(self._joueurs[nom])
+
+    def forme(self, nom_joueur):
+        """Indicateurs de forme d'un joueur (None s'il n'a aucune statistique)"""
+        if nom_joueur in self._a_reconstruire:
+            self.reconstruire(self._joueurs[nom_joueur])
+        forme = self._formes.get(nom_joueur)
+        return forme.indicateurs() if forme else None
+
+    def joueurs_en_forme(self, critere='points', limite=5, mode='matchs', min_matchs=1):
+        """Joueurs les plus en forme: liste de (joueur, valeur, indicateurs)
+
+        mode 'matchs': moyenne des N derniers matchs; 'jours': moyenne sur les
+        D derniers jours; 'ewma': moyenne exponentielle. Les joueurs sans match
+        dans les D jours précédant la date la plus récente de la ligue sont
+        écartés, pour ne pas classer des joueurs inactifs.
+        """
+        if critere not in CRITERES_FORME:
+            critere = 'points'
+        if mode not in MODES_FORME:
+            raise ValueError(f"Mode de forme invalide: {mode}")
+        self._reconstruire_en_attente()
+        if self._date_reference is None:
+            return []
+
+        date_limite = self._date_reference - timedelta(days=self.nb_jours)
+        candidats = []
+        for nom, forme in self._formes.items():
+            if forme.derniere_date is None or forme.derniere_date < date_limite:
+                continue
+            if len(forme.derniers_matchs.lignes) < min_matchs:
+                continue
+            if mode == 'ewma':
+                valeur = forme.ewma[CRITERES_FORME.index(critere)]
+            else:
+                fenetre = forme.derniers_matchs if mode == 'matchs' else forme.derniers_jours
+                valeur = fenetre.sommes[CRITERES_FORME.index(critere)] / len(fenetre.lignes)
+            candidats.append((valeur, nom))
+
+        meilleurs = heapq.nlargest(limite, candidats)
+        return [(self._joueurs[nom], valeur, self._formes[nom].indicateurs()) for valeur, nom in meilleurs]
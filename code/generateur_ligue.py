@@ -0,0 +1,73 @@
+import random
+from datetime import datetime, timedelta
+from nba_system import NBASystem
+from joueur import PosteJoueur
+from equipe import Equipe
+
+
+PRENOMS = ["James", "Kevin", "Stephen", "Anthony", "Jayson", "Jimmy", "Luka", "Nikola",
+           "Giannis", "Devin", "Trae", "Zion", "Damian", "Kyrie", "Paul", "Chris"]
+NOMS = ["Johnson", "Smith", "Williams", "Brown", "Davis", "Miller", "Wilson", "Moore",
+        "Taylor", "Anderson", "Thomas", "Jackson", "White", "Harris", "Martin", "Thompson"]
+VILLES = ["Chicago", "Boston", "Miami", "Denver", "Dallas", "Houston", "Phoenix", "Portland",
+          "Atlanta", "Detroit", "Memphis", "Orlando", "Toronto", "Utah", "Sacramento", "Milwaukee"]
+
+
+def generer_ligue(nb_equipes=30, joueurs_par_equipe=12, nb_saisons=1, matchs_par_saison=1230,
+                  stats_par_joueur=60, annee_debut_saison=2023, graine=42):
+    """Générer un NBASystem peuplé de données aléatoires reproductibles
+
+    Chaque saison commence en octobre; les statistiques d'un joueur sont
+    réparties uniformément sur les saisons générées.
+    """
+    if joueurs_par_equipe > Equipe.MAX_JOUEURS:
+        raise ValueError(f"Une équipe ne peut pas avoir plus de {Equipe.MAX_JOUEURS} joueurs")
+
+    rng = random.Random(graine)
+    systeme = NBASystem()
+    postes = list(PosteJoueur)
+
+    noms_equipes = []
+    for i in range(nb_equipes):
+        ville = VILLES[i % len(VILLES)]
+        nom = f"{ville} Team {i + 1:03d}"
+        systeme.ajouter_equipe(nom, ville)
+        noms_equipes.append(nom)
+
+    noms_joueurs = []
+    for i, nom_equipe in enumerate(noms_equipes):
+        for j in range(joueurs_par_equipe):
+            nom = f"{rng.choice(PRENOMS)} {rng.choice(NOMS)} {i * joueurs_par_equipe + j + 1:05d}"
+            poste = postes[j % len(postes)]
+            systeme.ajouter_joueur_a_equipe(nom_equipe, nom, "USA", rng.randint(1990, 2023), poste)
+            noms_joueurs.append(nom)
+
+    debuts = [datetime(annee_debut_saison + s, 10, 20) for s in range(nb_saisons)]
+
+    matchs = []
+    for debut in debuts:
+        for _ in range(matchs_par_saison):
+            dom, ext = rng.sample(noms_equipes, 2)
+            score_dom = rng.randint(85, 135)
+            score_ext = rng.randint(85, 135)
+            if score_dom == score_ext:
+                score_dom += 1
+            date = debut + timedelta(days=rng.randint(0, 170))
+            matchs.append((dom, ext, score_dom, score_ext, date))
+    systeme.ajouter_matchs_en_masse(matchs)
+
+    statistiques = []
+
+    for nom in noms_joueurs:
+        # Les lignes d'un joueur arrivent dans l'ordre chronologique, comme lors d'un import
+        dates = sorted(debuts[k % nb_saisons] + timedelta(days=rng.randint(0, 170))
+                       for k in range(stats_par_joueur))
+        for date in dates:
+            temps = round(rng.uniform(5, 42), 1)
+            points = rng.randint(0, 45)
+            passes = rng.randint(0, 14)
+            rebonds = rng.randint(0, 16)
+            statistiques.append((nom, temps, points, passes, rebonds, date))
+    systeme.ajouter_statistiques_en_masse(statistiques)
+
+    return systeme
@@ -0,0 +1,174 @@
+"""Instantané colonnaire de la ligue en mémoire partagée, pour les analyses multi-processus
+
+Les colonnes d'un MoteurAnalytique (lignes de statistiques, matchs, équipe de
+chaque joueur) et les noms des équipes et joueurs sont copiés une fois dans un
+segment multiprocessing.shared_memory. Un manifeste de quelques centaines
+d'octets (nom du segment, type, position et longueur de chaque colonne) suffit
+ensuite à un autre processus pour s'y attacher: ses tableaux NumPy sont des
+vues en lecture seule sur le segment, sans copie ni sérialisation du système.
+
+    with InstantanePartage.publier(systeme) as instantane:
+        resultats = instantane.executer(classement_au, [(jour,) for jour in jours], processus=4)
+
+La fonction exécutée reçoit le moteur attaché puis ses arguments; elle doit
+être définie au niveau d'un module pour pouvoir être envoyée aux processus.
+L'instantané est figé: les modifications ultérieures du système n'y
+apparaissent pas, il faut en publier un nouveau.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from moteur_analytique import MoteurAnalytique
+
+# Alignement des colonnes dans le segment (octets)
+ALIGNEMENT = 8
+SEPARATEUR = '\0'
+
+# Segments attachés par le processus courant: nom -> (SharedMemory, MoteurAnalytique)
+_attaches = {}
+
+
+def _colonnes(moteur):
+    """Colonnes du moteur à copier: nom qualifié -> tableau"""
+    colonnes = {'equipe_des_joueurs': moteur.equipe_des_joueurs}
+    colonnes.update((f"lignes.{nom}", valeurs) for nom, valeurs in moteur.lignes.items())
+    colonnes.update((f"matchs.{nom}", valeurs) for nom, valeurs in moteur.matchs.items())
+    return colonnes
+
+
+def _vues(segment, manifeste):
+    """Tableaux en lecture seule sur le segment, décrits par le manifeste"""
+    tableaux = {}
+    for nom, (type_valeurs, position, longueur) in manifeste['colonnes'].items():
+        tableau = np.ndarray(longueur, dtype=type_valeurs, buffer=segment.buf, offset=position)
+        tableau.flags.writeable = False
+        tableaux[nom] = tableau
+    noms = {}
+    for nom, (position, taille) in manifeste['noms'].items():
+        texte = bytes(segment.buf[position:position + taille]).decode('utf-8')
+        noms[nom] = texte.split(SEPARATEUR) if texte else []
+    return tableaux, noms
+
+
+def _moteur(tableaux, noms):
+    lignes = {nom.split('.', 1)[1]: v for nom, v in tableaux.items() if nom.startswith('lignes.')}
+    matchs = {nom.split('.', 1)[1]: v for nom, v in tableaux.items() if nom.startswith('matchs.')}
+    return MoteurAnalytique(noms['equipes'], noms['joueurs'], tableaux['equipe_des_joueurs'], lignes, matchs)
+
+
+def attacher(manifeste):
+    """Moteur analytique dont les colonnes sont des vues sur le segment publié (une fois par processus)"""
+    nom_segment = manifeste['segment']
+    if nom_segment not in _attaches:
+        segment = shared_memory.SharedMemory(name=nom_segment)
+        _attaches[nom_segment] = (segment, _moteur(*_vues(segment, manifeste)))
+    return _attaches[nom_segment][1]
+
+
+def _initialiser_processus(manifeste):
+    attacher(manifeste)
+
+
+def _executer_tache(nom_segment, fonction, arguments):
+    return fonction(_attaches[nom_segment][1], *arguments)
+
+
+class InstantanePartage:
+    """Segment de mémoire partagée contenant un instantané immuable de la ligue (côté publieur)"""
+
+    def __init__(self, segment, manifeste):
+        self._segment = segment
+        self.manifeste = manifeste
+
+    @classmethod
+    def publier(cls, source):
+        """Copier les colonnes d'un NBASystem (ou d'un MoteurAnalytique) dans un nouveau segment"""
+        moteur = source if isinstance(source, MoteurAnalytique) else MoteurAnalytique.depuis_systeme(source)
+        colonnes = {nom: np.ascontiguousarray(v) for nom, v in _colonnes(moteur).items()}
+        textes = {'equipes': SEPARATEUR.join(moteur.noms_equipes).encode('utf-8'),
+                  'joueurs': SEPARATEUR.join(moteur.noms_joueurs).encode('utf-8')}
+
+        # Plan du segment: colonnes alignées, puis noms encodés
+        manifeste = {'colonnes': {}, 'noms': {}, 'version': getattr(source, '_version', None)}
+        taille = 0
+        for nom, valeurs in colonnes.items():
+            manifeste['colonnes'][nom] = (valeurs.dtype.str, taille, len(valeurs))
+            taille += -(-valeurs.nbytes // ALIGNEMENT) * ALIGNEMENT
+        for nom, texte in textes.items():
+            manifeste['noms'][nom] = (taille, len(texte))
+            taille += len(texte)
+
+        segment = shared_memory.SharedMemory(create=True, size=max(taille, 1))
+        manifeste['segment'] = segment.name
+        try:
+            for nom, valeurs in colonnes.items():
+                _, position, _ = manifeste['colonnes'][nom]
+                segment.buf[position:position + valeurs.nbytes] = valeurs.tobytes()
+            for nom, texte in textes.items():
+                position, _ = manifeste['noms'][nom]
+                segment.buf[position:position + len(texte)] = texte
+        except BaseException:
+            segment.close()
+            segment.unlink()
+            raise
+        return cls(segment, manifeste)
+
+    @property
+    def nom(self):
+        return self.manifeste['segment']
+
+    @property
+    def taille(self):
+        """Taille du segment en octets"""
+        return self._segment.size
+
+    def moteur(self):
+        """Moteur analytique du processus publieur, lui aussi en vues sur le segment"""
+        if self.nom not in _attaches:
+            _attaches[self.nom] = (self._segment, _moteur(*_vues(self._segment, self.manifeste)))
+        return _attaches[self.nom][1]
+
+    def executer(self, fonction, arguments, processus=None):
+        """Appeler fonction(moteur, *args) pour chaque tuple args, réparti sur plusieurs processus
+
+        Chaque processus s'attache une seule fois au segment; seuls le nom du
+        segment, la fonction, ses arguments et ses résultats sont transmis.
+        Les résultats sont retournés dans l'ordre des arguments.
+        """
+        arguments = list(arguments)
+        processus = processus or os.cpu_count() or 1
+        if processus <= 1 or len(arguments) <= 1:
+            moteur = self.moteur()
+            return [fonction(moteur, *a) for a in arguments]
+
+        with ProcessPoolExecutor(max_workers=min(processus, len(arguments)), initializer=_initialiser_processus,
+                                 initargs=(self.manifeste,)) as executeur:
+            taches = [executeur.submit(_executer_tache, self.nom, fonction, a) for a in arguments]
+            return [tache.result() for tache in taches]
+
+    def fermer(self):
+        """Détacher le publieur et supprimer le segment
+
+        Les vues déjà obtenues par moteur() ne doivent plus être utilisées. Les
+        processus encore attachés gardent leur accès jusqu'à leur propre
+        détachement; le système libère alors la mémoire.
+        """
+        if self._segment is None:
+            return
+        _attaches.pop(self.nom, None)
+        try:
+            self._segment.close()
+        except BufferError:
+            # Des vues sont encore référencées: la projection sera libérée avec elles
+            pass
+        self._segment.unlink()
+        self._segment = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
@@ -0,0 +1,223 @@
+import atexit
+import functools
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+
+# Bornes supérieures (en ms) des intervalles de l'histogramme de latence
+BORNES_HISTOGRAMME_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+class MetriqueOperation:
+    """Compteurs et histogramme de latence pour une opération"""
+
+    def __init__(self, nom):
+        self.nom = nom
+        self.appels = 0
+        self.total_ms = 0.0
+        self.min_ms = float('inf')
+        self.max_ms = 0.0
+        # Un intervalle par borne plus un intervalle de débordement
+        self.histogramme = [0] * (len(BORNES_HISTOGRAMME_MS) + 1)
+
+    def enregistrer(self, duree_ms):
+        self.appels += 1
+        self.total_ms += duree_ms
+        self.min_ms = min(self.min_ms, duree_ms)
+        self.max_ms = max(self.max_ms, duree_ms)
+
+        for i, borne in enumerate(BORNES_HISTOGRAMME_MS):
+            if duree_ms <= borne:
+                self.histogramme[i] += 1
+                return
+        self.histogramme[-1] += 1
+
+    @property
+    def moyenne_ms(self):
+        return self.total_ms / self.appels if self.appels else 0.0
+
+    def en_dict(self):
+        return {
+            'appels': self.appels,
+            'total_ms': self.total_ms,
+            'moyenne_ms': self.moyenne_ms,
+            'min_ms': self.min_ms if self.appels else 0.0,
+            'max_ms': self.max_ms,
+            'histogramme': dict(zip([f"<={b}ms" for b in BORNES_HISTOGRAMME_MS] + ["plus"],
+                                    self.histogramme))
+        }
+
+
+class Instrumentation:
+    """Collecte des métriques par opération, avec profilage cProfile et trace Chrome optionnels
+
+    Désactivée par défaut: les fonctions instrumentées ne paient alors qu'un
+    test de booléen par appel.
+    """
+
+    TAILLE_MAX_TRACE = 200_000
+
+    def __init__(self):
+        self.actif = False
+        self._metriques = {}
+        self._verrou = threading.Lock()
+        self._profil = None
+        self._evenements_trace = None
+        self._origine = time.perf_counter()
+
+    def activer(self, profil=False, trace=False):
+        """Activer la collecte des métriques, et optionnellement cProfile et la trace Chrome"""
+        if profil and self._profil is None:
+            import cProfile
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+        if trace and self._evenements_trace is None:
+            self._evenements_trace = deque(maxlen=self.TAILLE_MAX_TRACE)
+        self.actif = True
+
+    def desactiver(self):
+        """Désactiver la collecte (les métriques déjà enregistrées sont conservées)"""
+        self.actif = False
+        if self._profil is not None:
+            self._profil.disable()
+
+    def reinitialiser(self):
+        """Effacer toutes les métriques, le profil et la trace"""
+        with self._verrou:
+            self._metriques.clear()
+            if self._evenements_trace is not None:
+                self._evenements_trace.clear()
+        if self._profil is not None:
+            self._profil.disable()
+            self._profil = None
+            if self.actif:
+                self.activer(profil=True)
+
+    def enregistrer(self, nom, debut, fin):
+        """Enregistrer une exécution de l'opération nom entre debut et fin (perf_counter)"""
+        duree_ms = (fin - debut) * 1000
+        with self._verrou:
+            metrique = self._metriques.get(nom)
+            if metrique is None:
+                metrique = self._metriques[nom] = MetriqueOperation(nom)
+            metrique.enregistrer(duree_ms)
+
+            if self._evenements_trace is not None:
+                self._evenements_trace.append({
+                    'name': nom,
+                    'cat': nom.split('.')[0],
+                    'ph': 'X',
+                    'ts': (debut - self._origine) * 1_000_000,
+                    'dur': duree_ms * 1000,
+                    'pid': os.getpid(),
+                    'tid': threading.get_ident()
+                })
+
+    @contextmanager
+    def mesurer(self, nom):
+        """Gestionnaire de contexte mesurant le bloc sous le nom donné"""
+        if not self.actif:
+            yield
+            return
+        debut = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.enregistrer(nom, debut, time.perf_counter())
+
+    def instrumenter(self, nom=None):
+        """Décorateur mesurant chaque appel de la fonction décorée"""
+        def decorateur(func):
+            nom_operation = nom or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.actif:
+                    return func(*args, **kwargs)
+                debut = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.enregistrer(nom_operation, debut, time.perf_counter())
+
+            wrapper.__instrumente__ = True
+            return wrapper
+        return decorateur
+
+    def instrumenter_classe(self, prefixe=''):
+        """Décorateur de classe instrumentant ses méthodes publiques commençant par prefixe"""
+        def decorateur(cls):
+            for nom_attribut, valeur in list(vars(cls).items()):
+                if (nom_attribut.startswith('_') or not nom_attribut.startswith(prefixe)
+                        or not callable(valeur) or isinstance(valeur, type)
+                        or getattr(valeur, '__instrumente__', False)):
+                    continue
+                setattr(cls, nom_attribut, self.instrumenter(f"{cls.__name__}.{nom_attribut}")(valeur))
+            return cls
+        return decorateur
+
+    def obtenir_metriques(self):
+        """Retourner les métriques collectées, triées par temps cumulé décroissant"""
+        with self._verrou:
+            metriques = sorted(self._metriques.values(), key=lambda m: m.total_ms, reverse=True)
+            return {m.nom: m.en_dict() for m in metriques}
+
+    def rapport(self):
+        """Générer un rapport texte des métriques collectées"""
+        lignes = [f"{'Opération':<45} {'appels':>8} {'total (ms)':>12} {'moy (ms)':>10} {'max (ms)':>10}"]
+        for nom, m in self.obtenir_metriques().items():
+            lignes.append(f"{nom:<45} {m['appels']:>8} {m['total_ms']:>12.2f} "
+                          f"{m['moyenne_ms']:>10.3f} {m['max_ms']:>10.2f}")
+        return "\n".join(lignes)
+
+    def exporter_pstats(self, chemin):
+        """Écrire le profil cProfile au format pstats"""
+        if self._profil is None:
+            raise RuntimeError("Le profilage n'est pas activé (activer(profil=True))")
+        self._profil.disable()
+        self._profil.dump_stats(chemin)
+        if self.actif:
+            self._profil.enable()
+
+    def exporter_trace_chrome(self, chemin):
+        """Écrire les mesures au format Chrome Trace (chrome://tracing, Perfetto)"""
+        if self._evenements_trace is None:
+            raise RuntimeError("La trace n'est pas activée (activer(trace=True))")
+        import json
+
+        with self._verrou:
+            evenements = list(self._evenements_trace)
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': evenements, 'displayTimeUnit': 'ms'}, f)
+
+
+instrumentation = Instrumentation()
+mesurer = instrumentation.mesurer
+instrumenter = instrumentation.instrumenter
+instrumenter_classe = instrumentation.instrumenter_classe
+
+
+def _configurer_depuis_environnement():
+    """Activer l'instrumentation via NBA_METRIQUES, NBA_PROFIL et NBA_TRACE"""
+    chemin_profil = os.environ.get('NBA_PROFIL')
+    chemin_trace = os.environ.get('NBA_TRACE')
+    if not (os.environ.get('NBA_METRIQUES') or chemin_profil or chemin_trace):
+        return
+
+    instrumentation.activer(profil=bool(chemin_profil), trace=bool(chemin_trace))
+
+    def exporter_a_la_sortie():
+        if chemin_profil:
+            instrumentation.exporter_pstats(chemin_profil)
+        if chemin_trace:
+            instrumentation.exporter_trace_chrome(chemin_trace)
+        if os.environ.get('NBA_METRIQUES'):
+            print(instrumentation.rapport())
+
+    atexit.register(exporter_a_la_sortie)
+
+
+_configurer_depuis_environnement()
@@ -1,7 +1,7 @@
-from datetime import datetime
 from personne import Personne
-from statistique_joueur import StatistiqueJoueur
+from statistique_joueur import StatistiqueJoueur, HistoriqueStatistiques
 from enum import Enum
+from instrumentation import instrumenter
 
 class PosteJoueur(Enum):
     """Énumération pour les postes de joueur"""
@@ -15,6 +15,8 @@ class PosteJoueur(Enum):
 class Joueur(Personne):
     """Classe représentant un joueur NBA"""
 
+    __slots__ = ('_annee_debut', '_poste', '_statistiques', '_equipe', '_version', '_moyennes_cache')
+
     def __init__(self, nom, origine, annee_debut, poste):
         super().__init__(nom, origine)
 
@@ -38,8 +40,11 @@ class Joueur(Personne):
 
         self._annee_debut = annee_debut
         self._poste = poste
-        self._statistiques = []
+        self._statistiques = HistoriqueStatistiques()
         self._equipe = None
+        # Incrémentée à chaque nouvelle statistique: clé des moyennes mémorisées
+        self._version = 0
+        self._moyennes_cache = None
 
     @property
     def annee_debut(self):
@@ -64,43 +69,41 @@ class Joueur(Personne):
         try:
             stat = StatistiqueJoueur(temps_jeu, points, passes, rebonds, date_match)
             self._statistiques.append(stat)
+            self._version += 1
             return True
         except ValueError as e:
             raise e
 
+    @instrumenter()
     def calculer_moyennes(self):
         """Calculer les moyennes des statistiques"""
         if not self._statistiques:
             return None
 
-        total_temps = sum(stat.temps_jeu for stat in self._statistiques)
-        total_points = sum(stat.points for stat in self._statistiques)
-        total_passes = sum(stat.passes for stat in self._statistiques)
-        total_rebonds = sum(stat.rebonds for stat in self._statistiques)
-        nb_matchs = len(self._statistiques)
+        if self._moyennes_cache is not None and self._moyennes_cache[0] == self._version:
+            return dict(self._moyennes_cache[1])
 
-        return {
-            'temps_jeu': total_temps / nb_matchs,
-            'points': total_points / nb_matchs,
-            'passes': total_passes / nb_matchs,
-            'rebonds': total_rebonds / nb_matchs,
+        nb_matchs, temps, points, passes, rebonds, efficacite = self._statistiques.totaux()
+        moyennes = {
+            'temps_jeu': temps / nb_matchs,
+            'points': points / nb_matchs,
+            'passes': passes / nb_matchs,
+            'rebonds': rebonds / nb_matchs,
             'matchs_joues': nb_matchs,
-            'efficacite_moyenne': sum(stat.calculer_efficacite() for stat in self._statistiques) / nb_matchs
+            'efficacite_moyenne': efficacite / nb_matchs
         }
+        self._moyennes_cache = (self._version, moyennes)
+        return dict(moyennes)
 
     def obtenir_meilleures_stats(self):
         """Retourne les meilleures statistiques du joueur"""
         if not self._statistiques:
             return None
 
-        meilleur_points = max(self._statistiques, key=lambda s: s.points)
-        meilleur_passes = max(self._statistiques, key=lambda s: s.passes)
-        meilleur_rebonds = max(self._statistiques, key=lambda s: s.rebonds)
-
         return {
-            'meilleur_score': meilleur_points.points,
-            'meilleur_passes': meilleur_passes.passes,
-            'meilleur_rebonds': meilleur_rebonds.rebonds
+            'meilleur_score': max(self._statistiques.points),
+            'meilleur_passes': max(self._statistiques.passes),
+            'meilleur_rebonds': max(self._statistiques.rebonds)
         }
 
     def afficher_informations(self):
@@ -0,0 +1,312 @@
+"""Journal d'écriture anticipée (write-ahead log) des mutations du système
+
+Chaque mutation réussie de NBASystem est ajoutée au journal sous forme d'une
+ligne JSON compacte [séquence, opération, arguments...], y compris le gel,
+la compaction, le déchargement et la restauration des saisons. Les écritures
+sont synchronisées sur disque (fsync) par lots, et au plus intervalle_fsync
+secondes après la dernière même si aucune autre ne suit; un point de
+contrôle écrit un instantané complet (données et état des saisons) de façon
+atomique puis vide le journal. Au démarrage, l'instantané est chargé et
+seules les lignes postérieures sont rejouées.
+
+    systeme, journal = ouvrir('donnees_nba')
+    systeme.ajouter_equipe("Chicago Bulls", "Chicago")   # journalisé
+    journal.fermer()
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+
+import persistance
+from dates import depuis_jour
+from evenements import (EquipeAjoutee, JoueurAjoute, JoueurTransfere, MatchAjoute, MatchsAjoutes, SaisonGelee,
+                        SaisonReorganisee, StatistiquesAjoutees, StatistiquesAjouteesEnMasse)
+from nba_system import NBASystem
+
+
+FICHIER_INSTANTANE = 'instantane.json'
+FICHIER_JOURNAL = 'journal.log'
+
+# Opérations journalisées -> indices des arguments de type date
+OPERATIONS = {
+    'ajouter_equipe': (),
+    'ajouter_joueur_a_equipe': (),
+    'transferer_joueur': (),
+    'ajouter_match': (4,),
+    'ajouter_statistiques': (5,),
+    'ajouter_matchs_en_masse': (),
+    'ajouter_statistiques_en_masse': (),
+    'geler_saison': (),
+    'compacter_saison': (),
+    'decharger_saison': (),
+    'restaurer_saison': (),
+}
+
+# Opération de saison correspondant à chaque SaisonReorganisee
+REORGANISATIONS = {
+    'compactee': 'compacter_saison',
+    'dechargee': 'decharger_saison',
+    'restauree': 'restaurer_saison',
+}
+
+# Opérations en masse (un argument: liste de lignes) -> indice de la date dans chaque ligne
+OPERATIONS_EN_MASSE = {
+    'ajouter_matchs_en_masse': 4,
+    'ajouter_statistiques_en_masse': 5,
+}
+
+
+def _operation(evenement):
+    """Ligne de journal (opération, arguments) correspondant à un événement de mutation"""
+    if isinstance(evenement, EquipeAjoutee):
+        return 'ajouter_equipe', evenement.nom, evenement.ville
+    if isinstance(evenement, JoueurAjoute):
+        return ('ajouter_joueur_a_equipe', evenement.nom_equipe, evenement.nom_joueur, evenement.origine,
+                evenement.annee_debut, evenement.poste)
+    if isinstance(evenement, JoueurTransfere):
+        return 'transferer_joueur', evenement.nom_joueur, evenement.nom_nouvelle_equipe
+    if isinstance(evenement, MatchAjoute):
+        m = evenement.match
+        return ('ajouter_match', m.equipe_domicile.nom, m.equipe_exterieur.nom, m.score_domicile,
+                m.score_exterieur, m.date)
+    if isinstance(evenement, MatchsAjoutes):
+        return 'ajouter_matchs_en_masse', [
+            [m.equipe_domicile.nom, m.equipe_exterieur.nom, m.score_domicile, m.score_exterieur,
+             m.date.isoformat()] for m in evenement.matchs]
+    if isinstance(evenement, SaisonGelee):
+        return 'geler_saison', evenement.annee
+    if isinstance(evenement, SaisonReorganisee):
+        if evenement.operation == 'dechargee':
+            return 'decharger_saison', evenement.annee, evenement.chemin
+        return REORGANISATIONS[evenement.operation], evenement.annee
+    if isinstance(evenement, StatistiquesAjouteesEnMasse):
+        return 'ajouter_statistiques_en_masse', [
+            [nom, temps_jeu, points, passes, rebonds, depuis_jour(jour).isoformat()]
+            for nom, temps_jeu, points, passes, rebonds, jour in evenement.lignes]
+    s = evenement.stat
+    return ('ajouter_statistiques', evenement.joueur.nom, s.temps_jeu, s.points, s.passes, s.rebonds,
+            s.date_match)
+
+
+def _fsync_repertoire(repertoire):
+    # Rendre durable le renommage d'un fichier (sans effet sous Windows)
+    if hasattr(os, 'O_DIRECTORY'):
+        fd = os.open(repertoire, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+class Journal:
+    """Journal des mutations d'un NBASystem, avec instantanés périodiques"""
+
+    def __init__(self, repertoire, fsync_toutes=100, intervalle_fsync=1.0, point_de_controle_toutes=50000):
+        self.repertoire = repertoire
+        self.fsync_toutes = fsync_toutes
+        self.intervalle_fsync = intervalle_fsync
+        self.point_de_controle_toutes = point_de_controle_toutes
+        self.sequence = 0
+        self._systeme = None
+        self._abonnement = None
+        self._fichier = None
+        self._en_attente = 0
+        self._dernier_fsync = time.monotonic()
+        self._depuis_point_de_controle = 0
+        # Synchronisation différée des dernières écritures (thread du minuteur): le verrou
+        # l'empêche de croiser une écriture, un point de contrôle ou la fermeture
+        self._verrou = threading.RLock()
+        self._minuteur = None
+
+    @property
+    def chemin_instantane(self):
+        return os.path.join(self.repertoire, FICHIER_INSTANTANE)
+
+    @property
+    def chemin_journal(self):
+        return os.path.join(self.repertoire, FICHIER_JOURNAL)
+
+    def attacher(self, systeme):
+        """Journaliser désormais les mutations du système"""
+        os.makedirs(self.repertoire, exist_ok=True)
+        if self._fichier is None:
+            self._fichier = open(self.chemin_journal, 'a', encoding='utf-8')
+        self._detacher()
+        self._systeme = systeme
+        # Abonné synchrone par lots: hors d'un bloc, la mutation est journalisée avant de rendre
+        # la main; les événements d'une transaction validée ou d'un bloc batch() arrivent ensemble,
+        # et un point de contrôle n'est pris qu'après le dernier (l'instantané couvre alors
+        # exactement les séquences écrites)
+        self._abonnement = systeme.evenements.abonner(
+            self._enregistrer_evenements,
+            (EquipeAjoutee, JoueurAjoute, JoueurTransfere, MatchAjoute, MatchsAjoutes, StatistiquesAjoutees,
+             StatistiquesAjouteesEnMasse, SaisonGelee, SaisonReorganisee), par_lots=True)
+
+    def _detacher(self):
+        if self._abonnement is not None:
+            self._systeme.evenements.desabonner(self._abonnement)
+            self._abonnement = None
+
+    def _enregistrer_evenements(self, evenements):
+        with self._verrou:
+            for evenement in evenements:
+                self._ecrire(*_operation(evenement))
+            self._apres_ecriture()
+
+    def enregistrer(self, operation, *arguments):
+        """Ajouter une mutation au journal"""
+        with self._verrou:
+            self._ecrire(operation, *arguments)
+            self._apres_ecriture()
+
+    def _ecrire(self, operation, *arguments):
+        self.sequence += 1
+        arguments = [a.isoformat() if isinstance(a, datetime) else a for a in arguments]
+        self._fichier.write(json.dumps([self.sequence, operation] + arguments,
+                                       ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._fichier.flush()
+        self._en_attente += 1
+        self._depuis_point_de_controle += 1
+
+    def _apres_ecriture(self):
+        if (self._en_attente >= self.fsync_toutes
+                or time.monotonic() - self._dernier_fsync >= self.intervalle_fsync):
+            self.synchroniser()
+        elif self._minuteur is None:
+            # Sans écriture suivante, la synchronisation a lieu au plus tard après l'intervalle
+            self._minuteur = threading.Timer(self.intervalle_fsync, self._synchroniser_en_attente)
+            self._minuteur.daemon = True
+            self._minuteur.start()
+        if self._depuis_point_de_controle >= self.point_de_controle_toutes:
+            self.point_de_controle()
+
+    def _synchroniser_en_attente(self):
+        with self._verrou:
+            self._minuteur = None
+            self.synchroniser()
+
+    def synchroniser(self):
+        """Forcer l'écriture sur disque des mutations journalisées"""
+        with self._verrou:
+            if self._fichier is not None and self._en_attente:
+                os.fsync(self._fichier.fileno())
+            self._en_attente = 0
+            self._dernier_fsync = time.monotonic()
+
+    def point_de_controle(self):
+        """Écrire un instantané complet du système puis vider le journal"""
+        with self._verrou:
+            self.synchroniser()
+            temporaire = self.chemin_instantane + '.tmp'
+            with open(temporaire, 'w', encoding='utf-8') as f:
+                json.dump({'sequence': self.sequence, 'donnees': persistance.exporter_donnees(self._systeme),
+                           'saisons': _etats_saisons(self._systeme)},
+                          f, ensure_ascii=False, separators=(',', ':'))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temporaire, self.chemin_instantane)
+            _fsync_repertoire(self.repertoire)
+
+            # Une panne avant cette troncature est sans effet: le rejeu ignore les
+            # lignes déjà couvertes par l'instantané (séquence inférieure ou égale)
+            self._fichier.close()
+            self._fichier = open(self.chemin_journal, 'w', encoding='utf-8')
+            self._depuis_point_de_controle = 0
+
+    def reinitialiser(self, systeme):
+        """Remplacer l'état journalisé par celui d'un autre système (chargement d'un fichier)"""
+        self.attacher(systeme)
+        self.point_de_controle()
+
+    def fermer(self):
+        """Synchroniser et fermer le journal"""
+        with self._verrou:
+            if self._minuteur is not None:
+                self._minuteur.cancel()
+                self._minuteur = None
+            if self._fichier is not None:
+                self.synchroniser()
+                self._fichier.close()
+                self._fichier = None
+        self._detacher()
+
+
+def _etats_saisons(systeme):
+    """État des saisons non actives: année -> (état, fichier des colonnes d'une saison déchargée)"""
+    return {str(annee): (saison.etat, saison._chemin) for annee, saison in sorted(systeme._saisons.items())
+            if saison.etat != 'active'}
+
+
+def _retablir_saisons(systeme, etats):
+    # Les données de l'instantané sont importées dans des saisons actives: leur
+    # réappliquer gel, compaction ou déchargement
+    for annee, (etat, chemin) in etats.items():
+        annee = int(annee)
+        if annee not in systeme._saisons:
+            continue
+        if etat == 'gelee':
+            systeme.geler_saison(annee)
+        elif etat == 'compactee':
+            systeme.compacter_saison(annee)
+        elif etat == 'dechargee':
+            systeme.decharger_saison(annee, chemin)
+
+
+def _rejouer(systeme, ligne):
+    sequence, operation, *arguments = ligne
+    if operation not in OPERATIONS:
+        raise ValueError(f"Opération inconnue dans le journal: {operation}")
+    for i in OPERATIONS[operation]:
+        if i < len(arguments) and arguments[i] is not None:
+            arguments[i] = datetime.fromisoformat(arguments[i])
+    if operation in OPERATIONS_EN_MASSE:
+        i = OPERATIONS_EN_MASSE[operation]
+        for donnees in arguments[0]:
+            donnees[i] = datetime.fromisoformat(donnees[i])
+    getattr(systeme, operation)(*arguments)
+    return sequence
+
+
+def ouvrir(repertoire, **options):
+    """Restaurer le système depuis l'instantané et la fin du journal, puis journaliser la suite
+
+    Retourne (systeme, journal). Une dernière ligne incomplète (panne pendant
+    l'écriture) est ignorée.
+    """
+    journal = Journal(repertoire, **options)
+    sequence = 0
+    if os.path.exists(journal.chemin_instantane):
+        instantane = persistance.lire_fichier(journal.chemin_instantane)
+        systeme = persistance.importer_donnees(instantane['donnees'])
+        _retablir_saisons(systeme, instantane.get('saisons', {}))
+        sequence = instantane['sequence']
+    else:
+        systeme = NBASystem()
+
+    rejouees = 0
+    if os.path.exists(journal.chemin_journal):
+        fin_valide = 0
+        with open(journal.chemin_journal, 'rb') as f:
+            for texte in f:
+                if not texte.endswith(b'\n'):
+                    break
+                try:
+                    ligne = json.loads(texte)
+                except ValueError:
+                    break
+                fin_valide += len(texte)
+                if ligne[0] <= sequence:
+                    continue
+                sequence = _rejouer(systeme, ligne)
+                rejouees += 1
+        # Retirer la ligne incomplète pour que les ajouts suivants restent lisibles
+        if fin_valide < os.path.getsize(journal.chemin_journal):
+            with open(journal.chemin_journal, 'r+b') as f:
+                f.truncate(fin_valide)
+
+    journal.sequence = sequence
+    journal._depuis_point_de_controle = rejouees
+    journal.attacher(systeme)
+    return systeme, journal
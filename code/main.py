@@ -1,6 +1,6 @@
 import tkinter as tk
 from tkinter import messagebox
-# from nba_api_client import NBAGuiWithAPI
+# from nba_gui_api import NBAGuiWithAPI
 from nba_gui import NBAGui
 
 
@@ -29,6 +29,7 @@ def main():
     # Configuration pour la fermeture
     def on_closing():
         if messagebox.askokcancel("Quitter", "Voulez-vous vraiment quitter le système NBA?"):
+            app.fermer_journal()
             root.destroy()
 
     root.protocol("WM_DELETE_WINDOW", on_closing)
@@ -1,8 +1,36 @@
-from datetime import datetime
+from datetime import date as date_simple, datetime
+from dates import vers_jour, depuis_jour
+
+# Mois à partir duquel une date appartient à la saison suivante (la saison
+# 2023 commence en octobre 2023 et se termine en juin 2024)
+MOIS_DEBUT_SAISON = 8
+
+
+def saison_de(date):
+    """Retourner l'année de début de la saison NBA contenant la date"""
+    return date.year if date.month >= MOIS_DEBUT_SAISON else date.year - 1
+
+
+def parser_date(date):
+    """Convertir une date (chaîne YYYY-MM-DD, date ou datetime) en datetime"""
+    if isinstance(date, str):
+        try:
+            return datetime.strptime(date, "%Y-%m-%d")
+        except ValueError:
+            raise ValueError("Format de date invalide. Utilisez YYYY-MM-DD")
+    elif isinstance(date, datetime):
+        return date
+    elif isinstance(date, date_simple):
+        return datetime(date.year, date.month, date.day)
+    else:
+        raise ValueError("La date doit être une chaîne, une date ou un objet datetime")
+
 
 class Match:
     """Classe représentant un match NBA"""
 
+    __slots__ = ('_equipe_domicile', '_equipe_exterieur', '_score_domicile', '_score_exterieur', '_jour', '_finalise')
+
     def __init__(self, equipe_domicile, equipe_exterieur, score_domicile, score_exterieur, date):
         self._valider_parametres(equipe_domicile, equipe_exterieur, score_domicile, score_exterieur)
 
@@ -10,7 +38,7 @@ class Match:
         self._equipe_exterieur = equipe_exterieur
         self._score_domicile = score_domicile
         self._score_exterieur = score_exterieur
-        self._date = self._parser_date(date)
+        self._jour = vers_jour(self._parser_date(date))
         self._finalise = False
 
         self._mettre_a_jour_bilans()
@@ -32,15 +60,19 @@ class Match:
 
     def _parser_date(self, date):
         """Parse la date en objet datetime"""
-        if isinstance(date, str):
-            try:
-                return datetime.strptime(date, "%Y-%m-%d")
-            except ValueError:
-                raise ValueError("Format de date invalide. Utilisez YYYY-MM-DD")
-        elif isinstance(date, datetime):
-            return date
-        else:
-            raise ValueError("La date doit être une chaîne ou un objet datetime")
+        return parser_date(date)
+
+    @classmethod
+    def depuis_archive(cls, equipe_domicile, equipe_exterieur, score_domicile, score_exterieur, date):
+        """Recréer un match déjà comptabilisé, sans modifier les bilans des équipes"""
+        match = cls.__new__(cls)
+        match._equipe_domicile = equipe_domicile
+        match._equipe_exterieur = equipe_exterieur
+        match._score_domicile = score_domicile
+        match._score_exterieur = score_exterieur
+        match._jour = vers_jour(parser_date(date))
+        match._finalise = True
+        return match
 
     @property
     def equipe_domicile(self):
@@ -60,7 +92,12 @@ class Match:
 
     @property
     def date(self):
-        return self._date
+        return depuis_jour(self._jour)
+
+    @property
+    def jour(self):
+        """Ordinal du jour du match (date.toordinal)"""
+        return self._jour
 
     @property
     def finalise(self):
@@ -75,6 +112,15 @@ class Match:
             self._equipe_exterieur.ajouter_victoire()
             self._equipe_domicile.ajouter_defaite()
 
+    def _annuler_bilans(self):
+        """Retirer des bilans des équipes le résultat du match (annulation)"""
+        if self._score_domicile > self._score_exterieur:
+            self._equipe_domicile.retirer_victoire()
+            self._equipe_exterieur.retirer_defaite()
+        elif self._score_exterieur > self._score_domicile:
+            self._equipe_exterieur.retirer_victoire()
+            self._equipe_domicile.retirer_defaite()
+
     def get_equipe_gagnante(self):
         """Retourner l'équipe gagnante"""
         if self._score_domicile > self._score_exterieur:
@@ -102,4 +148,4 @@ class Match:
         return self.get_ecart_points() <= seuil
 
     def __str__(self):
-        return f"{self._equipe_domicile.nom} {self._score_domicile} - {self._score_exterieur} {self._equipe_exterieur.nom} ({self._date.strftime('%Y-%m-%d')})"
+        return f"{self._equipe_domicile.nom} {self._score_domicile} - {self._score_exterieur} {self._equipe_exterieur.nom} ({self.date.strftime('%Y-%m-%d')})"
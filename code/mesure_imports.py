@@ -0,0 +1,93 @@
+"""Vérification du budget de temps d'import des modules (python -X importtime)
+
+Chaque module est importé dans un interpréteur neuf; le script échoue (code 1)
+si un module dépasse son budget ou charge une dépendance lourde interdite.
+
+    python mesure_imports.py
+    python mesure_imports.py --repetitions 5 --facteur 2
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+
+# Module -> (budget en ms, dépendances qui ne doivent pas être chargées)
+BUDGETS = {
+    'personne': (5, ('tkinter', 'requests')),
+    'equipe': (15, ('tkinter', 'requests')),
+    'joueur': (15, ('tkinter', 'requests')),
+    'match': (10, ('tkinter', 'requests')),
+    'nba_system': (20, ('tkinter', 'requests')),
+    'persistance': (25, ('tkinter', 'requests')),
+    'nba_api_client': (25, ('tkinter', 'requests', 'nba_gui')),
+    'nba_cli': (40, ('tkinter', 'requests', 'nba_gui')),
+}
+
+REPERTOIRE = os.path.dirname(os.path.abspath(__file__))
+
+
+def mesurer_import(module):
+    """Importer un module dans un nouvel interpréteur et analyser la sortie -X importtime
+
+    Retourne (temps cumulé du module en ms, ensemble des modules importés).
+    """
+    resultat = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=REPERTOIRE, capture_output=True, text=True, check=True)
+
+    cumul_ms = None
+    importes = set()
+    for ligne in resultat.stderr.splitlines():
+        if not ligne.startswith('import time:') or 'cumulative' in ligne:
+            continue
+        # Format: "import time: <self us> | <cumulative us> | <indentation><module>"
+        _, cumul, nom = ligne.split('|')
+        nom = nom.strip()
+        importes.add(nom)
+        if nom == module:
+            cumul_ms = int(cumul) / 1000
+
+    return cumul_ms, importes
+
+
+def verifier(repetitions=3, facteur=1.0):
+    """Vérifier chaque module et retourner la liste des dépassements"""
+    echecs = []
+    print(f"{'Module':<18} {'mesure (ms)':>12} {'budget (ms)':>12}")
+    for module, (budget, interdits) in BUDGETS.items():
+        mesures = []
+        importes = set()
+        for _ in range(repetitions):
+            cumul_ms, importes = mesurer_import(module)
+            mesures.append(cumul_ms)
+        # Le minimum est la mesure la moins bruitée
+        meilleur = min(mesures)
+        limite = budget * facteur
+
+        print(f"{module:<18} {meilleur:>12.1f} {limite:>12.1f}")
+        if meilleur > limite:
+            echecs.append(f"{module}: {meilleur:.1f} ms > budget de {limite:.1f} ms")
+
+        charges = sorted(m for m in interdits if any(i == m or i.startswith(m + '.') for i in importes))
+        if charges:
+            echecs.append(f"{module}: charge {', '.join(charges)} à l'import")
+
+    return echecs
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vérifier le budget de temps d'import des modules")
+    parser.add_argument('--repetitions', type=int, default=3)
+    parser.add_argument('--facteur', type=float, default=1.0,
+                        help="Multiplicateur appliqué aux budgets (machines lentes, CI)")
+    args = parser.parse_args()
+
+    echecs = verifier(args.repetitions, args.facteur)
+    for echec in echecs:
+        print(f"ÉCHEC - {echec}")
+    return 1 if echecs else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
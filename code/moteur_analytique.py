@@ -0,0 +1,274 @@
+from datetime import date
+import numpy as np
+from match import MOIS_DEBUT_SAISON
+
+
+CRITERES = ('points', 'passes', 'rebonds', 'efficacite_moyenne')
+
+
+def saisons_depuis_ordinaux(jours):
+    """Version vectorisée de match.saison_de pour un tableau d'ordinaux de dates"""
+    jours = np.asarray(jours, dtype=np.int64)
+    if len(jours) == 0:
+        return np.empty(0, dtype=np.int64)
+
+    # Dates de début de chaque saison couverte, puis recherche dichotomique
+    premiere = date.fromordinal(int(jours.min())).year - 1
+    derniere = date.fromordinal(int(jours.max())).year
+    debuts = np.array([date(annee, MOIS_DEBUT_SAISON, 1).toordinal() for annee in range(premiere, derniere + 1)])
+    return premiere - 1 + np.searchsorted(debuts, jours, side='right')
+
+
+class MoteurAnalytique:
+    """Vue colonnaire de la ligue pour les agrégations de masse avec NumPy
+
+    Les lignes de statistiques et les matchs sont matérialisés une fois en
+    tableaux (identifiants entiers de joueur, d'équipe et dates ordinales);
+    les regroupements par joueur, équipe ou saison se font ensuite avec
+    bincount et reduceat, sans boucle Python sur les objets.
+    """
+
+    def __init__(self, noms_equipes, noms_joueurs, equipe_des_joueurs, lignes, matchs):
+        self.noms_equipes = noms_equipes
+        self.noms_joueurs = noms_joueurs
+        # Équipe actuelle de chaque joueur (-1 si libre)
+        self.equipe_des_joueurs = equipe_des_joueurs
+        # Colonnes des lignes de statistiques: joueur, jour, temps_jeu, points, passes, rebonds
+        self.lignes = lignes
+        # Colonnes des matchs: domicile, exterieur, score_domicile, score_exterieur, jour
+        self.matchs = matchs
+        self._index_joueurs = {nom: i for i, nom in enumerate(noms_joueurs)}
+
+    @classmethod
+    def depuis_systeme(cls, systeme):
+        """Matérialiser les données d'un NBASystem en tableaux NumPy"""
+        noms_equipes = list(systeme._equipes)
+        id_equipes = {nom: i for i, nom in enumerate(noms_equipes)}
+        joueurs = list(systeme._joueurs_index.values())
+
+        equipe_des_joueurs = np.fromiter(
+            (id_equipes[j.equipe.nom] if j.equipe else -1 for j in joueurs),
+            dtype=np.int32, count=len(joueurs))
+
+        nb_lignes = sum(len(j._statistiques) for j in joueurs)
+        lignes = {
+            'joueur': np.empty(nb_lignes, dtype=np.int32),
+            'jour': np.empty(nb_lignes, dtype=np.int32),
+            'temps_jeu': np.empty(nb_lignes, dtype=np.float64),
+            'points': np.empty(nb_lignes, dtype=np.float64),
+            'passes': np.empty(nb_lignes, dtype=np.float64),
+            'rebonds': np.empty(nb_lignes, dtype=np.float64),
+        }
+        position = 0
+        for id_joueur, joueur in enumerate(joueurs):
+            stats = joueur._statistiques
+            fin = position + len(stats)
+            lignes['joueur'][position:fin] = id_joueur
+            # Colonnes typées de l'historique: copie directe depuis leur tampon
+            for colonne in ('jour', 'temps_jeu', 'points', 'passes', 'rebonds'):
+                valeurs = getattr(stats, colonne)
+                lignes[colonne][position:fin] = np.frombuffer(valeurs, dtype=valeurs.typecode) if stats else ()
+            position = fin
+
+        tous_matchs = systeme._matchs
+        matchs = {
+            'domicile': np.fromiter((id_equipes[m.equipe_domicile.nom] for m in tous_matchs),
+                                    dtype=np.int32, count=len(tous_matchs)),
+            'exterieur': np.fromiter((id_equipes[m.equipe_exterieur.nom] for m in tous_matchs),
+                                     dtype=np.int32, count=len(tous_matchs)),
+            'score_domicile': np.fromiter((m.score_domicile for m in tous_matchs),
+                                          dtype=np.int32, count=len(tous_matchs)),
+            'score_exterieur': np.fromiter((m.score_exterieur for m in tous_matchs),
+                                           dtype=np.int32, count=len(tous_matchs)),
+            'jour': np.fromiter((m.jour for m in tous_matchs),
+                                dtype=np.int32, count=len(tous_matchs)),
+        }
+
+        return cls(noms_equipes, [j.nom for j in joueurs], equipe_des_joueurs, lignes, matchs)
+
+    @property
+    def nb_joueurs(self):
+        return len(self.noms_joueurs)
+
+    @property
+    def nb_equipes(self):
+        return len(self.noms_equipes)
+
+    @staticmethod
+    def _jusqu_au(colonnes, jour_max):
+        """Colonnes limitées aux lignes des jours <= jour_max (toutes si jour_max est None)"""
+        if jour_max is None:
+            return colonnes
+        masque = colonnes['jour'] <= jour_max
+        return {nom: valeurs[masque] for nom, valeurs in colonnes.items()}
+
+    @staticmethod
+    def _efficacite_lignes(lignes):
+        temps = lignes['temps_jeu']
+        total = lignes['points'] + lignes['passes'] + lignes['rebonds']
+        return np.divide(total, temps, out=np.zeros_like(total), where=temps > 0)
+
+    def moyennes_par_joueur(self, jour_max=None):
+        """Moyennes de chaque joueur (mêmes champs que Joueur.calculer_moyennes)
+
+        Retourne un dictionnaire de tableaux indexés par identifiant de joueur;
+        les joueurs sans statistiques ont matchs_joues == 0 et des moyennes nulles.
+        Avec jour_max (ordinal), seuls les matchs joués jusqu'à ce jour comptent.
+        """
+        lignes = self._jusqu_au(self.lignes, jour_max)
+        ids = lignes['joueur']
+        matchs = np.bincount(ids, minlength=self.nb_joueurs)
+        diviseur = np.maximum(matchs, 1)
+
+        moyennes = {'matchs_joues': matchs}
+        for colonne in ('temps_jeu', 'points', 'passes', 'rebonds'):
+            moyennes[colonne] = np.bincount(ids, weights=lignes[colonne], minlength=self.nb_joueurs) / diviseur
+        moyennes['efficacite_moyenne'] = np.bincount(
+            ids, weights=self._efficacite_lignes(lignes), minlength=self.nb_joueurs) / diviseur
+        return moyennes
+
+    def records_par_joueur(self):
+        """Meilleures performances de chaque joueur (comme Joueur.obtenir_meilleures_stats)"""
+        records = {cle: np.zeros(self.nb_joueurs) for cle in ('meilleur_score', 'meilleur_passes', 'meilleur_rebonds')}
+        if len(self.lignes['joueur']) == 0:
+            return records
+
+        # Les lignes issues de depuis_systeme sont déjà groupées par joueur;
+        # sinon on trie pour obtenir des segments contigus avant de réduire
+        ids = self.lignes['joueur']
+        ordre = None
+        if np.any(ids[1:] < ids[:-1]):
+            ordre = np.argsort(ids, kind='stable')
+            ids = ids[ordre]
+        debuts = np.flatnonzero(np.r_[True, ids[1:] != ids[:-1]])
+        joueurs_presents = ids[debuts]
+
+        for cle, colonne in (('meilleur_score', 'points'), ('meilleur_passes', 'passes'),
+                             ('meilleur_rebonds', 'rebonds')):
+            valeurs = self.lignes[colonne] if ordre is None else self.lignes[colonne][ordre]
+            records[cle][joueurs_presents] = np.maximum.reduceat(valeurs, debuts)
+        return records
+
+    def moyennes_par_equipe(self):
+        """Moyennes par joueur actif de chaque équipe (comme Equipe.obtenir_statistiques_equipe)"""
+        moyennes = self.moyennes_par_joueur()
+        actifs = (moyennes['matchs_joues'] > 0) & (self.equipe_des_joueurs >= 0)
+        equipes = self.equipe_des_joueurs[actifs]
+
+        joueurs_actifs = np.bincount(equipes, minlength=self.nb_equipes)
+        diviseur = np.maximum(joueurs_actifs, 1)
+        resultat = {'joueurs_actifs': joueurs_actifs}
+        for cle, colonne in (('points_moyens', 'points'), ('passes_moyennes', 'passes'),
+                             ('rebonds_moyens', 'rebonds')):
+            resultat[cle] = np.bincount(equipes, weights=moyennes[colonne][actifs],
+                                        minlength=self.nb_equipes) / diviseur
+        return resultat
+
+    def bilans(self, jour_max=None):
+        """Victoires et défaites de chaque équipe d'après les matchs (joués jusqu'à jour_max)"""
+        matchs = self._jusqu_au(self.matchs, jour_max)
+        dom, ext = matchs['domicile'], matchs['exterieur']
+        ecart = matchs['score_domicile'] - matchs['score_exterieur']
+        victoires = (np.bincount(dom[ecart > 0], minlength=self.nb_equipes)
+                     + np.bincount(ext[ecart < 0], minlength=self.nb_equipes))
+        defaites = (np.bincount(dom[ecart < 0], minlength=self.nb_equipes)
+                    + np.bincount(ext[ecart > 0], minlength=self.nb_equipes))
+        return victoires, defaites
+
+    def classement(self, jour_max=None):
+        """Classement des équipes ayant joué: liste de (nom, victoires, défaites, pourcentage)"""
+        victoires, defaites = self.bilans(jour_max)
+        joues = victoires + defaites
+        pourcentages = np.divide(victoires * 100.0, joues, out=np.zeros(self.nb_equipes), where=joues > 0)
+
+        # lexsort trie sur la dernière clé en premier: pourcentage puis victoires
+        ordre = np.lexsort((-victoires, -pourcentages))
+        return [(self.noms_equipes[i], int(victoires[i]), int(defaites[i]), float(pourcentages[i]))
+                for i in ordre if joues[i] > 0]
+
+    def meilleurs_joueurs(self, critere='points', limite=5, jour_max=None):
+        """Top des joueurs selon un critère: liste de (nom, valeur)"""
+        if critere not in CRITERES:
+            critere = 'points'
+        moyennes = self.moyennes_par_joueur(jour_max)
+        candidats = np.flatnonzero(moyennes['matchs_joues'] > 0)
+        if len(candidats) == 0:
+            return []
+
+        valeurs = moyennes[critere][candidats]
+        if limite < len(candidats):
+            # Sélection partielle en O(n) avant de trier les seuls gagnants
+            selection = np.argpartition(-valeurs, limite - 1)[:limite]
+        else:
+            selection = np.arange(len(candidats))
+        selection = selection[np.argsort(-valeurs[selection], kind='stable')]
+        return [(self.noms_joueurs[candidats[i]], float(valeurs[i])) for i in selection]
+
+    def moyennes_joueur(self, nom):
+        """Moyennes d'un joueur au format de Joueur.calculer_moyennes (None sans statistiques)"""
+        id_joueur = self._index_joueurs.get(nom)
+        if id_joueur is None:
+            return None
+        moyennes = self.moyennes_par_joueur()
+        if moyennes['matchs_joues'][id_joueur] == 0:
+            return None
+        return {cle: (int(valeurs[id_joueur]) if cle == 'matchs_joues' else float(valeurs[id_joueur]))
+                for cle, valeurs in moyennes.items()}
+
+    def totaux_par_saison(self):
+        """Agrégats par saison: lignes de statistiques et matchs
+
+        Retourne un dictionnaire saison -> {lignes, points, passes, rebonds,
+        matchs, points_par_match, matchs_serres}.
+        """
+        saisons_lignes = saisons_depuis_ordinaux(self.lignes['jour'])
+        saisons_matchs = saisons_depuis_ordinaux(self.matchs['jour'])
+        toutes = np.concatenate([saisons_lignes, saisons_matchs])
+        if len(toutes) == 0:
+            return {}
+        premiere = int(toutes.min())
+        id_lignes = saisons_lignes - premiere
+        id_matchs = saisons_matchs - premiere
+        n = int(toutes.max()) - premiere + 1
+
+        nb_lignes = np.bincount(id_lignes, minlength=n)
+        totaux = {colonne: np.bincount(id_lignes, weights=self.lignes[colonne], minlength=n)
+                  for colonne in ('points', 'passes', 'rebonds')}
+
+        nb_matchs = np.bincount(id_matchs, minlength=n)
+        points_matchs = np.bincount(id_matchs, weights=self.matchs['score_domicile'] + self.matchs['score_exterieur'],
+                                    minlength=n)
+        ecarts = np.abs(self.matchs['score_domicile'] - self.matchs['score_exterieur'])
+        serres = np.bincount(id_matchs, weights=(ecarts <= 5), minlength=n)
+
+        return {
+            premiere + i: {
+                'lignes': int(nb_lignes[i]),
+                'points': float(totaux['points'][i]),
+                'passes': float(totaux['passes'][i]),
+                'rebonds': float(totaux['rebonds'][i]),
+                'matchs': int(nb_matchs[i]),
+                'points_par_match': float(points_matchs[i] / nb_matchs[i]) if nb_matchs[i] else 0.0,
+                'matchs_serres': int(serres[i]),
+            }
+            for i in range(n) if nb_lignes[i] or nb_matchs[i]
+        }
+
+    def resume_ligue(self):
+        """Résumé de la ligue (champs de NBASystem.obtenir_statistiques_generales et totaux de points)"""
+        victoires, defaites = self.bilans()
+        matchs_joues = np.bincount(self.lignes['joueur'], minlength=self.nb_joueurs)
+        scores = self.matchs['score_domicile'] + self.matchs['score_exterieur']
+        ecarts = np.abs(self.matchs['score_domicile'] - self.matchs['score_exterieur'])
+        nb_matchs = len(scores)
+
+        return {
+            'equipes_total': self.nb_equipes,
+            'equipes_actives': int(np.count_nonzero(victoires + defaites)),
+            'joueurs_total': self.nb_joueurs,
+            'joueurs_actifs': int(np.count_nonzero(matchs_joues)),
+            'matchs_total': nb_matchs,
+            'lignes_statistiques': len(self.lignes['joueur']),
+            'points_par_match': float(scores.mean()) if nb_matchs else 0.0,
+            'matchs_serres': int(np.count_nonzero(ecarts <= 5)),
+        }
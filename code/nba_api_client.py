@@ -1,13 +1,6 @@
-import requests
-import tkinter as tk
-from tkinter import ttk, messagebox
-import json
-from typing import Dict, List, Optional
+from typing import Dict, List
 from datetime import datetime
-from nba_gui import NBAGui
-from nba_system import NBASystem
-from joueur import PosteJoueur
-from nba_system import ValidationError
+from instrumentation import instrumenter_classe
 
 
 class NBAApiClient:
@@ -23,117 +16,91 @@ class NBAApiClient:
             'X-RapidAPI-Host': 'free-nba.p.rapidapi.com'
         }
 
-    def get_teams(self) -> List[Dict]:
+    def _get(self, chemin: str, params: Dict = None, contexte: str = "la requête") -> List[Dict]:
         """
-        Récupérer la liste de toutes les équipes NBA
+        Effectuer une requête GET et retourner le champ 'data' de la réponse
         """
+        # Import différé: requests coûte ~100 ms au démarrage et n'est utile
+        # qu'au premier appel réseau
+        import requests
+
         try:
-            url = f"{self.base_url}/teams"
-            response = requests.get(url, headers=self.headers)
+            response = requests.get(f"{self.base_url}/{chemin}", headers=self.headers, params=params)
             response.raise_for_status()
 
             data = response.json()
             return data.get('data', [])
         except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des équipes: {e}")
+            print(f"Erreur lors de {contexte}: {e}")
             return []
 
+    def get_teams(self) -> List[Dict]:
+        """
+        Récupérer la liste de toutes les équipes NBA
+        """
+        return self._get("teams", contexte="la récupération des équipes")
+
     def get_players(self, team_id: int = None, page: int = 1, per_page: int = 25) -> List[Dict]:
         """
         Récupérer la liste des joueurs (optionnellement filtrés par équipe)
         """
-        try:
-            url = f"{self.base_url}/players"
-            params = {
-                'page': page,
-                'per_page': per_page
-            }
-
-            if team_id:
-                params['team_ids[]'] = team_id
+        params = {
+            'page': page,
+            'per_page': per_page
+        }
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+        if team_id:
+            params['team_ids[]'] = team_id
 
-            data = response.json()
-            return data.get('data', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des joueurs: {e}")
-            return []
+        return self._get("players", params, "la récupération des joueurs")
 
     def get_games(self, season: int = 2023, team_id: int = None, dates: List[str] = None) -> List[Dict]:
         """
         Récupérer les matchs d'une saison
         """
-        try:
-            url = f"{self.base_url}/games"
-            params = {
-                'seasons[]': season,
-                'per_page': 100
-            }
-
-            if team_id:
-                params['team_ids[]'] = team_id
+        params = {
+            'seasons[]': season,
+            'per_page': 100
+        }
 
-            if dates:
-                params['dates[]'] = dates
+        if team_id:
+            params['team_ids[]'] = team_id
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+        if dates:
+            params['dates[]'] = dates
 
-            data = response.json()
-            return data.get('data', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des matchs: {e}")
-            return []
+        return self._get("games", params, "la récupération des matchs")
 
     def get_stats(self, season: int = 2023, player_id: int = None, game_id: int = None) -> List[Dict]:
         """
         Récupérer les statistiques des joueurs
         """
-        try:
-            url = f"{self.base_url}/stats"
-            params = {
-                'seasons[]': season,
-                'per_page': 100
-            }
-
-            if player_id:
-                params['player_ids[]'] = player_id
+        params = {
+            'seasons[]': season,
+            'per_page': 100
+        }
 
-            if game_id:
-                params['game_ids[]'] = game_id
+        if player_id:
+            params['player_ids[]'] = player_id
 
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+        if game_id:
+            params['game_ids[]'] = game_id
 
-            data = response.json()
-            return data.get('data', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la récupération des statistiques: {e}")
-            return []
+        return self._get("stats", params, "la récupération des statistiques")
 
     def search_player(self, player_name: str) -> List[Dict]:
         """
         Rechercher un joueur par nom
         """
-        try:
-            url = f"{self.base_url}/players"
-            params = {
-                'search': player_name,
-                'per_page': 25
-            }
-
-            response = requests.get(url, headers=self.headers, params=params)
-            response.raise_for_status()
+        params = {
+            'search': player_name,
+            'per_page': 25
+        }
 
-            data = response.json()
-            return data.get('data', [])
-        except requests.exceptions.RequestException as e:
-            print(f"Erreur lors de la recherche de joueur: {e}")
-            return []
+        return self._get("players", params, "la recherche de joueur")
 
 
+@instrumenter_classe('import_')
 class NBADataImporter:
     """
     Classe pour importer les données de l'API dans notre système NBA
@@ -194,8 +161,12 @@ class NBADataImporter:
                     player_data.get('position', ''), 'Point Guard')
 
                 if nom and team_name:
+                    nom_equipe = self.nba_system.resoudre_nom_equipe(team_name)
+                    if not nom_equipe:
+                        print(f"Équipe {team_name} non trouvée: joueur {nom} ignoré")
+                        continue
                     self.nba_system.ajouter_joueur_a_equipe(
-                        team_name, nom, origine, annee, poste
+                        nom_equipe, nom, origine, annee, poste
                     )
                     imported_count += 1
             except Exception as e:
@@ -232,16 +203,21 @@ class NBADataImporter:
                     continue
 
                 if home_team and visitor_team and home_score is not None and visitor_score is not None:
-                    # Vérifier que les équipes existent dans le système
-                    if (self.nba_system.rechercher_equipe(home_team) and
-                            self.nba_system.rechercher_equipe(visitor_team)):
-
-                        self.nba_system.ajouter_match(
-                            home_team, visitor_team,
-                            home_score, visitor_score,
-                            date_formatted
-                        )
-                        imported_count += 1
+                    # Retrouver les équipes du système malgré accents et casse (jamais un nom
+                    # seulement proche, qui peut désigner une autre équipe)
+                    nom_domicile = self.nba_system.resoudre_nom_equipe(home_team)
+                    nom_exterieur = self.nba_system.resoudre_nom_equipe(visitor_team)
+                    if not nom_domicile or not nom_exterieur:
+                        inconnue = visitor_team if nom_domicile else home_team
+                        print(f"Équipe {inconnue} non trouvée: match du {date_formatted} ignoré")
+                        continue
+
+                    self.nba_system.ajouter_match(
+                        nom_domicile, nom_exterieur,
+                        home_score, visitor_score,
+                        date_formatted
+                    )
+                    imported_count += 1
             except Exception as e:
                 print(f"Erreur lors de l'import du match {game_data}: {e}")
                 continue
@@ -268,8 +244,10 @@ class NBADataImporter:
         imported_count = 0
 
         # Récupérer le joueur dans votre système
-        joueur = self.nba_system.rechercher_joueur(player_name)
+        nom_joueur = self.nba_system.resoudre_nom_joueur(player_name)
+        joueur = self.nba_system.rechercher_joueur(nom_joueur) if nom_joueur else None
         if not joueur:
+            print(f"Joueur {player_name} non trouvé dans le système: statistiques ignorées")
             return 0
 
         for stat_data in stats_data:
@@ -287,8 +265,8 @@ class NBADataImporter:
                 passes = stat_data.get('ast', 0) or 0
                 rebonds = stat_data.get('reb', 0) or 0
 
-                joueur.ajouter_statistiques(
-                    temps_decimal, points, passes, rebonds)
+                self.nba_system.ajouter_statistiques(
+                    joueur.nom, temps_decimal, points, passes, rebonds)
                 imported_count += 1
 
             except Exception as e:
@@ -298,88 +276,10 @@ class NBADataImporter:
         return imported_count
 
 
-# Extension de l'interface pour inclure l'import API
-class NBAGuiWithAPI(NBAGui):
-    """
-    Extension de l'interface avec les fonctionnalités API
-    """
-
-    def __init__(self, root):
-        super().__init__(root)
-
-        # Initialiser le client API
-        self.api_client = NBAApiClient(api_key="YOUR_API_KEY_HERE")
-        self.data_importer = NBADataImporter(self.nba_system, self.api_client)
-
-        # Ajouter les boutons API à la barre d'outils
-        self.add_api_buttons()
-
-    def add_api_buttons(self):
-        """
-        Ajouter des boutons pour l'import depuis l'API
-        """
-        # Trouver la barre d'outils existante et ajouter les boutons
-
-        api_frame = tk.Frame(self.root, bg='#34495e')
-
-        ttk.Button(api_frame, text="🌐 Importer Équipes API",
-                   style='Success.TButton',
-                   command=self.import_teams_from_api).pack(side=tk.LEFT, padx=3)
-
-        ttk.Button(api_frame, text="👤 Importer Joueurs API",
-                   style='Action.TButton',
-                   command=self.import_players_from_api).pack(side=tk.LEFT, padx=3)
-
-        ttk.Button(api_frame, text="⚡ Importer Matchs API",
-                   style='Action.TButton',
-                   command=self.import_games_from_api).pack(side=tk.LEFT, padx=3)
-
-    def import_teams_from_api(self):
-        """
-        Importer les équipes depuis l'API
-        """
-        try:
-            count = self.data_importer.import_teams()
-            self.show_success_popup("Import API",
-                                    f"{count} équipes importées depuis l'API!")
-            self.actualiser_equipes()
-            self.actualiser_comboboxes()
-        except Exception as e:
-            self.show_error_popup("Erreur API",
-                                  f"Erreur lors de l'import: {e}")
-
-    def import_players_from_api(self):
-        """
-        Importer les joueurs depuis l'API
-        """
-        # Interface pour sélectionner l'équipe
-        try:
-            teams_data = self.api_client.get_teams()
-            if teams_data:
-                # Prendre la première équipe comme exemple
-                first_team = teams_data[0]
-                team_name = first_team.get('full_name', '')
-                team_id = first_team.get('id')
-
-                count = self.data_importer.import_players_for_team(
-                    team_name, team_id)
-                self.show_success_popup("Import API",
-                                        f"{count} joueurs importés pour {team_name}!")
-                self.actualiser_joueurs()
-        except Exception as e:
-            self.show_error_popup("Erreur API",
-                                  f"Erreur lors de l'import: {e}")
-
-    def import_games_from_api(self):
-        """
-        Importer les matchs depuis l'API
-        """
-        try:
-            count = self.data_importer.import_games_for_season(2023)
-            self.show_success_popup("Import API",
-                                    f"{count} matchs importés depuis l'API!")
-            self.actualiser_matchs()
-            self.actualiser_equipes()
-        except Exception as e:
-            self.show_error_popup("Erreur API",
-                                  f"Erreur lors de l'import: {e}")
+def __getattr__(nom):
+    # Compatibilité: l'extension graphique vit dans nba_gui_api pour que ce
+    # module reste utilisable sans tkinter (scripts, ligne de commande)
+    if nom == 'NBAGuiWithAPI':
+        from nba_gui_api import NBAGuiWithAPI
+        return NBAGuiWithAPI
+    raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
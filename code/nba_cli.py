@@ -0,0 +1,322 @@
+"""Point d'entrée en ligne de commande pour les traitements par lot (sans interface graphique)
+
+Exemples:
+    python nba_cli.py import --sortie nba_data.json --saison 2023
+    python nba_cli.py standings nba_data.json
+    python nba_cli.py power nba_data.json --date 2024-01-15
+    python nba_cli.py top nba_data.json --critere passes --limite 10
+    python nba_cli.py similar nba_data.json "LeBron James" --k 5
+    python nba_cli.py validate nba_data.json
+    python nba_cli.py report nba_data.json
+    python nba_cli.py simulate nba_data.json --simulations 100000 --processus 4
+    python nba_cli.py export nba_data.json --sortie copie.json
+    python nba_cli.py export nba_data.json --format colonnes --sortie tables/
+    python nba_cli.py serve nba_data.json --port 8000
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+from datetime import datetime
+import persistance
+from nba_system import NBASystem, ValidationError
+
+
+CRITERES = ['points', 'passes', 'rebonds', 'efficacite_moyenne']
+
+
+def _charger_systeme(chemin):
+    """Charger un fichier de données, ou un système vide si aucun chemin n'est fourni"""
+    if not chemin:
+        return NBASystem()
+    return persistance.charger(chemin)
+
+
+def _ecrire_tableau(entetes, lignes, format_sortie, sortie=sys.stdout):
+    """Écrire un tableau en texte aligné, CSV ou JSON"""
+    if format_sortie == 'csv':
+        writer = csv.writer(sortie)
+        writer.writerow(entetes)
+        writer.writerows(lignes)
+    elif format_sortie == 'json':
+        json.dump([dict(zip(entetes, ligne)) for ligne in lignes], sortie, indent=2, ensure_ascii=False)
+        sortie.write("\n")
+    else:
+        largeurs = [max([len(str(e))] + [len(str(ligne[i])) for ligne in lignes])
+                    for i, e in enumerate(entetes)]
+        for ligne in [entetes] + list(lignes):
+            sortie.write("  ".join(str(v).ljust(l) for v, l in zip(ligne, largeurs)).rstrip() + "\n")
+
+
+def commande_import(args):
+    """Importer des données depuis l'API NBA puis les sauvegarder"""
+    # Import différé: seule cette commande a besoin du client HTTP
+    from nba_api_client import NBAApiClient, NBADataImporter
+
+    systeme = _charger_systeme(args.fichier)
+    client = NBAApiClient(api_key=args.api_key or os.environ.get('NBA_API_KEY'))
+    importer = NBADataImporter(systeme, client)
+
+    if not args.sans_equipes:
+        print(f"{importer.import_teams()} équipes importées")
+
+    if args.joueurs:
+        total = 0
+        for team in client.get_teams():
+            if systeme.rechercher_equipe(team.get('full_name', '')):
+                total += importer.import_players_for_team(team['full_name'], team.get('id'))
+        print(f"{total} joueurs importés")
+
+    if args.saison:
+        print(f"{importer.import_games_for_season(args.saison)} matchs importés")
+
+    for nom_joueur in args.stats or []:
+        print(f"{importer.import_player_stats(nom_joueur, args.saison or 2023)} statistiques importées pour {nom_joueur}")
+
+    chemin = persistance.sauvegarder(systeme, args.sortie)
+    print(f"Données sauvegardées dans {chemin}")
+    return 0
+
+
+def commande_standings(args):
+    """Afficher le classement des équipes"""
+    systeme = _charger_systeme(args.fichier)
+    if args.saison is not None:
+        classement = systeme.obtenir_classement_saison(args.saison)
+    else:
+        classement = [(e, e.victoires, e.defaites) for e in systeme.obtenir_classement()]
+    lignes = [(rang, e.nom, v, d, f"{100 * v / (v + d):.1f}")
+              for rang, (e, v, d) in enumerate(classement, 1)]
+    _ecrire_tableau(['rang', 'equipe', 'victoires', 'defaites', 'pourcentage'], lignes, args.format)
+    return 0
+
+
+def commande_power(args):
+    """Afficher le classement de puissance (notes Elo)"""
+    systeme = _charger_systeme(args.fichier)
+    date = datetime.strptime(args.date, "%Y-%m-%d") if args.date else None
+    lignes = [(rang, equipe.nom, f"{note:.1f}")
+              for rang, (equipe, note) in enumerate(systeme.obtenir_classement_elo(date), 1)]
+    _ecrire_tableau(['rang', 'equipe', 'elo'], lignes, args.format)
+    return 0
+
+
+def commande_top(args):
+    """Afficher le top des joueurs selon un critère"""
+    systeme = _charger_systeme(args.fichier)
+    top = systeme.obtenir_top_joueurs(args.critere, args.limite, args.saison)
+    lignes = [(rang, joueur.nom, joueur.equipe.nom if joueur.equipe else "Libre",
+               moyennes['matchs_joues'], f"{moyennes[args.critere]:.2f}")
+              for rang, (joueur, moyennes) in enumerate(top, 1)]
+    _ecrire_tableau(['rang', 'joueur', 'equipe', 'matchs', args.critere], lignes, args.format)
+    return 0
+
+
+def commande_similar(args):
+    """Afficher les joueurs au profil statistique le plus proche d'un joueur"""
+    systeme = _charger_systeme(args.fichier)
+    nom = systeme.resoudre_nom_joueur(args.joueur) or args.joueur
+    lignes = [(rang, joueur.nom, joueur.poste.value, joueur.equipe.nom if joueur.equipe else "Libre",
+               f"{distance:.3f}")
+              for rang, (joueur, distance) in enumerate(systeme.obtenir_joueurs_similaires(nom, args.k), 1)]
+    _ecrire_tableau(['rang', 'joueur', 'poste', 'equipe', 'distance'], lignes, args.format)
+    return 0
+
+
+def commande_validate(args):
+    """Vérifier la cohérence des données; code de sortie 1 si des incohérences existent"""
+    systeme = _charger_systeme(args.fichier)
+    incoherences = systeme.valider_coherence_systeme(audit_complet=args.complet)
+    for incoherence in incoherences:
+        print(incoherence)
+    print(f"{len(incoherences)} incohérence(s) détectée(s)", file=sys.stderr)
+    return 1 if incoherences else 0
+
+
+def commande_report(args):
+    """Afficher un rapport de ligue calculé par le moteur analytique vectorisé"""
+    # Import différé: NumPy n'est chargé que pour cette commande
+    from moteur_analytique import MoteurAnalytique
+
+    moteur = MoteurAnalytique.depuis_systeme(_charger_systeme(args.fichier))
+    resume = moteur.resume_ligue()
+    if args.format == 'json':
+        json.dump({'ligue': resume, 'saisons': moteur.totaux_par_saison(),
+                   'classement': moteur.classement(),
+                   'meilleurs': {c: moteur.meilleurs_joueurs(c, args.limite) for c in CRITERES}},
+                  sys.stdout, indent=2, ensure_ascii=False)
+        sys.stdout.write("\n")
+        return 0
+
+    for cle, valeur in resume.items():
+        print(f"{cle}: {valeur:.1f}" if isinstance(valeur, float) else f"{cle}: {valeur}")
+    print()
+    lignes = [(saison, t['matchs'], t['lignes'], f"{t['points_par_match']:.1f}", t['matchs_serres'])
+              for saison, t in moteur.totaux_par_saison().items()]
+    _ecrire_tableau(['saison', 'matchs', 'lignes_stats', 'points_par_match', 'matchs_serres'], lignes, 'texte')
+    for critere in CRITERES:
+        print(f"\nTop {critere}:")
+        for rang, (nom, valeur) in enumerate(moteur.meilleurs_joueurs(critere, args.limite), 1):
+            print(f"  {rang}. {nom} ({valeur:.2f})")
+    return 0
+
+
+def commande_simulate(args):
+    """Simuler la fin de saison et afficher les probabilités de playoffs"""
+    # Import différé: NumPy n'est chargé que pour cette commande
+    from simulation_saison import SimulateurSaison, completer_calendrier
+
+    systeme = _charger_systeme(args.fichier)
+    if args.calendrier:
+        with open(args.calendrier, newline='', encoding='utf-8') as f:
+            calendrier = [(ligne['domicile'], ligne['exterieur']) for ligne in csv.DictReader(f)]
+    else:
+        calendrier = completer_calendrier(systeme, args.matchs_par_equipe, args.graine, args.saison)
+
+    simulateur = SimulateurSaison.depuis_systeme(systeme, calendrier, args.places_playoffs, args.saison)
+    resultat = simulateur.simuler(args.simulations, args.graine, args.processus)
+    lignes = [(rang, l['equipe'], f"{l['victoires_moyennes']:.1f}", f"{100 * l['playoffs']:.1f}",
+               f"{100 * l['premiere_place']:.1f}")
+              for rang, l in enumerate(resultat.resume(), 1)]
+    _ecrire_tableau(['rang', 'equipe', 'victoires_moyennes', 'playoffs_%', 'premiere_place_%'], lignes, args.format)
+    return 0
+
+
+def commande_export(args):
+    """Réécrire les données dans un nouveau fichier de sauvegarde, ou en tables CSV / colonnaires"""
+    systeme = _charger_systeme(args.fichier)
+    if args.format == 'json':
+        chemin = persistance.sauvegarder(systeme, args.sortie)
+        print(f"Données exportées dans {chemin}")
+        return 0
+
+    import export_tables
+    if not args.sortie:
+        raise ValueError("--sortie (répertoire de destination) est requis pour l'export en tables")
+    tables = args.tables.split(',') if args.tables else None
+    if tables:
+        inconnues = [t for t in tables if t not in export_tables.SCHEMAS]
+        if inconnues:
+            raise ValueError(f"Table(s) inconnue(s): {', '.join(inconnues)}")
+    if args.format == 'csv':
+        comptes = export_tables.exporter_csv(systeme, args.sortie, tables)
+    else:
+        comptes = export_tables.exporter_colonnes(systeme, args.sortie, tables, args.taille_bloc)
+    for table, nb_lignes in comptes.items():
+        print(f"{table}: {nb_lignes} lignes")
+    print(f"Tables exportées dans {args.sortie}")
+    return 0
+
+
+def commande_serve(args):
+    """Servir l'API REST (lecture seule) sur le fichier de données jusqu'à interruption"""
+    # Import différé: le serveur HTTP n'est chargé que pour cette commande
+    from serveur_api import ServeurAPI
+
+    serveur = ServeurAPI(_charger_systeme(args.fichier), args.hote, args.port, journaliser=args.journal)
+    print(f"API disponible sur {serveur.url} (Ctrl+C pour arrêter)")
+    try:
+        serveur.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        serveur.fermer()
+    return 0
+
+
+def construire_parser():
+    parser = argparse.ArgumentParser(prog='nba_cli', description="Traitements par lot du système NBA")
+    sous_parsers = parser.add_subparsers(dest='commande', required=True)
+
+    p = sous_parsers.add_parser('import', help="Importer depuis l'API NBA")
+    p.add_argument('--fichier', help="Fichier de données existant à compléter")
+    p.add_argument('--sortie', help="Fichier de sauvegarde (horodaté par défaut)")
+    p.add_argument('--api-key', help="Clé RapidAPI (sinon variable NBA_API_KEY)")
+    p.add_argument('--sans-equipes', action='store_true', help="Ne pas importer les équipes")
+    p.add_argument('--joueurs', action='store_true', help="Importer les joueurs de chaque équipe")
+    p.add_argument('--saison', type=int, help="Importer les matchs de cette saison")
+    p.add_argument('--stats', nargs='*', metavar='JOUEUR', help="Importer les statistiques de ces joueurs")
+    p.set_defaults(func=commande_import)
+
+    p = sous_parsers.add_parser('standings', help="Afficher le classement")
+    p.add_argument('fichier')
+    p.add_argument('--format', choices=['texte', 'csv', 'json'], default='texte')
+    p.add_argument('--saison', type=int, help="Classement de cette saison seulement (année de début)")
+    p.set_defaults(func=commande_standings)
+
+    p = sous_parsers.add_parser('power', help="Afficher le classement Elo")
+    p.add_argument('fichier')
+    p.add_argument('--date', help="Notes après les matchs joués jusqu'à cette date (YYYY-MM-DD)")
+    p.add_argument('--format', choices=['texte', 'csv', 'json'], default='texte')
+    p.set_defaults(func=commande_power)
+
+    p = sous_parsers.add_parser('top', help="Afficher le top des joueurs")
+    p.add_argument('fichier')
+    p.add_argument('--critere', choices=CRITERES, default='points')
+    p.add_argument('--limite', type=int, default=10)
+    p.add_argument('--format', choices=['texte', 'csv', 'json'], default='texte')
+    p.add_argument('--saison', type=int, help="Moyennes de cette saison seulement (année de début)")
+    p.set_defaults(func=commande_top)
+
+    p = sous_parsers.add_parser('similar', help="Joueurs au profil le plus proche")
+    p.add_argument('fichier')
+    p.add_argument('joueur')
+    p.add_argument('--k', type=int, default=5)
+    p.add_argument('--format', choices=['texte', 'csv', 'json'], default='texte')
+    p.set_defaults(func=commande_similar)
+
+    p = sous_parsers.add_parser('validate', help="Vérifier la cohérence des données")
+    p.add_argument('fichier')
+    p.add_argument('--complet', action='store_true', help="Audit complet de toutes les entités")
+    p.set_defaults(func=commande_validate)
+
+    p = sous_parsers.add_parser('report', help="Rapport de ligue (agrégations NumPy)")
+    p.add_argument('fichier')
+    p.add_argument('--limite', type=int, default=5)
+    p.add_argument('--format', choices=['texte', 'json'], default='texte')
+    p.set_defaults(func=commande_report)
+
+    p = sous_parsers.add_parser('simulate', help="Simuler la fin de saison (Monte-Carlo)")
+    p.add_argument('fichier')
+    p.add_argument('--calendrier', help="CSV des matchs restants (colonnes domicile, exterieur)")
+    p.add_argument('--matchs-par-equipe', type=int, default=82,
+                   help="Sans calendrier: compléter aléatoirement jusqu'à ce nombre de matchs")
+    p.add_argument('--simulations', type=int, default=10000)
+    p.add_argument('--processus', type=int, default=1)
+    p.add_argument('--places-playoffs', type=int, default=16)
+    p.add_argument('--saison', type=int, help="Saison simulée (année de début; la dernière par défaut)")
+    p.add_argument('--graine', type=int)
+    p.add_argument('--format', choices=['texte', 'csv', 'json'], default='texte')
+    p.set_defaults(func=commande_simulate)
+
+    p = sous_parsers.add_parser('export', help="Exporter les données dans un nouveau fichier")
+    p.add_argument('fichier')
+    p.add_argument('--sortie', help="Fichier de destination (horodaté par défaut), ou répertoire des tables")
+    p.add_argument('--format', choices=['json', 'csv', 'colonnes'], default='json',
+                   help="json: sauvegarde complète; csv / colonnes: une table à plat par fichier")
+    p.add_argument('--tables', help="Tables à exporter, séparées par des virgules (toutes par défaut)")
+    p.add_argument('--taille-bloc', type=int, default=65536, help="Lignes par bloc du format colonnaire")
+    p.set_defaults(func=commande_export)
+
+    p = sous_parsers.add_parser('serve', help="Servir l'API REST en local")
+    p.add_argument('fichier')
+    p.add_argument('--hote', default='127.0.0.1')
+    p.add_argument('--port', type=int, default=8000)
+    p.add_argument('--journal', action='store_true', help="Afficher chaque requête sur la sortie d'erreur")
+    p.set_defaults(func=commande_serve)
+
+    return parser
+
+
+def main(argv=None):
+    args = construire_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except (OSError, ValueError, ValidationError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,14 @@
+import os
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
 from nba_system import NBASystem
 from joueur import PosteJoueur
 from nba_system import ValidationError
-import json
+from instrumentation import instrumenter_classe
 
 
+@instrumenter_classe('actualiser_')
 class NBAGui:
     """Interface graphique améliorée pour le système NBA"""
 
@@ -45,7 +47,16 @@ class NBAGui:
         }
 
         self.setup_ui()
-        self.charger_donnees_exemple()
+        self.configurer_saisie_assistee()
+
+        # Journal des mutations si NBA_JOURNAL désigne un répertoire de données
+        self.journal = None
+        if os.environ.get('NBA_JOURNAL'):
+            self.ouvrir_journal(os.environ['NBA_JOURNAL'])
+        if not self.nba_system._equipes:
+            self.charger_donnees_exemple()
+        self._vues_a_actualiser = set()
+        self._abonner_vues()
 
         # Bind pour redimensionnement avec debounce
         self.resize_after_id = None
@@ -954,8 +965,6 @@ class NBAGui:
                     "Succès", f"Équipe {nom} ajoutée avec succès!")
                 self.equipe_nom_var.set("")
                 self.equipe_ville_var.set("")
-                self.actualiser_equipes()
-                self.actualiser_comboboxes()
             else:
                 self.show_error_popup("Erreur", "Système NBA non initialisé!")
         except (ValueError, ValidationError) as e:
@@ -1070,9 +1079,6 @@ class NBAGui:
                 self.joueur_annee_var.set("")
                 self.joueur_equipe_var.set("")
                 self.joueur_poste_var.set("")
-
-                self.actualiser_joueurs()
-                self.actualiser_comboboxes()
             else:
                 self.show_error_popup("Erreur", "Système NBA non initialisé!")
         except (ValueError, ValidationError) as e:
@@ -1107,9 +1113,6 @@ class NBAGui:
 
                 self.transfer_joueur_var.set("")
                 self.transfer_equipe_var.set("")
-
-                self.actualiser_joueurs()
-                self.actualiser_equipes()
             except (ValueError, ValidationError) as e:
                 self.show_error_popup("Erreur", str(e))
 
@@ -1139,7 +1142,8 @@ class NBAGui:
             if self.nba_system:
                 joueur = self.nba_system.rechercher_joueur(nom_joueur)
                 if joueur:
-                    joueur.ajouter_statistiques(temps, points, passes, rebonds)
+                    self.nba_system.ajouter_statistiques(
+                        nom_joueur, temps, points, passes, rebonds)
                     self.show_success_popup(
                         "Succès", f"Statistiques ajoutées pour {nom_joueur}!")
 
@@ -1148,8 +1152,6 @@ class NBAGui:
                     self.stats_points_var.set("")
                     self.stats_passes_var.set("")
                     self.stats_rebonds_var.set("")
-
-                    self.actualiser_joueurs()
                 else:
                     self.show_error_popup("Erreur", "Joueur non trouvé!")
             else:
@@ -1266,9 +1268,6 @@ class NBAGui:
             self.match_score_ext_var.set("")
             self.match_date_var.set(datetime.now().strftime("%Y-%m-%d"))
 
-            self.actualiser_matchs()
-            self.actualiser_equipes()
-
         except (ValueError, ValidationError) as e:
             self.show_error_popup("Erreur", str(e))
 
@@ -1632,46 +1631,42 @@ class NBAGui:
         self.analyse_text.config(state=tk.DISABLED)
 
     def joueurs_en_forme(self):
-        """Identifier les joueurs en forme"""
+        """Identifier les joueurs en forme sur leurs derniers matchs"""
+        suivi = self.nba_system._forme
         analyse = "=" * 80 + "\n"
         analyse += "⭐ JOUEURS EN FORME\n"
-        analyse += "=" * 80 + "\n\n"
-
-        # Top scoreurs
-        top_scoreurs = self.nba_system.obtenir_top_joueurs('points', 5)
-        if top_scoreurs:
-            analyse += "🏀 TOP SCOREURS:\n"
-            for i, (joueur, moyennes) in enumerate(top_scoreurs, 1):
+        analyse += "=" * 80 + "\n"
+        analyse += f"Moyennes sur les {suivi.nb_matchs} derniers matchs "
+        analyse += f"(joueurs ayant joué dans les {suivi.nb_jours} derniers jours)\n\n"
+
+        sections = [
+            ("🏀 MEILLEURS SCOREURS DU MOMENT:", 'points', "pts/match", ".1f"),
+            ("🎯 MEILLEURS PASSEURS DU MOMENT:", 'passes', "passes/match", ".1f"),
+            ("💪 MEILLEURS REBONDEURS DU MOMENT:", 'rebonds', "rebonds/match", ".1f"),
+            ("⚡ JOUEURS LES PLUS EFFICACES DU MOMENT:", 'efficacite', "d'efficacité", ".2f"),
+        ]
+        cles_moyennes = {'points': 'points', 'passes': 'passes',
+                         'rebonds': 'rebonds', 'efficacite': 'efficacite_moyenne'}
+
+        for titre, critere, unite, fmt in sections:
+            en_forme = self.nba_system.obtenir_joueurs_en_forme(critere, 5)
+            if not en_forme:
+                continue
+
+            analyse += titre + "\n"
+            for i, (joueur, valeur, indicateurs) in enumerate(en_forme, 1):
                 equipe = joueur.equipe.nom if joueur.equipe else "Libre"
-                analyse += f"   {i}. {joueur.nom} ({equipe}) - {moyennes['points']:.1f} pts/match\n"
-            analyse += "\n"
+                analyse += f"   {i}. {joueur.nom} ({equipe}) - {valeur:{fmt}} {unite}"
 
-        # Top passeurs
-        top_passeurs = self.nba_system.obtenir_top_joueurs('passes', 5)
-        if top_passeurs:
-            analyse += "🎯 TOP PASSEURS:\n"
-            for i, (joueur, moyennes) in enumerate(top_passeurs, 1):
-                equipe = joueur.equipe.nom if joueur.equipe else "Libre"
-                analyse += f"   {i}. {joueur.nom} ({equipe}) - {moyennes['passes']:.1f} passes/match\n"
-            analyse += "\n"
-
-        # Top rebondeurs
-        top_rebondeurs = self.nba_system.obtenir_top_joueurs('rebonds', 5)
-        if top_rebondeurs:
-            analyse += "💪 TOP REBONDEURS:\n"
-            for i, (joueur, moyennes) in enumerate(top_rebondeurs, 1):
-                equipe = joueur.equipe.nom if joueur.equipe else "Libre"
-                analyse += f"   {i}. {joueur.nom} ({equipe}) - {moyennes['rebonds']:.1f} rebonds/match\n"
+                # Tendance par rapport à la moyenne de carrière
+                moyennes = joueur.calculer_moyennes()
+                ecart = valeur - moyennes[cles_moyennes[critere]]
+                tendance = "📈" if ecart > 0 else "📉" if ecart < 0 else "➡️"
+                analyse += f" {tendance} {ecart:+{fmt}} vs carrière\n"
             analyse += "\n"
 
-        # Joueurs les plus efficaces
-        top_efficaces = self.nba_system.obtenir_top_joueurs(
-            'efficacite_moyenne', 5)
-        if top_efficaces:
-            analyse += "⚡ JOUEURS LES PLUS EFFICACES:\n"
-            for i, (joueur, moyennes) in enumerate(top_efficaces, 1):
-                equipe = joueur.equipe.nom if joueur.equipe else "Libre"
-                analyse += f"   {i}. {joueur.nom} ({equipe}) - {moyennes['efficacite_moyenne']:.2f} d'efficacité\n"
+        if analyse.count("\n") <= 5:
+            analyse += "Aucune statistique récente disponible.\n"
 
         self.analyse_text.config(state=tk.NORMAL)
         self.analyse_text.delete(1.0, tk.END)
@@ -1733,10 +1728,39 @@ class NBAGui:
     # Méthodes utilitaires
     # ====================
 
+    # Nombre maximal de noms proposés dans une liste déroulante
+    LIMITE_SUGGESTIONS = 50
+
+    # Touches de navigation qui ne doivent pas relancer la recherche
+    TOUCHES_NAVIGATION = ('Up', 'Down', 'Return', 'Escape', 'Tab', 'Left', 'Right')
+
+    def combos_par_categorie(self):
+        """Comboboxes de saisie de noms, par catégorie de l'index de recherche"""
+        return {
+            'equipe': [self.joueur_equipe_combo, self.transfer_equipe_combo,
+                       self.match_domicile_combo, self.match_exterieur_combo,
+                       self.compare_equipe1_combo, self.compare_equipe2_combo],
+            'joueur': [self.transfer_joueur_combo, self.stats_joueur_combo],
+        }
+
+    def configurer_saisie_assistee(self):
+        """Proposer les noms correspondants au fur et à mesure de la saisie"""
+        for categorie, combos in self.combos_par_categorie().items():
+            for combo in combos:
+                combo.bind('<KeyRelease>',
+                           lambda event, c=combo, cat=categorie: self.suggerer_noms(event, c, cat))
+
+    def suggerer_noms(self, event, combo, categorie):
+        """Remplacer les choix d'une combobox par les noms correspondant au texte saisi"""
+        if event.keysym in self.TOUCHES_NAVIGATION:
+            return
+        combo['values'] = self.nba_system.rechercher(combo.get(), self.LIMITE_SUGGESTIONS, categorie)
+
     def actualiser_comboboxes(self):
         """Actualiser toutes les comboboxes avec les données actuelles"""
-        # Liste des équipes
-        equipes_noms = list(self.nba_system._equipes.keys())
+        # Toutes les équipes (quelques dizaines), lues directement: un préfixe vide parcourrait
+        # tout l'index de recherche, joueurs compris, sans jamais atteindre la limite
+        equipes_noms = sorted(self.nba_system._equipes)
 
         # Mettre à jour les comboboxes d'équipes
         self.joueur_equipe_combo['values'] = equipes_noms
@@ -1746,8 +1770,9 @@ class NBAGui:
         self.compare_equipe1_combo['values'] = equipes_noms
         self.compare_equipe2_combo['values'] = equipes_noms
 
-        # Liste des joueurs
-        joueurs_noms = list(self.nba_system._joueurs_index.keys())
+        # Premiers joueurs par ordre alphabétique (le parcours s'arrête à la limite), complétés
+        # par la saisie assistée
+        joueurs_noms = self.nba_system.rechercher('', self.LIMITE_SUGGESTIONS, 'joueur')
 
         # Mettre à jour les comboboxes de joueurs
         self.transfer_joueur_combo['values'] = joueurs_noms
@@ -1774,60 +1799,61 @@ class NBAGui:
             # Créer une fenêtre popup pour afficher les incohérences
             self.create_incoherences_window(incoherences)
 
-    def sauvegarder_donnees(self):
-        """Sauvegarder les données du système"""
+    def _abonner_vues(self):
+        """Actualiser les vues touchées par les modifications du système, une fois la main rendue à Tk"""
+        from evenements import (EquipeAjoutee, JoueurAjoute, JoueurTransfere, MatchAjoute, MatchsAjoutes,
+                                StatistiquesAjoutees, StatistiquesAjouteesEnMasse)
+        vues_par_type = {
+            EquipeAjoutee: (self.actualiser_equipes, self.actualiser_comboboxes),
+            JoueurAjoute: (self.actualiser_joueurs, self.actualiser_comboboxes),
+            JoueurTransfere: (self.actualiser_joueurs, self.actualiser_equipes),
+            StatistiquesAjoutees: (self.actualiser_joueurs,),
+            MatchAjoute: (self.actualiser_matchs, self.actualiser_equipes),
+            StatistiquesAjouteesEnMasse: (self.actualiser_joueurs,),
+            MatchsAjoutes: (self.actualiser_matchs, self.actualiser_equipes),
+        }
+
+        def planifier(evenement):
+            # Autres événements (saison compactée ou restaurée): tout actualiser
+            vues = vues_par_type.get(type(evenement), (self.actualiser_tout,))
+            if not self._vues_a_actualiser:
+                self.root.after_idle(self._actualiser_vues)
+            self._vues_a_actualiser.update(vues)
+
+        self.nba_system.evenements.abonner(planifier)
+
+    def _actualiser_vues(self):
+        vues, self._vues_a_actualiser = self._vues_a_actualiser, set()
+        if self.actualiser_tout in vues:
+            vues = (self.actualiser_tout,)
+        for vue in vues:
+            vue()
+
+    def ouvrir_journal(self, repertoire):
+        """Restaurer le système depuis un journal et journaliser les modifications suivantes"""
         try:
-            donnees = {
-                'equipes': [],
-                'joueurs': [],
-                'matchs': []
-            }
-
-            # Sauvegarder les équipes
-            for equipe in self.nba_system._equipes.values():
-                donnees['equipes'].append({
-                    'nom': equipe.nom,
-                    'ville': equipe.ville,
-                    'victoires': equipe.victoires,
-                    'defaites': equipe.defaites
-                })
-
-            # Sauvegarder les joueurs
-            for joueur in self.nba_system._joueurs_index.values():
-                joueur_data = {
-                    'nom': joueur.nom,
-                    'origine': joueur.origine,
-                    'annee_debut': joueur.annee_debut,
-                    'poste': joueur.poste.value,
-                    'equipe': joueur.equipe.nom if joueur.equipe else None,
-                    'statistiques': []
-                }
+            import journal
+            self.nba_system, self.journal = journal.ouvrir(repertoire)
+        except Exception as e:
+            self.show_error_popup("Erreur du journal", f"Impossible d'ouvrir le journal: {e}")
 
-                for stat in joueur._statistiques:
-                    joueur_data['statistiques'].append({
-                        'temps_jeu': stat.temps_jeu,
-                        'points': stat.points,
-                        'passes': stat.passes,
-                        'rebonds': stat.rebonds,
-                        'date': stat.date_match.isoformat()
-                    })
+    def fermer_journal(self):
+        """Écrire les dernières modifications journalisées sur disque"""
+        if self.journal:
+            self.journal.fermer()
 
-                donnees['joueurs'].append(joueur_data)
+    def sauvegarder_donnees(self):
+        """Sauvegarder les données du système"""
+        try:
+            if self.journal:
+                # Les modifications sont déjà journalisées: écrire un point de contrôle
+                self.journal.point_de_controle()
+                self.show_success_popup(
+                    "Sauvegarde", f"Point de contrôle écrit dans {self.journal.chemin_instantane}")
+                return
 
-            # Sauvegarder les matchs
-            for match in self.nba_system._matchs:
-                donnees['matchs'].append({
-                    'equipe_domicile': match.equipe_domicile.nom,
-                    'equipe_exterieur': match.equipe_exterieur.nom,
-                    'score_domicile': match.score_domicile,
-                    'score_exterieur': match.score_exterieur,
-                    'date': match.date.isoformat()
-                })
-
-            # Sauvegarder dans un fichier
-            filename = f"nba_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(donnees, f, indent=2, ensure_ascii=False)
+            import persistance
+            filename = persistance.sauvegarder(self.nba_system)
 
             self.show_success_popup(
                 "Sauvegarde", f"Données sauvegardées dans {filename}")
@@ -1840,73 +1866,28 @@ class NBAGui:
         """Charger des données depuis un fichier"""
         try:
             from tkinter import filedialog
+            import persistance
             filename = filedialog.askopenfilename(
                 title="Charger des données NBA",
-                filetypes=[("Fichiers JSON", "*.json")]
+                filetypes=[("Sauvegardes NBA", "*.json *.json.gz *.json.xz *.json.lzma *.json.zst"),
+                           ("Fichiers JSON", "*.json")]
             )
 
             if not filename:
                 return
 
-            with open(filename, 'r', encoding='utf-8') as f:
-                donnees = json.load(f)
+            # Les historiques de statistiques ne sont lus qu'à l'ouverture d'un joueur
+            systeme = persistance.charger(filename)
 
             # Confirmer le chargement
             if messagebox.askyesno("Confirmation",
                                    "Cette action remplacera toutes les données actuelles.\n"
                                    "Voulez-vous continuer?"):
 
-                # Réinitialiser le système
-                self.nba_system = NBASystem()
-
-                # Charger les équipes
-                for equipe_data in donnees.get('equipes', []):
-                    equipe = self.nba_system.ajouter_equipe(
-                        equipe_data['nom'], equipe_data['ville'])
-                    # Restaurer les bilans
-                    equipe._victoires = equipe_data.get('victoires', 0)
-                    equipe._defaites = equipe_data.get('defaites', 0)
-
-                # Charger les joueurs
-                for joueur_data in donnees.get('joueurs', []):
-                    if joueur_data.get('equipe'):
-                        self.nba_system.ajouter_joueur_a_equipe(
-                            joueur_data['equipe'],
-                            joueur_data['nom'],
-                            joueur_data['origine'],
-                            joueur_data['annee_debut'],
-                            joueur_data['poste']
-                        )
-
-                        # Charger les statistiques
-                        joueur = self.nba_system.rechercher_joueur(
-                            joueur_data['nom'])
-                        for stat_data in joueur_data.get('statistiques', []):
-                            date_match = datetime.fromisoformat(
-                                stat_data['date'])
-                            joueur.ajouter_statistiques(
-                                stat_data['temps_jeu'],
-                                stat_data['points'],
-                                stat_data['passes'],
-                                stat_data['rebonds'],
-                                date_match
-                            )
-
-                # Réinitialiser les bilans avant de charger les matchs
-                for equipe in self.nba_system._equipes.values():
-                    equipe._victoires = 0
-                    equipe._defaites = 0
-
-                # Charger les matchs
-                for match_data in donnees.get('matchs', []):
-                    date_match = datetime.fromisoformat(match_data['date'])
-                    self.nba_system.ajouter_match(
-                        match_data['equipe_domicile'],
-                        match_data['equipe_exterieur'],
-                        match_data['score_domicile'],
-                        match_data['score_exterieur'],
-                        date_match.strftime('%Y-%m-%d')
-                    )
+                self.nba_system = systeme
+                self._abonner_vues()
+                if self.journal:
+                    self.journal.reinitialiser(self.nba_system)
 
                 # Actualiser toutes les vues
                 self.actualiser_tout()
@@ -1918,80 +1899,80 @@ class NBAGui:
                                   f"Impossible de charger les données: {e}")
 
     def charger_donnees_exemple(self):
-        """Charger des données d'exemple"""
+        """Charger des données d'exemple (tout ou rien: une erreur n'en laisse aucune partie)"""
         try:
-            # Création d'équipes
-            equipes_data = [
-                ("Chicago Bulls", "Chicago"),
-                ("Los Angeles Lakers", "Los Angeles"),
-                ("Boston Celtics", "Boston"),
-                ("Golden State Warriors", "San Francisco"),
-                ("Miami Heat", "Miami"),
-                ("Brooklyn Nets", "Brooklyn")
-            ]
-
-            for nom, ville in equipes_data:
-                self.nba_system.ajouter_equipe(nom, ville)
+            with self.nba_system.transaction():
+                # Création d'équipes
+                equipes_data = [
+                    ("Chicago Bulls", "Chicago"),
+                    ("Los Angeles Lakers", "Los Angeles"),
+                    ("Boston Celtics", "Boston"),
+                    ("Golden State Warriors", "San Francisco"),
+                    ("Miami Heat", "Miami"),
+                    ("Brooklyn Nets", "Brooklyn")
+                ]
+
+                for nom, ville in equipes_data:
+                    self.nba_system.ajouter_equipe(nom, ville)
+
+                # Ajout de joueurs avec plus de variété
+                joueurs_data = [
+                    ("Chicago Bulls", "Michael Jordan", "USA", 1984, "Shooting Guard"),
+                    ("Chicago Bulls", "Scottie Pippen", "USA", 1987, "Small Forward"),
+                    ("Chicago Bulls", "Dennis Rodman", "USA", 1986, "Power Forward"),
+                    ("Los Angeles Lakers", "LeBron James",
+                     "USA", 2003, "Small Forward"),
+                    ("Los Angeles Lakers", "Anthony Davis",
+                     "USA", 2012, "Power Forward"),
+                    ("Los Angeles Lakers", "Russell Westbrook",
+                     "USA", 2008, "Point Guard"),
+                    ("Boston Celtics", "Jayson Tatum", "USA", 2017, "Small Forward"),
+                    ("Boston Celtics", "Jaylen Brown", "USA", 2016, "Shooting Guard"),
+                    ("Golden State Warriors", "Stephen Curry",
+                     "USA", 2009, "Point Guard"),
+                    ("Golden State Warriors", "Klay Thompson",
+                     "USA", 2011, "Shooting Guard"),
+                    ("Miami Heat", "Jimmy Butler", "USA", 2011, "Small Forward"),
+                    ("Brooklyn Nets", "Kevin Durant", "USA", 2007, "Small Forward")
+                ]
+
+                for equipe, nom, origine, annee, poste in joueurs_data:
+                    self.nba_system.ajouter_joueur_a_equipe(
+                        equipe, nom, origine, annee, poste)
+
+                # Ajout de statistiques variées
+                stats_joueurs = {
+                    "Michael Jordan": [(38.2, 30.1, 6.2, 5.2), (40.5, 33.4, 6.9, 5.9), (42.0, 35.0, 8.0, 6.5)],
+                    "LeBron James": [(36.9, 27.1, 7.4, 7.4), (38.0, 29.5, 8.2, 7.8), (35.5, 25.8, 6.8, 8.1)],
+                    "Stephen Curry": [(34.7, 29.5, 6.1, 5.2), (36.0, 31.2, 5.8, 4.9), (33.5, 27.8, 5.5, 4.2)],
+                    "Jayson Tatum": [(35.5, 26.8, 4.2, 8.0), (37.2, 28.1, 4.8, 7.5), (36.0, 24.5, 4.0, 7.8)],
+                    "Anthony Davis": [(34.0, 23.5, 2.3, 9.9), (35.2, 25.8, 2.8, 10.2), (32.5, 21.2, 2.1, 8.8)],
+                    "Jimmy Butler": [(33.8, 21.4, 5.9, 6.9), (35.0, 22.8, 6.2, 7.1), (34.2, 20.9, 5.5, 6.5)]
+                }
 
-            # Ajout de joueurs avec plus de variété
-            joueurs_data = [
-                ("Chicago Bulls", "Michael Jordan", "USA", 1984, "Shooting Guard"),
-                ("Chicago Bulls", "Scottie Pippen", "USA", 1987, "Small Forward"),
-                ("Chicago Bulls", "Dennis Rodman", "USA", 1986, "Power Forward"),
-                ("Los Angeles Lakers", "LeBron James",
-                 "USA", 2003, "Small Forward"),
-                ("Los Angeles Lakers", "Anthony Davis",
-                 "USA", 2012, "Power Forward"),
-                ("Los Angeles Lakers", "Russell Westbrook",
-                 "USA", 2008, "Point Guard"),
-                ("Boston Celtics", "Jayson Tatum", "USA", 2017, "Small Forward"),
-                ("Boston Celtics", "Jaylen Brown", "USA", 2016, "Shooting Guard"),
-                ("Golden State Warriors", "Stephen Curry",
-                 "USA", 2009, "Point Guard"),
-                ("Golden State Warriors", "Klay Thompson",
-                 "USA", 2011, "Shooting Guard"),
-                ("Miami Heat", "Jimmy Butler", "USA", 2011, "Small Forward"),
-                ("Brooklyn Nets", "Kevin Durant", "USA", 2007, "Small Forward")
-            ]
-
-            for equipe, nom, origine, annee, poste in joueurs_data:
-                self.nba_system.ajouter_joueur_a_equipe(
-                    equipe, nom, origine, annee, poste)
-
-            # Ajout de statistiques variées
-            stats_joueurs = {
-                "Michael Jordan": [(38.2, 30.1, 6.2, 5.2), (40.5, 33.4, 6.9, 5.9), (42.0, 35.0, 8.0, 6.5)],
-                "LeBron James": [(36.9, 27.1, 7.4, 7.4), (38.0, 29.5, 8.2, 7.8), (35.5, 25.8, 6.8, 8.1)],
-                "Stephen Curry": [(34.7, 29.5, 6.1, 5.2), (36.0, 31.2, 5.8, 4.9), (33.5, 27.8, 5.5, 4.2)],
-                "Jayson Tatum": [(35.5, 26.8, 4.2, 8.0), (37.2, 28.1, 4.8, 7.5), (36.0, 24.5, 4.0, 7.8)],
-                "Anthony Davis": [(34.0, 23.5, 2.3, 9.9), (35.2, 25.8, 2.8, 10.2), (32.5, 21.2, 2.1, 8.8)],
-                "Jimmy Butler": [(33.8, 21.4, 5.9, 6.9), (35.0, 22.8, 6.2, 7.1), (34.2, 20.9, 5.5, 6.5)]
-            }
-
-            for nom_joueur, stats_list in stats_joueurs.items():
-                joueur = self.nba_system.rechercher_joueur(nom_joueur)
-                if joueur:
-                    for temps, points, passes, rebonds in stats_list:
-                        joueur.ajouter_statistiques(
-                            temps, points, passes, rebonds)
-
-            # Ajout de matchs avec plus de variété
-            matchs_data = [
-                ("Chicago Bulls", "Los Angeles Lakers", 108, 102, "2024-01-15"),
-                ("Boston Celtics", "Chicago Bulls", 95, 110, "2024-01-20"),
-                ("Los Angeles Lakers", "Boston Celtics", 115, 112, "2024-01-25"),
-                ("Golden State Warriors", "Chicago Bulls", 120, 105, "2024-02-01"),
-                ("Los Angeles Lakers", "Golden State Warriors", 118, 123, "2024-02-05"),
-                ("Boston Celtics", "Golden State Warriors", 107, 104, "2024-02-10"),
-                ("Miami Heat", "Brooklyn Nets", 98, 95, "2024-02-15"),
-                ("Chicago Bulls", "Miami Heat", 102, 89, "2024-02-20"),
-                ("Golden State Warriors", "Miami Heat", 125, 118, "2024-02-25"),
-                ("Brooklyn Nets", "Los Angeles Lakers", 109, 116, "2024-03-01")
-            ]
-
-            for dom, ext, score_dom, score_ext, date in matchs_data:
-                self.nba_system.ajouter_match(
-                    dom, ext, score_dom, score_ext, date)
+                for nom_joueur, stats_list in stats_joueurs.items():
+                    if self.nba_system.rechercher_joueur(nom_joueur):
+                        for temps, points, passes, rebonds in stats_list:
+                            self.nba_system.ajouter_statistiques(
+                                nom_joueur, temps, points, passes, rebonds)
+
+                # Ajout de matchs avec plus de variété
+                matchs_data = [
+                    ("Chicago Bulls", "Los Angeles Lakers", 108, 102, "2024-01-15"),
+                    ("Boston Celtics", "Chicago Bulls", 95, 110, "2024-01-20"),
+                    ("Los Angeles Lakers", "Boston Celtics", 115, 112, "2024-01-25"),
+                    ("Golden State Warriors", "Chicago Bulls", 120, 105, "2024-02-01"),
+                    ("Los Angeles Lakers", "Golden State Warriors", 118, 123, "2024-02-05"),
+                    ("Boston Celtics", "Golden State Warriors", 107, 104, "2024-02-10"),
+                    ("Miami Heat", "Brooklyn Nets", 98, 95, "2024-02-15"),
+                    ("Chicago Bulls", "Miami Heat", 102, 89, "2024-02-20"),
+                    ("Golden State Warriors", "Miami Heat", 125, 118, "2024-02-25"),
+                    ("Brooklyn Nets", "Los Angeles Lakers", 109, 116, "2024-03-01")
+                ]
+
+                for dom, ext, score_dom, score_ext, date in matchs_data:
+                    self.nba_system.ajouter_match(
+                        dom, ext, score_dom, score_ext, date)
 
             # Actualiser toutes les vues
             self.actualiser_equipes()
@@ -2082,7 +2063,7 @@ class NBAGui:
                     for equipe in self.nba_system._equipes.values():
                         if len(equipe.joueurs) < equipe.MAX_JOUEURS:
                             try:
-                                equipe.ajouter_joueur(joueur)
+                                self.nba_system.transferer_joueur(joueur.nom, equipe.nom)
                                 corrections += 1
                                 break
                             except:
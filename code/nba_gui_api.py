@@ -0,0 +1,91 @@
+import tkinter as tk
+from tkinter import ttk
+from nba_gui import NBAGui
+from nba_api_client import NBAApiClient, NBADataImporter
+
+
+# Extension de l'interface pour inclure l'import API
+class NBAGuiWithAPI(NBAGui):
+    """
+    Extension de l'interface avec les fonctionnalités API
+    """
+
+    def __init__(self, root):
+        super().__init__(root)
+
+        # Initialiser le client API
+        self.api_client = NBAApiClient(api_key="YOUR_API_KEY_HERE")
+        self.data_importer = NBADataImporter(self.nba_system, self.api_client)
+
+        # Ajouter les boutons API à la barre d'outils
+        self.add_api_buttons()
+
+    def add_api_buttons(self):
+        """
+        Ajouter des boutons pour l'import depuis l'API
+        """
+        # Trouver la barre d'outils existante et ajouter les boutons
+
+        api_frame = tk.Frame(self.root, bg='#34495e')
+
+        ttk.Button(api_frame, text="🌐 Importer Équipes API",
+                   style='Success.TButton',
+                   command=self.import_teams_from_api).pack(side=tk.LEFT, padx=3)
+
+        ttk.Button(api_frame, text="👤 Importer Joueurs API",
+                   style='Action.TButton',
+                   command=self.import_players_from_api).pack(side=tk.LEFT, padx=3)
+
+        ttk.Button(api_frame, text="⚡ Importer Matchs API",
+                   style='Action.TButton',
+                   command=self.import_games_from_api).pack(side=tk.LEFT, padx=3)
+
+    def import_teams_from_api(self):
+        """
+        Importer les équipes depuis l'API
+        """
+        try:
+            count = self.data_importer.import_teams()
+            self.show_success_popup("Import API",
+                                    f"{count} équipes importées depuis l'API!")
+            self.actualiser_equipes()
+            self.actualiser_comboboxes()
+        except Exception as e:
+            self.show_error_popup("Erreur API",
+                                  f"Erreur lors de l'import: {e}")
+
+    def import_players_from_api(self):
+        """
+        Importer les joueurs depuis l'API
+        """
+        # Interface pour sélectionner l'équipe
+        try:
+            teams_data = self.api_client.get_teams()
+            if teams_data:
+                # Prendre la première équipe comme exemple
+                first_team = teams_data[0]
+                team_name = first_team.get('full_name', '')
+                team_id = first_team.get('id')
+
+                count = self.data_importer.import_players_for_team(
+                    team_name, team_id)
+                self.show_success_popup("Import API",
+                                        f"{count} joueurs importés pour {team_name}!")
+                self.actualiser_joueurs()
+        except Exception as e:
+            self.show_error_popup("Erreur API",
+                                  f"Erreur lors de l'import: {e}")
+
+    def import_games_from_api(self):
+        """
+        Importer les matchs depuis l'API
+        """
+        try:
+            count = self.data_importer.import_games_for_season(2023)
+            self.show_success_popup("Import API",
+                                    f"{count} matchs importés depuis l'API!")
+            self.actualiser_matchs()
+            self.actualiser_equipes()
+        except Exception as e:
+            self.show_error_popup("Erreur API",
+                                  f"Erreur lors de l'import: {e}")
@@ -1,6 +1,24 @@
+from array import array
+from bisect import bisect_right
+from contextlib import contextmanager
+from datetime import datetime
 from equipe import Equipe
 from joueur import Joueur
-from match import Match
+from match import Match, parser_date, saison_de
+from dates import depuis_jour
+from saisons import Saison
+from statistique_joueur import convertir_comptage
+from coherence import VerificateurCoherence
+from forme import SuiviForme
+from elo import NotesElo
+from chronologie import Chronologie
+from recherche import IndexRecherche
+from cache import CacheRequetes, memoiser
+from transactions import JournalAnnulation
+from evenements import (BusEvenements, EquipeAjoutee, JoueurAjoute, JoueurTransfere, MatchAjoute,
+                        MatchsAjoutes, StatistiquesAjoutees, StatistiquesAjouteesEnMasse, SaisonGelee,
+                        SaisonReorganisee)
+from instrumentation import instrumenter_classe
 
 
 class ValidationError(Exception):
@@ -8,6 +26,7 @@ class ValidationError(Exception):
     pass
 
 
+@instrumenter_classe()
 class NBASystem:
     """Classe principale gérant le système NBA"""
 
@@ -15,6 +34,24 @@ class NBASystem:
         self._equipes = {}
         self._matchs = []
         self._joueurs_index = {}
+        # Partitions par saison (année de début) -> Saison
+        self._saisons = {}
+        self._coherence = VerificateurCoherence(self)
+        self._forme = SuiviForme()
+        self._elo = NotesElo()
+        self._chronologie = Chronologie(self)
+        self._recherche = IndexRecherche()
+        # Index de similarité (NumPy), créé à la première requête
+        self._similarite = None
+        # Versions des données: globale et par équipe (matchs joués, effectif)
+        self._version = 0
+        self._versions_equipes = {}
+        self._cache = CacheRequetes()
+        # Journal d'annulation de la transaction en cours (None hors transaction)
+        self._annulations = None
+        # Chaque mutation réussie y publie un événement (voir evenements.py)
+        self.evenements = BusEvenements()
+        self._abonner_structures_derivees()
 
     def ajouter_equipe(self, nom, ville):
         """Ajouter une nouvelle équipe"""
@@ -23,8 +60,76 @@ class NBASystem:
 
         nouvelle_equipe = Equipe(nom, ville)
         self._equipes[nom] = nouvelle_equipe
+        self._noter_annulation(lambda: self._equipes.pop(nom), equipes=(nom,))
+        self.evenements.publier(EquipeAjoutee(nom, ville))
         return nouvelle_equipe
 
+    def _abonner_structures_derivees(self):
+        """Tenir à jour cohérence, index, forme, Elo, chronologie et versions à partir des événements
+
+        Abonnés internes: ils suivent aussi les modifications d'une transaction
+        en cours, et sont remis en état par _resynchroniser si elle est annulée.
+        """
+        bus = self.evenements
+        bus.abonner(self._suivre_coherence,
+                    (EquipeAjoutee, JoueurAjoute, JoueurTransfere, MatchAjoute, MatchsAjoutes, SaisonReorganisee),
+                    interne=True)
+        bus.abonner(self._indexer_noms, (EquipeAjoutee, JoueurAjoute, JoueurTransfere), interne=True)
+        # Par lots: dans un bloc batch(), la forme n'est mise à jour qu'une fois, à la sortie
+        bus.abonner(self._suivre_forme, (StatistiquesAjoutees, StatistiquesAjouteesEnMasse), par_lots=True,
+                    interne=True)
+        bus.abonner(self._suivre_elo, (MatchAjoute, MatchsAjoutes), interne=True)
+        bus.abonner(lambda e: self._chronologie.invalider(), (SaisonReorganisee,), interne=True)
+        bus.abonner(lambda e: self._signaler_mutation(*e.equipes), interne=True)
+
+    def _suivre_coherence(self, evenement):
+        """Signaler au vérificateur de cohérence les entités touchées par une mutation"""
+        if isinstance(evenement, MatchAjoute):
+            self._coherence.match_ajoute(evenement.numero, evenement.match)
+        elif isinstance(evenement, MatchsAjoutes):
+            for numero, match in enumerate(evenement.matchs, evenement.premier_numero):
+                self._coherence.match_ajoute(numero, match)
+        elif isinstance(evenement, SaisonReorganisee):
+            self._coherence.matchs_renumerotes()
+        else:
+            if not isinstance(evenement, EquipeAjoutee):
+                self._coherence.joueur_modifie(evenement.nom_joueur)
+            for nom in evenement.equipes:
+                self._coherence.equipe_modifiee(nom)
+
+    def _suivre_forme(self, evenements):
+        """Intégrer les nouvelles lignes à la forme; un joueur ayant reçu plusieurs lignes est recalculé plus tard"""
+        lignes = {}
+        for evenement in evenements:
+            if isinstance(evenement, StatistiquesAjoutees):
+                lignes.setdefault(evenement.joueur.nom, []).append(evenement)
+            else:
+                for joueur in evenement.joueurs:
+                    lignes[joueur.nom] = None
+        for nom, stats in lignes.items():
+            if stats is not None and len(stats) == 1:
+                self._forme.enregistrer(stats[0].joueur, stats[0].stat)
+            else:
+                self._forme.differer(self._joueurs_index[nom])
+
+    def _suivre_elo(self, evenement):
+        matchs = evenement.matchs if isinstance(evenement, MatchsAjoutes) else (evenement.match,)
+        for match in matchs:
+            self._elo.enregistrer_match(match)
+
+    def _indexer_noms(self, evenement):
+        """Tenir à jour l'index de recherche des noms"""
+        if isinstance(evenement, EquipeAjoutee):
+            self._recherche.ajouter(evenement.nom, 'equipe', ville=evenement.ville)
+        else:
+            self._recherche.ajouter(evenement.nom_joueur, 'joueur', equipe=evenement.equipes[0])
+
+    def _signaler_mutation(self, *noms_equipes):
+        """Changer la version globale et celle des équipes concernées (invalide le cache)"""
+        self._version += 1
+        for nom in noms_equipes:
+            self._versions_equipes[nom] = self._versions_equipes.get(nom, 0) + 1
+
     def rechercher_equipe(self, nom):
         """Rechercher une équipe par son nom"""
         return self._equipes.get(nom)
@@ -41,6 +146,11 @@ class NBASystem:
         nouveau_joueur = Joueur(nom_joueur, origine, annee_debut, poste)
         if equipe.ajouter_joueur(nouveau_joueur):
             self._joueurs_index[nom_joueur] = nouveau_joueur
+            self._noter_annulation(lambda: (equipe.retirer_joueur(nouveau_joueur),
+                                            self._joueurs_index.pop(nom_joueur)),
+                                   joueurs=(nom_joueur,), equipes=(nom_equipe,))
+            self.evenements.publier(JoueurAjoute(nom_equipe, nom_joueur, origine, annee_debut,
+                                                 nouveau_joueur.poste.value))
             return nouveau_joueur
         else:
             raise ValidationError(f"Impossible d'ajouter {nom_joueur} à l'équipe!")
@@ -59,16 +169,207 @@ class NBASystem:
         if joueur.equipe == nouvelle_equipe:
             raise ValidationError(f"{nom_joueur} est déjà dans {nom_nouvelle_equipe}!")
 
-        if joueur.equipe:
-            joueur.equipe.retirer_joueur(joueur)
+        # Vérifier la place disponible avant de retirer le joueur de son équipe
+        if len(nouvelle_equipe.joueurs) >= nouvelle_equipe.MAX_JOUEURS:
+            raise ValidationError(f"{nom_nouvelle_equipe} a déjà {nouvelle_equipe.MAX_JOUEURS} joueurs!")
+
+        ancienne_equipe = joueur.equipe
+        if ancienne_equipe:
+            # Rang dans l'effectif (copie de la liste) seulement s'il faut pouvoir annuler
+            if self._annulations is not None:
+                position = list(ancienne_equipe.joueurs).index(joueur)
+            ancienne_equipe.retirer_joueur(joueur)
 
         nouvelle_equipe.ajouter_joueur(joueur)
+        if self._annulations is not None:
+            def annuler():
+                nouvelle_equipe.retirer_joueur(joueur)
+                if ancienne_equipe:
+                    ancienne_equipe.reinserer_joueur(joueur, position)
+            noms_equipes = (nom_nouvelle_equipe, ancienne_equipe.nom) if ancienne_equipe else (nom_nouvelle_equipe,)
+            self._annulations.noter(annuler, joueurs=(nom_joueur,), equipes=noms_equipes)
+        self.evenements.publier(JoueurTransfere(nom_joueur, nom_nouvelle_equipe,
+                                                ancienne_equipe.nom if ancienne_equipe else None))
         return True
 
     def rechercher_joueur(self, nom):
         """Rechercher un joueur par son nom"""
         return self._joueurs_index.get(nom)
 
+    def rechercher(self, texte, limite=10, categorie=None, **filtres):
+        """Rechercher des noms (categorie 'joueur' ou 'equipe'): complétion puis recherche approchée
+
+        Les filtres portent sur les métadonnées indexées, par exemple
+        equipe="Los Angeles Lakers" pour les joueurs.
+        """
+        resultats = self._recherche.completer(texte, limite, categorie, **filtres)
+        if len(resultats) < limite and texte.strip():
+            for nom, _ in self._recherche.rechercher_approx(texte, limite, categorie, **filtres):
+                if nom not in resultats:
+                    resultats.append(nom)
+                    if len(resultats) == limite:
+                        break
+        return resultats
+
+    def resoudre_nom_joueur(self, texte):
+        """Retrouver le nom exact d'un joueur malgré accents ou casse (None si aucun ne correspond)"""
+        return self._recherche.resoudre(texte, 'joueur')
+
+    def resoudre_nom_equipe(self, texte):
+        """Retrouver le nom exact d'une équipe malgré accents ou casse (None si aucune ne correspond)"""
+        return self._recherche.resoudre(texte, 'equipe')
+
+    def ajouter_statistiques(self, nom_joueur, temps_jeu, points, passes, rebonds, date_match=None):
+        """Ajouter une ligne de statistiques à un joueur"""
+        joueur = self.rechercher_joueur(nom_joueur)
+        if not joueur:
+            raise ValidationError(f"Joueur {nom_joueur} non trouvé!")
+
+        date_match = parser_date(date_match) if date_match else datetime.now()
+        saison = self._saison_pour(date_match)
+
+        totaux_avant = saison.totaux(nom_joueur)
+        joueur.ajouter_statistiques(temps_jeu, points, passes, rebonds, date_match)
+        stat = joueur._statistiques[-1]
+        saison.ajouter_statistique(nom_joueur, stat)
+        self._noter_annulation(lambda: self._retirer_statistiques(joueur, 1, {saison: totaux_avant}),
+                               joueurs=(nom_joueur,))
+        self.evenements.publier(StatistiquesAjoutees(joueur, stat))
+        return stat
+
+    def ajouter_statistiques_en_masse(self, lignes):
+        """Ajouter des lignes (joueur, temps, points, passes, rebonds, date) en une seule opération
+
+        Toutes les lignes sont validées avant le premier ajout: une ligne
+        invalide n'ajoute rien. Validation, regroupement par joueur et totaux
+        de saison sont calculés colonne par colonne (NumPy); retourne le
+        nombre de lignes ajoutées.
+        """
+        import numpy as np
+
+        lignes = list(lignes)
+        if not lignes:
+            return 0
+        noms, temps, points, passes, rebonds, dates = zip(*lignes)
+
+        inconnus = set(noms).difference(self._joueurs_index)
+        if inconnus:
+            raise ValidationError(f"Joueur {min(inconnus)} non trouvé!")
+        t = np.asarray(temps, dtype=np.float64)
+        p, pa, r = (np.asarray(colonne) for colonne in (points, passes, rebonds))
+        if t.min() < 0 or t.max() > 48:
+            raise ValueError("Le temps de jeu doit être entre 0 et 48 minutes")
+        if any(colonne.dtype.kind not in 'iuf' for colonne in (p, pa, r)):
+            raise ValueError("Les points, passes et rebonds doivent être des nombres")
+        if p.min() < 0:
+            raise ValueError("Les points ne peuvent pas être négatifs")
+        if pa.min() < 0:
+            raise ValueError("Les passes ne peuvent pas être négatives")
+        if r.min() < 0:
+            raise ValueError("Les rebonds ne peuvent pas être négatifs")
+
+        maintenant = datetime.now()
+        # Ordinaux non internés: ils ne sont conservés que dans les colonnes typées
+        jours = [(parser_date(date) if date else maintenant).toordinal() for date in dates]
+        j = np.asarray(jours, dtype=np.int32)
+        # Une recherche de saison par jour distinct (erreur avant tout ajout si l'une est gelée)
+        jours_distincts, jour_ligne = np.unique(j, return_inverse=True)
+        saisons = []
+        code_jour = np.empty(len(jours_distincts), dtype=np.int64)
+        for k, jour in enumerate(jours_distincts.tolist()):
+            saison = self._saison_pour(depuis_jour(jour))
+            if saison not in saisons:
+                saisons.append(saison)
+            code_jour[k] = saisons.index(saison)
+
+        # Lignes regroupées par joueur (ordre de première apparition), ordre conservé pour chacun
+        codes_joueurs = {nom: code for code, nom in enumerate(dict.fromkeys(noms))}
+        joueur_ligne = np.fromiter(map(codes_joueurs.__getitem__, noms), dtype=np.int64, count=len(noms))
+        ordre = np.argsort(joueur_ligne, kind='stable')
+        bornes = np.concatenate(([0], np.cumsum(np.bincount(joueur_ligne)))).tolist()
+        # Même règle que convertir_comptage: valeurs entières en entiers, décimales conservées;
+        # la colonne d'un joueur n'est réelle que s'il a au moins une valeur décimale
+        colonnes = [t[ordre]]
+        decimales = []
+        for colonne in (p, pa, r):
+            colonne = colonne[ordre]
+            if colonne.dtype.kind == 'f':
+                decimale = colonne != np.floor(colonne)
+                if not decimale.any():
+                    colonne, decimale = colonne.astype(np.int64), None
+            else:
+                decimale = None
+            colonnes.append(colonne)
+            decimales.append(decimale)
+        colonnes.append(j[ordre])
+        joueurs = []
+        for code, nom in enumerate(codes_joueurs):
+            joueur = self._joueurs_index[nom]
+            debut, fin = bornes[code], bornes[code + 1]
+            tranches = [colonne[debut:fin] for colonne in colonnes]
+            for i, decimale in enumerate(decimales, 1):
+                if decimale is not None and not decimale[debut:fin].any():
+                    tranches[i] = tranches[i].astype(np.int64)
+            joueur._statistiques.etendre(*(tranche.tolist() for tranche in tranches))
+            joueur._version += 1
+            joueurs.append(joueur)
+
+        # Totaux par (joueur, saison) en un passage par colonne
+        with np.errstate(divide='ignore', invalid='ignore'):
+            efficacite = np.where(t > 0, (p + pa + r) / t, 0.0)
+        groupe = joueur_ligne * len(saisons) + code_jour[jour_ligne]
+        taille = len(codes_joueurs) * len(saisons)
+        nb_lignes = np.bincount(groupe, minlength=taille)
+        sommes = [np.bincount(groupe, weights=colonne, minlength=taille).tolist()
+                  for colonne in (t, p, pa, r, efficacite)]
+        totaux_avant = {}
+        for g in np.flatnonzero(nb_lignes).tolist():
+            joueur, saison = joueurs[g // len(saisons)], saisons[g % len(saisons)]
+            if self._annulations is not None:
+                totaux_avant.setdefault(joueur, {})[saison] = saison.totaux(joueur.nom)
+            somme_t, somme_p, somme_pa, somme_r, somme_eff = (somme[g] for somme in sommes)
+            saison.ajouter_totaux(joueur.nom, (int(nb_lignes[g]), somme_t, convertir_comptage(somme_p),
+                                               convertir_comptage(somme_pa), convertir_comptage(somme_r), somme_eff))
+
+        if self._annulations is not None:
+            def annuler():
+                for code, joueur in enumerate(joueurs):
+                    self._retirer_statistiques(joueur, bornes[code + 1] - bornes[code], totaux_avant[joueur])
+            self._annulations.noter(annuler, joueurs=tuple(codes_joueurs))
+
+        self.evenements.publier(StatistiquesAjouteesEnMasse(joueurs, (noms, temps, points, passes, rebonds, jours)))
+        return len(lignes)
+
+    def _retirer_statistiques(self, joueur, nombre, totaux_saisons):
+        # Annulation: dernières lignes de l'historique et totaux antérieurs de chaque saison
+        joueur._statistiques.retirer_dernieres(nombre)
+        for saison, totaux in totaux_saisons.items():
+            saison.restaurer_totaux(joueur.nom, totaux)
+
+    def _attacher_historique_differe(self, nom_joueur, historique, totaux_saisons):
+        """Donner au joueur un historique lu à la demande (chargement d'une sauvegarde indexée)
+
+        totaux_saisons associe à chaque année de saison les totaux du joueur
+        sur cette saison, pour que bilans et moyennes par saison soient
+        disponibles sans lire les lignes.
+        """
+        self._hors_transaction("Attacher un historique différé")
+        joueur = self.rechercher_joueur(nom_joueur)
+        if not joueur:
+            raise ValidationError(f"Joueur {nom_joueur} non trouvé!")
+        if len(joueur._statistiques):
+            raise ValidationError(f"Le joueur {nom_joueur} a déjà des statistiques")
+
+        for annee, totaux in totaux_saisons.items():
+            saison = self._saisons.get(annee)
+            if saison is None:
+                saison = self._saisons[annee] = Saison(annee)
+            saison.ajouter_totaux(nom_joueur, totaux)
+        joueur._statistiques = historique
+        joueur._version += 1
+        self._forme.differer(joueur)
+        self._signaler_mutation()
+
     def ajouter_match(self, nom_equipe_domicile, nom_equipe_exterieur, score_domicile, score_exterieur, date):
         """Ajouter un nouveau match"""
         equipe_domicile = self.rechercher_equipe(nom_equipe_domicile)
@@ -80,30 +381,201 @@ class NBASystem:
         if not equipe_exterieur:
             raise ValidationError(f"Équipe {nom_equipe_exterieur} non trouvée!")
 
+        saison = self._saison_pour(parser_date(date))
+
         nouveau_match = Match(equipe_domicile, equipe_exterieur, score_domicile, score_exterieur, date)
         self._matchs.append(nouveau_match)
+        saison.ajouter_match(nouveau_match)
+        self._noter_annulation(lambda: self._retirer_derniers_matchs([(nouveau_match, saison)]),
+                               equipes=(nom_equipe_domicile, nom_equipe_exterieur), matchs=(nouveau_match,))
+        self.evenements.publier(MatchAjoute(nouveau_match, len(self._matchs)))
         return nouveau_match
 
-    def obtenir_matchs_equipe(self, nom_equipe):
-        """Obtenir tous les matchs d'une équipe"""
+    def ajouter_matchs_en_masse(self, matchs):
+        """Ajouter des matchs (domicile, extérieur, score domicile, score extérieur, date) en une seule opération
+
+        Toutes les lignes sont validées avant le premier ajout: une ligne
+        invalide n'ajoute rien. Retourne la liste des matchs créés.
+        """
+        lignes = [tuple(ligne) for ligne in matchs]
+        if not lignes:
+            return []
+        domiciles, exterieurs, scores_domicile, scores_exterieur, dates = zip(*lignes)
+
+        inconnues = set(domiciles).union(exterieurs).difference(self._equipes)
+        if inconnues:
+            raise ValidationError(f"Équipe {min(inconnues)} non trouvée!")
+        if any(d == e for d, e in zip(domiciles, exterieurs)):
+            raise ValueError("Une équipe ne peut pas jouer contre elle-même")
+        scores = scores_domicile + scores_exterieur
+        if not all(isinstance(score, int) for score in scores):
+            raise ValueError("Les scores doivent être des entiers")
+        if min(scores) < 0:
+            raise ValueError("Les scores ne peuvent pas être négatifs")
+        dates = [parser_date(date) for date in dates]
+        saisons = {}
+        for date in dates:
+            annee = saison_de(date)
+            if annee not in saisons:
+                saisons[annee] = self._saison_pour(date)
+
+        equipes = self._equipes
+        nouveaux = []
+        saisons_matchs = []
+        for d, e, sd, se, date in zip(domiciles, exterieurs, scores_domicile, scores_exterieur, dates):
+            match = Match.depuis_archive(equipes[d], equipes[e], sd, se, date)
+            match._mettre_a_jour_bilans()
+            saison = saisons[saison_de(date)]
+            saison.ajouter_match(match)
+            nouveaux.append(match)
+            saisons_matchs.append((match, saison))
+
+        premier_numero = len(self._matchs) + 1
+        self._matchs.extend(nouveaux)
+        self._noter_annulation(lambda: self._retirer_derniers_matchs(saisons_matchs),
+                               equipes=set(domiciles).union(exterieurs), matchs=nouveaux)
+        self.evenements.publier(MatchsAjoutes(nouveaux, premier_numero))
+        return nouveaux
+
+    @contextmanager
+    def batch(self):
+        """Regrouper des ajouts: les structures dérivées coûteuses (forme, vues) sont mises à jour à la sortie
+
+        Index des noms, versions du cache et journal restent à jour à chaque
+        ajout; la forme des joueurs ayant reçu plusieurs lignes dans le bloc
+        est recalculée une seule fois, à la première requête qui la demande.
+        """
+        with self.evenements.lot():
+            yield self
+
+    def _saison_pour(self, date):
+        """Partition de la saison contenant la date, créée si besoin (erreur si elle est gelée)"""
+        annee = saison_de(date)
+        saison = self._saisons.get(annee)
+        if saison is None:
+            saison = self._saisons[annee] = Saison(annee)
+            self._noter_annulation(lambda: self._saisons.pop(annee))
+        elif saison.gelee:
+            raise ValidationError(f"La saison {annee} est gelée: aucun ajout possible")
+        return saison
+
+    def _retirer_derniers_matchs(self, saisons_matchs):
+        # Annulation: (match, saison) des derniers matchs ajoutés, retirés du plus récent au plus ancien
+        for match, saison in reversed(saisons_matchs):
+            if self._matchs.pop() is not match:
+                raise ValidationError("Annulation impossible: les derniers matchs ont changé")
+            saison.retirer_dernier_match(match)
+            match._annuler_bilans()
+
+    @contextmanager
+    def transaction(self):
+        """Exécuter un bloc de modifications de façon atomique
+
+        Si le bloc se termine par une exception, chacune de ses modifications
+        est défaite à partir du journal d'annulation (coût proportionnel au
+        nombre de modifications, sans copie du système) puis l'exception est
+        propagée. Les abonnés non internes du bus (journal, interface...) ne
+        reçoivent les événements du bloc qu'à sa validation. Une transaction
+        imbriquée annulée ne défait que son propre bloc.
+        """
+        englobante = self._annulations is not None
+        if not englobante:
+            self._annulations = JournalAnnulation()
+        debut = len(self._annulations)
+        try:
+            with self.evenements.retenir() as valides:
+                yield self
+        except BaseException:
+            self._resynchroniser(*self._annulations.annuler_depuis(debut))
+            raise
+        finally:
+            if not englobante:
+                self._annulations = None
+        # Hors de la portée de l'annulation: l'erreur d'un abonné externe ne défait pas le bloc validé
+        self.evenements.livrer(valides)
+
+    def _noter_annulation(self, annuler, **touches):
+        if self._annulations is not None:
+            self._annulations.noter(annuler, **touches)
+
+    def _hors_transaction(self, operation):
+        if self._annulations is not None:
+            raise ValidationError(f"{operation} impossible pendant une transaction")
+
+    def _resynchroniser(self, noms_joueurs, noms_equipes, matchs):
+        """Remettre les structures dérivées en accord avec les données après une annulation"""
+        if matchs:
+            self._elo.retirer_derniers(len(matchs))
+            self._coherence.matchs_retires(matchs)
+        for nom in noms_equipes:
+            if nom not in self._equipes:
+                self._recherche.retirer(nom)
+            self._coherence.equipe_modifiee(nom)
+        for nom in noms_joueurs:
+            self._coherence.joueur_modifie(nom)
+            joueur = self._joueurs_index.get(nom)
+            if joueur is None:
+                self._recherche.retirer(nom)
+                self._forme.oublier(nom)
+                continue
+            self._recherche.ajouter(nom, 'joueur', equipe=joueur.equipe.nom if joueur.equipe else None)
+            joueur._version += 1
+            if len(joueur._statistiques):
+                self._forme.differer(joueur)
+            else:
+                self._forme.oublier(nom)
+        if noms_joueurs:
+            self._forme.recalculer_date_reference()
+        self._similarite = None
+        self._chronologie.invalider()
+        self._signaler_mutation(*noms_equipes)
+
+    def obtenir_saisons(self):
+        """Obtenir les années de début des saisons connues, par ordre croissant"""
+        return sorted(self._saisons)
+
+    def obtenir_saison(self, annee):
+        """Obtenir la partition d'une saison"""
+        saison = self._saisons.get(annee)
+        if saison is None:
+            raise ValidationError(f"Saison {annee} non trouvée!")
+        return saison
+
+    @memoiser(lambda self, nom_equipe, saison=None: self._versions_equipes.get(nom_equipe, 0))
+    def obtenir_matchs_equipe(self, nom_equipe, saison=None):
+        """Obtenir tous les matchs d'une équipe, éventuellement limités à une saison"""
         equipe = self.rechercher_equipe(nom_equipe)
         if not equipe:
             return []
 
+        if saison is not None:
+            partition = self.obtenir_saison(saison)
+            if partition.etat in ('compactee', 'dechargee'):
+                return [Match.depuis_archive(self._equipes[d], self._equipes[e], sd, se, date)
+                        for d, e, sd, se, date in partition.lignes_matchs() if nom_equipe in (d, e)]
+            return [m for m in partition.matchs() if m.equipe_domicile == equipe or m.equipe_exterieur == equipe]
+
         matchs_equipe = []
         for match in self._matchs:
             if match.equipe_domicile == equipe or match.equipe_exterieur == equipe:
                 matchs_equipe.append(match)
         return matchs_equipe
 
-    def obtenir_top_joueurs(self, critere='points', limite=5):
-        """Obtenir le top des joueurs selon un critère"""
+    @memoiser(lambda self, *args, **kwargs: self._version)
+    def obtenir_top_joueurs(self, critere='points', limite=5, saison=None):
+        """Obtenir le top des joueurs selon un critère, éventuellement sur une seule saison"""
         joueurs_avec_stats = []
 
-        for joueur in self._joueurs_index.values():
-            moyennes = joueur.calculer_moyennes()
-            if moyennes:
-                joueurs_avec_stats.append((joueur, moyennes))
+        if saison is not None:
+            partition = self.obtenir_saison(saison)
+            for nom in partition.noms_joueurs():
+                if nom in self._joueurs_index:
+                    joueurs_avec_stats.append((self._joueurs_index[nom], partition.moyennes(nom)))
+        else:
+            for joueur in self._joueurs_index.values():
+                moyennes = joueur.calculer_moyennes()
+                if moyennes:
+                    joueurs_avec_stats.append((joueur, moyennes))
 
         if not joueurs_avec_stats:
             return []
@@ -114,6 +586,26 @@ class NBASystem:
         joueurs_tries = sorted(joueurs_avec_stats, key=lambda x: x[1][critere], reverse=True)
         return joueurs_tries[:limite]
 
+    def obtenir_joueurs_en_forme(self, critere='points', limite=5, mode='matchs'):
+        """Obtenir les joueurs en forme sur leurs derniers matchs (voir SuiviForme)"""
+        return self._forme.joueurs_en_forme(critere, limite, mode)
+
+    def obtenir_forme_joueur(self, nom_joueur):
+        """Obtenir les indicateurs de forme d'un joueur"""
+        return self._forme.forme(nom_joueur)
+
+    def obtenir_joueurs_similaires(self, nom_joueur, k=5):
+        """Obtenir les k joueurs au profil statistique le plus proche: liste de (joueur, distance)"""
+        if nom_joueur not in self._joueurs_index:
+            raise ValidationError(f"Joueur {nom_joueur} non trouvé!")
+        if self._similarite is None:
+            # Import différé: NumPy n'est chargé que si la recherche de similarité est utilisée
+            from similarite import IndexSimilarite
+            self._similarite = IndexSimilarite(self)
+        return [(self._joueurs_index[nom], distance)
+                for nom, distance in self._similarite.similaires(nom_joueur, k)]
+
+    @memoiser(lambda self, *args, **kwargs: self._version)
     def obtenir_statistiques_generales(self):
         """Obtenir des statistiques générales du système"""
         total_equipes = len(self._equipes)
@@ -131,6 +623,7 @@ class NBASystem:
             'matchs_total': total_matchs
         }
 
+    @memoiser(lambda self, *args, **kwargs: self._version)
     def obtenir_classement(self):
         """Obtenir le classement des équipes"""
         equipes_avec_matchs = [e for e in self._equipes.values() if (e.victoires + e.defaites) > 0]
@@ -142,30 +635,182 @@ class NBASystem:
                       key=lambda e: (e.calculer_pourcentage_victoires(), e.victoires),
                       reverse=True)
 
-    def valider_coherence_systeme(self):
-        """Valider la cohérence du système et retourner les incohérences trouvées"""
-        incoherences = []
-
-        # Vérifier les joueurs sans équipe
-        for nom, joueur in self._joueurs_index.items():
-            if joueur.equipe is None:
-                incoherences.append(f"Joueur {nom} n'appartient à aucune équipe")
-
-            # Vérifier si le joueur est bien dans l'équipe associée
-            elif joueur not in joueur.equipe.joueurs:
-                incoherences.append(
-                    f"Incohérence: {nom} associé à {joueur.equipe.nom} mais pas dans la liste des joueurs")
-
-        # Vérifier les équipes avec trop de joueurs
-        for nom_equipe, equipe in self._equipes.items():
-            if len(equipe.joueurs) > equipe.MAX_JOUEURS:
-                incoherences.append(f"Équipe {nom_equipe} a {len(equipe.joueurs)} joueurs (max: {equipe.MAX_JOUEURS})")
-
-        # Vérifier les matchs avec des équipes inexistantes
-        for i, match in enumerate(self._matchs):
-            if match.equipe_domicile.nom not in self._equipes:
-                incoherences.append(f"Match {i + 1}: équipe domicile {match.equipe_domicile.nom} n'existe pas")
-            if match.equipe_exterieur.nom not in self._equipes:
-                incoherences.append(f"Match {i + 1}: équipe extérieur {match.equipe_exterieur.nom} n'existe pas")
-
-        return incoherences
+    def obtenir_classement_saison(self, annee):
+        """Obtenir le classement d'une saison: liste de (équipe, victoires, défaites)"""
+        return [(self._equipes[nom], v, d) for nom, v, d in self.obtenir_saison(annee).classement()
+                if nom in self._equipes]
+
+    def obtenir_bilan_equipe(self, nom_equipe, saisons=None):
+        """Victoires et défaites cumulées d'une équipe sur les saisons demandées (toutes par défaut)"""
+        if nom_equipe not in self._equipes:
+            raise ValidationError(f"Équipe {nom_equipe} non trouvée!")
+        annees = self._saisons if saisons is None else saisons
+        victoires = defaites = 0
+        for annee in annees:
+            v, d = self.obtenir_saison(annee).bilan(nom_equipe)
+            victoires += v
+            defaites += d
+        return victoires, defaites
+
+    def obtenir_moyennes_saison(self, nom_joueur, annee):
+        """Obtenir les moyennes d'un joueur sur une saison"""
+        if nom_joueur not in self._joueurs_index:
+            raise ValidationError(f"Joueur {nom_joueur} non trouvé!")
+        return self.obtenir_saison(annee).moyennes(nom_joueur)
+
+    def geler_saison(self, annee):
+        """Geler une saison: plus aucun match ni statistique ne peut y être ajouté"""
+        self._hors_transaction("Geler une saison")
+        saison = self.obtenir_saison(annee)
+        if saison.etat == 'active':
+            saison.geler()
+            self.evenements.publier(SaisonGelee(annee))
+
+    def compacter_saison(self, annee):
+        """Geler une saison et ranger ses données en colonnes, hors des listes d'objets du système
+
+        Les bilans et moyennes de la saison restent disponibles; les vues
+        détaillées (matchs, moteur analytique, historique) ne couvrent plus
+        que les saisons non compactées.
+        """
+        self._hors_transaction("Compacter une saison")
+        if self._compacter(self.obtenir_saison(annee)):
+            self.evenements.publier(SaisonReorganisee(annee, 'compactee', self._equipes))
+
+    def _compacter(self, saison):
+        """Compacter la saison et retirer ses données des objets du système (False si déjà fait)"""
+        if saison.etat in ('compactee', 'dechargee'):
+            return False
+        matchs, noms_joueurs = saison.compacter({nom: j._statistiques for nom, j in self._joueurs_index.items()})
+        retires = set(map(id, matchs))
+        self._matchs = [m for m in self._matchs if id(m) not in retires]
+        premier_jour, jour_fin = saison.bornes
+        for nom in noms_joueurs:
+            joueur = self._joueurs_index.get(nom)
+            if joueur and joueur._statistiques.retirer_periode(premier_jour, jour_fin):
+                joueur._version += 1
+        return True
+
+    def decharger_saison(self, annee, chemin):
+        """Compacter une saison puis écrire ses colonnes sur disque pour libérer la mémoire"""
+        self._hors_transaction("Décharger une saison")
+        saison = self.obtenir_saison(annee)
+        if saison.etat == 'dechargee':
+            return
+        self._compacter(saison)
+        saison.decharger(chemin)
+        # Publié après le déchargement: les abonnés voient l'état final de la saison
+        self.evenements.publier(SaisonReorganisee(annee, 'dechargee', self._equipes, chemin))
+
+    def restaurer_saison(self, annee):
+        """Recréer les objets d'une saison compactée ou déchargée (elle reste gelée)"""
+        self._hors_transaction("Restaurer une saison")
+        saison = self.obtenir_saison(annee)
+        if saison.etat not in ('compactee', 'dechargee'):
+            return
+
+        matchs = [Match.depuis_archive(self._equipes[d], self._equipes[e], sd, se, date)
+                  for d, e, sd, se, date in saison.lignes_matchs()]
+        for nom, temps_jeu, points, passes, rebonds, date in saison.lignes_statistiques():
+            joueur = self._joueurs_index.get(nom)
+            if joueur:
+                joueur.ajouter_statistiques(temps_jeu, points, passes, rebonds, date)
+
+        self._matchs.extend(matchs)
+        saison.restaurer(matchs)
+        self.evenements.publier(SaisonReorganisee(annee, 'restauree', self._equipes))
+
+    def classement_au(self, date):
+        """Obtenir le classement tel qu'il était après les matchs joués jusqu'à la date incluse
+
+        Retourne une liste de (équipe, victoires, défaites).
+        """
+        return self._chronologie.classement_au(parser_date(date))
+
+    def moyennes_au(self, nom_joueur, date):
+        """Obtenir les moyennes d'un joueur sur ses matchs joués jusqu'à la date incluse"""
+        joueur = self.rechercher_joueur(nom_joueur)
+        if not joueur:
+            raise ValidationError(f"Joueur {nom_joueur} non trouvé!")
+        return self._chronologie.moyennes_au(joueur, parser_date(date))
+
+    def iterer_matchs(self):
+        """Parcourir tous les matchs, saison par saison, y compris celles compactées ou déchargées
+
+        Produit des tuples (domicile, extérieur, score domicile, score extérieur, date)
+        sans construire de liste intermédiaire.
+        """
+        for annee in sorted(self._saisons):
+            yield from self._saisons[annee].lignes_matchs()
+
+    def iterer_statistiques(self):
+        """Parcourir toutes les lignes de statistiques, saison par saison, y compris les saisons archivées
+
+        Produit des tuples (joueur, temps, points, passes, rebonds, date).
+        L'historique de chaque joueur n'est parcouru qu'une fois: ses lignes
+        sont réparties entre les saisons non archivées avant d'être produites.
+        """
+        annees = sorted(self._saisons)
+        actives = [a for a in annees if self._saisons[a].etat not in ('compactee', 'dechargee')]
+        bornes = [self._saisons[a].bornes for a in actives]
+        debuts = [premier_jour for premier_jour, _ in bornes]
+
+        # (joueur, saison) -> indices des lignes de son historique datées de la saison
+        lignes = {}
+        for nom in dict.fromkeys(nom for a in actives for nom in self._saisons[a].noms_joueurs()):
+            joueur = self._joueurs_index.get(nom)
+            if not joueur:
+                continue
+            for ligne, jour in enumerate(joueur._statistiques.jour):
+                i = bisect_right(debuts, jour) - 1
+                if i >= 0 and jour < bornes[i][1]:
+                    lignes.setdefault((nom, actives[i]), array('I')).append(ligne)
+
+        for annee in annees:
+            saison = self._saisons[annee]
+            if saison.etat in ('compactee', 'dechargee'):
+                yield from saison.lignes_statistiques()
+                continue
+            for nom in list(saison.noms_joueurs()):
+                indices = lignes.pop((nom, annee), None)
+                if indices is None:
+                    continue
+                historique = self._joueurs_index[nom]._statistiques
+                for ligne in indices:
+                    yield (nom, historique.temps_jeu[ligne], historique.points[ligne], historique.passes[ligne],
+                           historique.rebonds[ligne], depuis_jour(historique.jour[ligne]))
+
+    def obtenir_classement_elo(self, date=None):
+        """Obtenir le classement de puissance (notes Elo), actuel ou à une date donnée"""
+        if date is not None:
+            date = parser_date(date)
+        return [(self._equipes[nom], note) for nom, note in self._elo.classement(self._equipes, date)]
+
+    def obtenir_historique_elo(self, nom_equipe):
+        """Obtenir l'historique des notes Elo d'une équipe: liste de (date, note)"""
+        if nom_equipe not in self._equipes:
+            raise ValidationError(f"Équipe {nom_equipe} non trouvée!")
+        return self._elo.historique(nom_equipe)
+
+    def predire_match(self, nom_equipe_domicile, nom_equipe_exterieur, date=None):
+        """Probabilité de victoire de l'équipe à domicile selon les notes Elo"""
+        for nom in (nom_equipe_domicile, nom_equipe_exterieur):
+            if nom not in self._equipes:
+                raise ValidationError(f"Équipe {nom} non trouvée!")
+        if date is not None:
+            date = parser_date(date)
+        return self._elo.probabilite_victoire(nom_equipe_domicile, nom_equipe_exterieur, date)
+
+    def obtenir_statistiques_cache(self):
+        """Obtenir les compteurs du cache des requêtes (succès, échecs, évictions)"""
+        return self._cache.statistiques()
+
+    def valider_coherence_systeme(self, audit_complet=False):
+        """Valider la cohérence du système et retourner les incohérences trouvées
+
+        Par défaut seules les entités modifiées depuis la dernière validation
+        sont réexaminées; audit_complet=True reparcourt tout le système.
+        """
+        if audit_complet:
+            return self._coherence.audit_complet()
+        return self._coherence.verifier()
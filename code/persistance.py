@@ -0,0 +1,323 @@
+import functools
+import json
+import os
+from datetime import datetime
+from dates import vers_jour
+from match import saison_de
+from nba_system import NBASystem
+from statistique_joueur import HistoriqueDiffere
+
+
+# Extension -> codec de compression (choisi d'après le nom du fichier)
+CODECS = {
+    '.gz': 'gzip',
+    '.xz': 'lzma',
+    '.lzma': 'lzma',
+    '.zst': 'zstd',
+}
+
+# Index écrit à côté d'une sauvegarde JSON non compressée: position de
+# l'historique de chaque joueur dans le fichier et totaux, pour le chargement différé
+SUFFIXE_INDEX = '.index'
+VERSION_INDEX = 1
+
+
+def exporter_donnees(systeme):
+    """Convertir le système en dictionnaire sérialisable en JSON"""
+    donnees = {
+        'equipes': [],
+        'joueurs': [],
+        'matchs': []
+    }
+
+    # Sauvegarder les équipes
+    for equipe in systeme._equipes.values():
+        donnees['equipes'].append({
+            'nom': equipe.nom,
+            'ville': equipe.ville,
+            'victoires': equipe.victoires,
+            'defaites': equipe.defaites
+        })
+
+    # Les saisons compactées ne sont plus dans les listes d'objets: relire leurs colonnes
+    archives = [saison for saison in systeme._saisons.values() if saison.etat in ('compactee', 'dechargee')]
+    stats_archivees = {}
+    for saison in archives:
+        for nom, temps_jeu, points, passes, rebonds, date in saison.lignes_statistiques():
+            stats_archivees.setdefault(nom, []).append({
+                'temps_jeu': temps_jeu,
+                'points': points,
+                'passes': passes,
+                'rebonds': rebonds,
+                'date': date.isoformat()
+            })
+
+    # Sauvegarder les joueurs
+    for joueur in systeme._joueurs_index.values():
+        joueur_data = {
+            'nom': joueur.nom,
+            'origine': joueur.origine,
+            'annee_debut': joueur.annee_debut,
+            'poste': joueur.poste.value,
+            'equipe': joueur.equipe.nom if joueur.equipe else None,
+            'statistiques': []
+        }
+
+        for stat in joueur._statistiques:
+            joueur_data['statistiques'].append({
+                'temps_jeu': stat.temps_jeu,
+                'points': stat.points,
+                'passes': stat.passes,
+                'rebonds': stat.rebonds,
+                'date': stat.date_match.isoformat()
+            })
+
+        joueur_data['statistiques'].extend(stats_archivees.get(joueur.nom, []))
+        donnees['joueurs'].append(joueur_data)
+
+    # Sauvegarder les matchs
+    for match in systeme._matchs:
+        donnees['matchs'].append({
+            'equipe_domicile': match.equipe_domicile.nom,
+            'equipe_exterieur': match.equipe_exterieur.nom,
+            'score_domicile': match.score_domicile,
+            'score_exterieur': match.score_exterieur,
+            'date': match.date.isoformat()
+        })
+
+    for saison in archives:
+        for domicile, exterieur, score_domicile, score_exterieur, date in saison.lignes_matchs():
+            donnees['matchs'].append({
+                'equipe_domicile': domicile,
+                'equipe_exterieur': exterieur,
+                'score_domicile': score_domicile,
+                'score_exterieur': score_exterieur,
+                'date': date.isoformat()
+            })
+
+    return donnees
+
+
+def importer_donnees(donnees, systeme=None):
+    """Construire un nouveau système à partir d'un dictionnaire produit par exporter_donnees
+
+    Avec systeme, les données sont ajoutées à un système existant. L'import
+    se fait dans une transaction: une erreur en cours de route ne laisse
+    aucune donnée partielle.
+    """
+    if systeme is None:
+        systeme = NBASystem()
+
+    with systeme.transaction():
+        # Charger les équipes (les bilans sont reconstruits à partir des matchs)
+        for equipe_data in donnees.get('equipes', []):
+            systeme.ajouter_equipe(equipe_data['nom'], equipe_data['ville'])
+
+        # Charger les joueurs
+        for joueur_data in donnees.get('joueurs', []):
+            if joueur_data.get('equipe'):
+                systeme.ajouter_joueur_a_equipe(
+                    joueur_data['equipe'],
+                    joueur_data['nom'],
+                    joueur_data['origine'],
+                    joueur_data['annee_debut'],
+                    joueur_data['poste']
+                )
+
+        # Statistiques et matchs sont ajoutés en masse (validation puis ajout en une fois)
+        systeme.ajouter_statistiques_en_masse(iterer_lignes_statistiques(donnees))
+        systeme.ajouter_matchs_en_masse(iterer_lignes_matchs(donnees))
+
+    return systeme
+
+
+def iterer_lignes_statistiques(donnees):
+    """Lignes (joueur, temps, points, passes, rebonds, date) des joueurs rattachés à une équipe"""
+    for joueur_data in donnees.get('joueurs', []):
+        if joueur_data.get('equipe'):
+            nom = joueur_data['nom']
+            for stat_data in joueur_data.get('statistiques', []):
+                yield (nom, stat_data['temps_jeu'], stat_data['points'], stat_data['passes'],
+                       stat_data['rebonds'], datetime.fromisoformat(stat_data['date']))
+
+
+def iterer_lignes_matchs(donnees):
+    """Lignes (domicile, extérieur, score domicile, score extérieur, date) des matchs"""
+    for match_data in donnees.get('matchs', []):
+        yield (match_data['equipe_domicile'], match_data['equipe_exterieur'], match_data['score_domicile'],
+               match_data['score_exterieur'], datetime.fromisoformat(match_data['date']))
+
+
+def nom_fichier_sauvegarde():
+    """Nom de fichier horodaté utilisé par défaut pour les sauvegardes"""
+    return f"nba_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+
+
+def codec_fichier(chemin):
+    """Codec de compression d'un fichier d'après son extension (None: JSON non compressé)"""
+    return CODECS.get(os.path.splitext(chemin)[1].lower())
+
+
+def ouvrir_fichier(chemin, mode='r'):
+    """Ouvrir un fichier de sauvegarde en mode texte, compressé ou non selon son extension
+
+    La compression et la décompression se font en flux, au fil des
+    écritures et des lectures. zstd nécessite le paquet optionnel zstandard.
+    """
+    codec = codec_fichier(chemin)
+    if codec is None:
+        return open(chemin, mode, encoding='utf-8')
+    if codec == 'gzip':
+        import gzip
+        return gzip.open(chemin, mode + 't', compresslevel=6, encoding='utf-8')
+    if codec == 'lzma':
+        import lzma
+        return lzma.open(chemin, mode + 't', encoding='utf-8')
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("La compression zstd nécessite le paquet zstandard (pip install zstandard)") from None
+    return zstandard.open(chemin, mode + 't', encoding='utf-8')
+
+
+def lire_fichier(chemin):
+    """Lire le contenu brut d'un fichier de sauvegarde (décompressé selon son extension)"""
+    with ouvrir_fichier(chemin) as f:
+        return json.load(f)
+
+
+def _totaux_lignes(statistiques):
+    """Totaux d'une liste de statistiques exportées, au global et par saison, dans l'ordre du chargement"""
+    globaux = [0, 0.0, 0, 0, 0, 0.0]
+    par_saison = {}
+    for stat in statistiques:
+        temps_jeu = float(stat['temps_jeu'])
+        efficacite = (stat['points'] + stat['passes'] + stat['rebonds']) / temps_jeu if temps_jeu else 0
+        valeurs = (1, temps_jeu, stat['points'], stat['passes'], stat['rebonds'], efficacite)
+        saison = par_saison.setdefault(saison_de(datetime.fromisoformat(stat['date'])), [0, 0.0, 0, 0, 0, 0.0])
+        for i, valeur in enumerate(valeurs):
+            saison[i] += valeur
+            globaux[i] += valeur
+    return globaux, par_saison
+
+
+def _ecrire_json_indexe(donnees, chemin):
+    """Écrire le JSON un enregistrement par ligne et retourner l'index des historiques des joueurs"""
+    def texte(valeur):
+        return json.dumps(valeur, ensure_ascii=False).encode('utf-8')
+
+    index = {}
+    with open(chemin, 'wb') as f:
+        f.write(b'{\n"equipes": [\n' + b',\n'.join(texte(e) for e in donnees['equipes']) + b'\n],\n"joueurs": [\n')
+        for i, joueur_data in enumerate(donnees['joueurs']):
+            statistiques = joueur_data['statistiques']
+            autres = {cle: valeur for cle, valeur in joueur_data.items() if cle != 'statistiques'}
+            f.write(texte(autres)[:-1] + b', "statistiques": ')
+            debut = f.tell()
+            f.write(texte(statistiques))
+            fin = f.tell()
+            f.write(b'}' + (b',\n' if i < len(donnees['joueurs']) - 1 else b'\n'))
+
+            totaux, par_saison = _totaux_lignes(statistiques)
+            index[joueur_data['nom']] = {'position': [debut, fin], 'lignes': len(statistiques),
+                                         'totaux': totaux, 'saisons': par_saison}
+        f.write(b'],\n"matchs": [\n' + b',\n'.join(texte(m) for m in donnees['matchs']) + b'\n]\n}\n')
+    return index
+
+
+def sauvegarder(systeme, chemin=None):
+    """Sauvegarder le système dans un fichier JSON et retourner son chemin
+
+    Une extension .gz, .xz, .lzma ou .zst compresse le fichier (JSON
+    compact). Sinon le JSON est écrit un enregistrement par ligne, avec un
+    index (fichier .index) permettant à charger() de différer la lecture
+    des historiques de statistiques.
+    """
+    chemin = chemin or nom_fichier_sauvegarde()
+    donnees = exporter_donnees(systeme)
+    if codec_fichier(chemin) is not None:
+        with ouvrir_fichier(chemin, 'w') as f:
+            json.dump(donnees, f, separators=(',', ':'), ensure_ascii=False)
+        return chemin
+
+    chemin_index = chemin + SUFFIXE_INDEX
+    if os.path.exists(chemin_index):
+        os.remove(chemin_index)
+    joueurs = _ecrire_json_indexe(donnees, chemin)
+    etat = os.stat(chemin)
+    with open(chemin_index, 'w', encoding='utf-8') as f:
+        json.dump({'version': VERSION_INDEX, 'taille': etat.st_size, 'mtime_ns': etat.st_mtime_ns,
+                   'joueurs': joueurs}, f, ensure_ascii=False, separators=(',', ':'))
+    return chemin
+
+
+def _lire_index(chemin):
+    """Index de la sauvegarde s'il existe et correspond encore au fichier, sinon None"""
+    try:
+        with open(chemin + SUFFIXE_INDEX, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    etat = os.stat(chemin)
+    if (index.get('version') != VERSION_INDEX or index.get('taille') != etat.st_size
+            or index.get('mtime_ns') != etat.st_mtime_ns):
+        return None
+    return index
+
+
+def _lire_historique(chemin, debut, fin, signature):
+    """Lire les lignes de statistiques d'un joueur entre deux positions de la sauvegarde"""
+    etat = os.stat(chemin)
+    if (etat.st_size, etat.st_mtime_ns) != signature:
+        raise ValueError(f"{chemin} a été modifié depuis le chargement: historique illisible")
+    with open(chemin, 'rb') as f:
+        f.seek(debut)
+        statistiques = json.loads(f.read(fin - debut))
+    return [(float(s['temps_jeu']), s['points'], s['passes'], s['rebonds'],
+             vers_jour(datetime.fromisoformat(s['date']))) for s in statistiques]
+
+
+def _lire_sans_historiques(chemin, positions):
+    """Contenu de la sauvegarde où chaque historique indexé est remplacé par une liste vide
+
+    Seuls les morceaux entre deux historiques sont lus; les historiques sont
+    sautés (seek) sans être chargés en mémoire.
+    """
+    morceaux = []
+    with open(chemin, 'rb') as f:
+        for debut, fin in positions:
+            morceaux.append(f.read(debut - f.tell()))
+            morceaux.append(b'[]')
+            f.seek(fin)
+        morceaux.append(f.read())
+    return b''.join(morceaux)
+
+
+def _charger_differe(chemin, index):
+    positions = sorted(entree['position'] for entree in index['joueurs'].values())
+    systeme = importer_donnees(json.loads(_lire_sans_historiques(chemin, positions)))
+
+    signature = (index['taille'], index['mtime_ns'])
+    for nom, entree in index['joueurs'].items():
+        if not entree['lignes'] or not systeme.rechercher_joueur(nom):
+            continue
+        historique = HistoriqueDiffere(entree['lignes'], entree['totaux'],
+                                       functools.partial(_lire_historique, chemin, *entree['position'], signature))
+        systeme._attacher_historique_differe(nom, historique,
+                                             {int(annee): totaux for annee, totaux in entree['saisons'].items()})
+    return systeme
+
+
+def charger(chemin, differe=True):
+    """Charger un système depuis un fichier JSON, éventuellement compressé
+
+    Si la sauvegarde a un index à jour (JSON non compressé écrit par
+    sauvegarder), équipes, effectifs, matchs et totaux des joueurs sont
+    chargés immédiatement et chaque historique de statistiques n'est lu
+    qu'au premier accès. Sinon, ou avec differe=False, tout est chargé.
+    """
+    if differe and codec_fichier(chemin) is None:
+        index = _lire_index(chemin)
+        if index is not None:
+            return _charger_differe(chemin, index)
+    return importer_donnees(lire_fichier(chemin))
@@ -1,16 +1,20 @@
+import sys
 from abc import ABC, abstractmethod
 
 class Personne(ABC):
     """Classe abstraite de base représentant une personne"""
 
+    __slots__ = ('_nom', '_origine')
+
     def __init__(self, nom, origine):
         if not nom or not isinstance(nom, str):
             raise ValueError("Le nom doit être une chaîne non vide")
         if not origine or not isinstance(origine, str):
             raise ValueError("L'origine doit être une chaîne non vide")
 
-        self._nom = nom
-        self._origine = origine
+        # Noms et origines internés: une seule chaîne partagée par valeur
+        self._nom = sys.intern(nom)
+        self._origine = sys.intern(origine)
 
     @property
     def nom(self):
@@ -0,0 +1,175 @@
+import math
+import unicodedata
+from collections import Counter
+
+
+def normaliser(texte):
+    """Forme de recherche d'un nom: sans accents, en minuscules, séparateurs réduits à un espace"""
+    decompose = unicodedata.normalize('NFKD', texte)
+    sans_accents = ''.join(c for c in decompose if not unicodedata.combining(c))
+    return ' '.join(''.join(c if c.isalnum() else ' ' for c in sans_accents.casefold()).split())
+
+
+def trigrammes(texte_normalise):
+    """Trigrammes d'un texte normalisé, complété par des espaces pour marquer les bords des mots"""
+    texte = f"  {texte_normalise} "
+    return {texte[i:i + 3] for i in range(len(texte) - 2)}
+
+
+class _Noeud:
+    __slots__ = ('enfants', 'noms')
+
+    def __init__(self):
+        self.enfants = {}
+        self.noms = set()
+
+
+class IndexRecherche:
+    """Index de recherche des noms de joueurs et d'équipes
+
+    Un arbre préfixe (trie) sur les formes normalisées du nom complet et de
+    chacun de ses mots sert la complétion; un index de trigrammes sert la
+    recherche approchée (fautes de frappe, prénom et nom inversés). Les deux
+    sont mis à jour à chaque ajout ou retrait.
+    """
+
+    def __init__(self):
+        self._racine = _Noeud()
+        self._trigrammes = {}
+        # Nom -> {'categorie', 'normalise', 'trigrammes', ...métadonnées}
+        self._entrees = {}
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def __contains__(self, nom):
+        return nom in self._entrees
+
+    def ajouter(self, nom, categorie, **metadonnees):
+        """Indexer un nom (ou mettre à jour ses métadonnées s'il est déjà indexé)"""
+        entree = self._entrees.get(nom)
+        if entree is not None:
+            entree.update(metadonnees)
+            return
+
+        normalise = normaliser(nom)
+        grammes = trigrammes(normalise)
+        self._entrees[nom] = dict(metadonnees, categorie=categorie, normalise=normalise, trigrammes=grammes)
+
+        for cle in self._cles(normalise):
+            noeud = self._racine
+            for caractere in cle:
+                noeud = noeud.enfants.setdefault(caractere, _Noeud())
+            noeud.noms.add(nom)
+        for gramme in grammes:
+            self._trigrammes.setdefault(gramme, set()).add(nom)
+
+    def retirer(self, nom):
+        """Retirer un nom de l'index"""
+        entree = self._entrees.pop(nom, None)
+        if entree is None:
+            return
+
+        for cle in self._cles(entree['normalise']):
+            chemin = [self._racine]
+            for caractere in cle:
+                chemin.append(chemin[-1].enfants[caractere])
+            chemin[-1].noms.discard(nom)
+            # Élaguer les nœuds devenus vides
+            for parent, caractere, noeud in zip(reversed(chemin[:-1]), reversed(cle), reversed(chemin[1:])):
+                if noeud.noms or noeud.enfants:
+                    break
+                del parent.enfants[caractere]
+        for gramme in entree['trigrammes']:
+            noms = self._trigrammes[gramme]
+            noms.discard(nom)
+            if not noms:
+                del self._trigrammes[gramme]
+
+    @staticmethod
+    def _cles(normalise):
+        # Nom complet puis la fin du nom à partir de chaque mot ("james", "lebron james")
+        mots = normalise.split(' ')
+        return {' '.join(mots[i:]) for i in range(len(mots))}
+
+    def _accepte(self, nom, categorie, filtres):
+        entree = self._entrees[nom]
+        if categorie is not None and entree['categorie'] != categorie:
+            return False
+        return all(entree.get(cle) == valeur for cle, valeur in filtres.items())
+
+    def completer(self, prefixe, limite=10, categorie=None, **filtres):
+        """Noms dont le nom complet ou un mot commence par le préfixe (ordre alphabétique de la partie trouvée)"""
+        noeud = self._racine
+        for caractere in normaliser(prefixe):
+            noeud = noeud.enfants.get(caractere)
+            if noeud is None:
+                return []
+
+        resultats = []
+        vus = set()
+        pile = [noeud]
+        # Parcours en profondeur par ordre alphabétique, arrêté dès que la limite est atteinte
+        while pile and len(resultats) < limite:
+            noeud = pile.pop()
+            for nom in sorted(noeud.noms):
+                if nom not in vus and self._accepte(nom, categorie, filtres):
+                    vus.add(nom)
+                    resultats.append(nom)
+                    if len(resultats) == limite:
+                        break
+            pile.extend(noeud.enfants[c] for c in sorted(noeud.enfants, reverse=True))
+        return resultats
+
+    def rechercher_approx(self, texte, limite=5, categorie=None, seuil=0.3, **filtres):
+        """Noms les plus proches du texte: liste de (nom, score) avec score de Dice sur les trigrammes"""
+        grammes = trigrammes(normaliser(texte))
+        if not grammes:
+            return []
+
+        # Filtrage par préfixe: un nom atteignant le seuil partage au moins `minimum`
+        # trigrammes avec le texte, donc au moins un des len - minimum + 1 plus rares
+        minimum = max(1, math.ceil(seuil * (len(grammes) + 1) / 2))
+        listes = sorted((self._trigrammes.get(g, ()) for g in grammes), key=len)
+        nb_rares = len(grammes) - minimum + 1
+        candidats = Counter()
+        for noms in listes[:nb_rares]:
+            candidats.update(noms)
+
+        frequentes = listes[nb_rares:]
+        resultats = []
+        for nom, nb_communs in candidats.items():
+            nb_trigrammes = len(self._entrees[nom]['trigrammes'])
+            # Écarter sans autre calcul les noms qui n'atteindraient pas le seuil même
+            # en partageant tous les trigrammes fréquents
+            if 2 * (nb_communs + len(frequentes)) < seuil * (len(grammes) + nb_trigrammes):
+                continue
+            nb_communs += sum(1 for noms in frequentes if nom in noms)
+            score = 2 * nb_communs / (len(grammes) + nb_trigrammes)
+            if score >= seuil and self._accepte(nom, categorie, filtres):
+                resultats.append((nom, score))
+        resultats.sort(key=lambda r: (-r[1], r[0]))
+        return resultats[:limite]
+
+    def resoudre(self, texte, categorie=None):
+        """Nom indexé correspondant au texte: exact, puis sans accents ni casse
+
+        Pas de recherche approchée: un nom proche peut désigner une autre
+        entité (« Los Angeles Clippers » et « Los Angeles Lakers »). Les
+        suggestions passent par rechercher_approx.
+        """
+        if texte in self._entrees and self._accepte(texte, categorie, {}):
+            return texte
+
+        normalise = normaliser(texte)
+        noeud = self._racine
+        for caractere in normalise:
+            noeud = noeud.enfants.get(caractere)
+            if noeud is None:
+                break
+        else:
+            exacts = [n for n in noeud.noms
+                      if self._entrees[n]['normalise'] == normalise and self._accepte(n, categorie, {})]
+            if exacts:
+                return min(exacts)
+        return None
@@ -0,0 +1,241 @@
+import json
+from array import array
+from datetime import datetime
+from dates import vers_jour, depuis_jour
+from match import MOIS_DEBUT_SAISON
+from statistique_joueur import COMPTAGES
+
+
+ETATS_SAISON = ('active', 'gelee', 'compactee', 'dechargee')
+
+class Saison:
+    """Partition des données d'une saison: matchs, bilans et statistiques
+
+    Les bilans et les totaux par joueur sont tenus à jour à chaque ajout et
+    restent disponibles dans tous les états. Une saison gelée refuse tout
+    nouvel ajout; compactée, ses matchs et statistiques sont rangés dans des
+    colonnes typées (array) au lieu d'objets; déchargée, ces colonnes sont
+    écrites sur disque et relues uniquement à la demande.
+    """
+
+    def __init__(self, annee):
+        self.annee = annee
+        self.etat = 'active'
+        self.nb_matchs = 0
+        self._matchs = []
+        # Nom d'équipe -> [victoires, défaites]
+        self._bilans = {}
+        # Nom du joueur -> [matchs, temps, points, passes, rebonds, efficacité]
+        self._totaux = {}
+        self._colonnes = None
+        self._chemin = None
+
+    @property
+    def bornes(self):
+        """Premier jour de la saison et premier jour de la saison suivante (ordinaux)"""
+        return (vers_jour(datetime(self.annee, MOIS_DEBUT_SAISON, 1)),
+                vers_jour(datetime(self.annee + 1, MOIS_DEBUT_SAISON, 1)))
+
+    @property
+    def gelee(self):
+        return self.etat != 'active'
+
+    def ajouter_match(self, match):
+        """Enregistrer un match de la saison"""
+        if self.gelee:
+            raise ValueError(f"La saison {self.annee} est gelée")
+        self._matchs.append(match)
+        self.nb_matchs += 1
+
+        gagnant = match.get_equipe_gagnante()
+        for equipe in (match.equipe_domicile, match.equipe_exterieur):
+            bilan = self._bilans.setdefault(equipe.nom, [0, 0])
+            if gagnant is not None:
+                bilan[0 if equipe is gagnant else 1] += 1
+
+    def retirer_dernier_match(self, match):
+        """Retirer le dernier match enregistré (annulation d'une transaction)"""
+        if not self._matchs or self._matchs[-1] is not match:
+            raise ValueError("Seul le dernier match enregistré peut être retiré")
+        self._matchs.pop()
+        self.nb_matchs -= 1
+
+        gagnant = match.get_equipe_gagnante()
+        for equipe in (match.equipe_domicile, match.equipe_exterieur):
+            bilan = self._bilans[equipe.nom]
+            if gagnant is not None:
+                bilan[0 if equipe is gagnant else 1] -= 1
+            # L'entrée n'existait pas avant ce match si l'équipe n'a pas d'autre match (nuls compris) dans la saison
+            if bilan == [0, 0] and not any(equipe is m.equipe_domicile or equipe is m.equipe_exterieur
+                                           for m in self._matchs):
+                del self._bilans[equipe.nom]
+
+    def ajouter_statistique(self, nom_joueur, stat):
+        """Comptabiliser une ligne de statistiques dans les totaux de la saison"""
+        if self.gelee:
+            raise ValueError(f"La saison {self.annee} est gelée")
+        totaux = self._totaux.setdefault(nom_joueur, [0, 0.0, 0, 0, 0, 0.0])
+        for i, valeur in enumerate((1, stat.temps_jeu, stat.points, stat.passes, stat.rebonds,
+                                    stat.calculer_efficacite())):
+            totaux[i] += valeur
+
+    def ajouter_totaux(self, nom_joueur, totaux):
+        """Ajouter aux totaux d'un joueur ceux de lignes non rattachées une à une (chargement différé)"""
+        if self.gelee:
+            raise ValueError(f"La saison {self.annee} est gelée")
+        cumul = self._totaux.setdefault(nom_joueur, [0, 0.0, 0, 0, 0, 0.0])
+        for i, valeur in enumerate(totaux):
+            cumul[i] += valeur
+
+    def restaurer_totaux(self, nom_joueur, totaux):
+        """Remettre les totaux d'un joueur à une valeur antérieure (annulation d'une transaction)"""
+        if totaux[0]:
+            self._totaux[nom_joueur] = list(totaux)
+        else:
+            self._totaux.pop(nom_joueur, None)
+
+    def totaux(self, nom_joueur):
+        """(matchs, temps, points, passes, rebonds, somme des efficacités) d'un joueur sur la saison"""
+        return tuple(self._totaux.get(nom_joueur, (0, 0.0, 0, 0, 0, 0.0)))
+
+    def bilan(self, nom_equipe):
+        """Victoires et défaites d'une équipe sur la saison"""
+        return tuple(self._bilans.get(nom_equipe, (0, 0)))
+
+    def classement(self):
+        """Classement de la saison: liste de (nom d'équipe, victoires, défaites)"""
+        bilans = [(nom, v, d) for nom, (v, d) in self._bilans.items() if v + d > 0]
+        return sorted(bilans, key=lambda b: (b[1] / (b[1] + b[2]), b[1]), reverse=True)
+
+    def moyennes(self, nom_joueur):
+        """Moyennes d'un joueur sur la saison (None s'il n'a pas joué)"""
+        totaux = self._totaux.get(nom_joueur)
+        if not totaux:
+            return None
+        nb_matchs, temps, points, passes, rebonds, efficacite = totaux
+        return {
+            'temps_jeu': temps / nb_matchs,
+            'points': points / nb_matchs,
+            'passes': passes / nb_matchs,
+            'rebonds': rebonds / nb_matchs,
+            'matchs_joues': nb_matchs,
+            'efficacite_moyenne': efficacite / nb_matchs
+        }
+
+    def noms_joueurs(self):
+        """Joueurs ayant des statistiques sur la saison"""
+        return self._totaux.keys()
+
+    def matchs(self):
+        """Matchs de la saison (objets), disponibles tant que la saison n'est pas compactée"""
+        if self._matchs is None:
+            raise ValueError(f"La saison {self.annee} est compactée: utilisez lignes_matchs()")
+        return self._matchs
+
+    def geler(self):
+        """Interdire tout nouvel ajout dans la saison"""
+        if self.etat == 'active':
+            self.etat = 'gelee'
+
+    def compacter(self, historiques):
+        """Ranger les matchs et statistiques en colonnes typées
+
+        historiques associe à chaque nom de joueur son HistoriqueStatistiques,
+        dont sont copiées les lignes datées de la saison. Retourne (matchs
+        retirés, noms des joueurs concernés), pour que le système puisse
+        libérer ses propres données.
+        """
+        self.geler()
+        if self.etat != 'gelee':
+            return [], []
+
+        noms_equipes = sorted(self._bilans)
+        index_equipes = {nom: i for i, nom in enumerate(noms_equipes)}
+        noms_joueurs = [nom for nom in self._totaux if nom in historiques]
+        premier_jour, jour_fin = self.bornes
+
+        colonnes = {
+            'noms_equipes': noms_equipes,
+            'noms_joueurs': noms_joueurs,
+            'domicile': array('H', (index_equipes[m.equipe_domicile.nom] for m in self._matchs)),
+            'exterieur': array('H', (index_equipes[m.equipe_exterieur.nom] for m in self._matchs)),
+            'score_domicile': array('H', (m.score_domicile for m in self._matchs)),
+            'score_exterieur': array('H', (m.score_exterieur for m in self._matchs)),
+            'jour_match': array('i', (m.jour for m in self._matchs)),
+            'joueur': array('I'),
+            'temps_jeu': array('d'),
+            'points': array('i'),
+            'passes': array('i'),
+            'rebonds': array('i'),
+            'jour_stat': array('i'),
+        }
+        for i, nom in enumerate(noms_joueurs):
+            historique = historiques[nom]
+            # Valeurs décimales dans l'historique: la colonne de la saison passe en réels
+            for colonne in COMPTAGES:
+                if getattr(historique, colonne).typecode == 'd' and colonnes[colonne].typecode != 'd':
+                    colonnes[colonne] = array('d', colonnes[colonne])
+            for ligne, jour in enumerate(historique.jour):
+                if premier_jour <= jour < jour_fin:
+                    colonnes['joueur'].append(i)
+                    for colonne in ('temps_jeu', 'points', 'passes', 'rebonds'):
+                        colonnes[colonne].append(getattr(historique, colonne)[ligne])
+                    colonnes['jour_stat'].append(jour)
+
+        matchs = self._matchs
+        self._colonnes = colonnes
+        self._matchs = None
+        self.etat = 'compactee'
+        return matchs, noms_joueurs
+
+    def decharger(self, chemin):
+        """Écrire les colonnes d'une saison compactée sur disque et les libérer de la mémoire"""
+        if self.etat == 'dechargee':
+            return
+        if self.etat != 'compactee':
+            raise ValueError(f"La saison {self.annee} doit être compactée avant d'être déchargée")
+
+        donnees = {cle: list(valeur) for cle, valeur in self._colonnes.items()}
+        donnees['annee'] = self.annee
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump(donnees, f, ensure_ascii=False)
+        self._chemin = chemin
+        self._colonnes = None
+        self.etat = 'dechargee'
+
+    def _lire_colonnes(self):
+        if self._colonnes is not None:
+            return self._colonnes
+        with open(self._chemin, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def lignes_matchs(self):
+        """Matchs de la saison: (domicile, extérieur, score domicile, score extérieur, date)"""
+        if self._matchs is not None:
+            for m in self._matchs:
+                yield m.equipe_domicile.nom, m.equipe_exterieur.nom, m.score_domicile, m.score_exterieur, m.date
+            return
+
+        c = self._lire_colonnes()
+        noms = c['noms_equipes']
+        for d, e, sd, se, jour in zip(c['domicile'], c['exterieur'], c['score_domicile'],
+                                      c['score_exterieur'], c['jour_match']):
+            yield noms[d], noms[e], sd, se, depuis_jour(jour)
+
+    def lignes_statistiques(self):
+        """Statistiques de la saison: (joueur, temps, points, passes, rebonds, date)"""
+        if self._matchs is not None:
+            raise ValueError(f"La saison {self.annee} n'est pas compactée: lisez les statistiques des joueurs")
+
+        c = self._lire_colonnes()
+        noms = c['noms_joueurs']
+        for j, t, p, pa, r, jour in zip(c['joueur'], c['temps_jeu'], c['points'], c['passes'],
+                                        c['rebonds'], c['jour_stat']):
+            yield noms[j], t, p, pa, r, depuis_jour(jour)
+
+    def restaurer(self, matchs):
+        """Revenir à l'état gelé avec les matchs recréés par le système"""
+        self._matchs = list(matchs)
+        self._colonnes = None
+        self._chemin = None
+        self.etat = 'gelee'
@@ -0,0 +1,422 @@
+"""API REST locale (lecture seule) sur un NBASystem partagé
+
+Serveur HTTP de la bibliothèque standard, un thread par requête:
+
+    GET /saisons
+    GET /equipes                          bilan et effectif de chaque équipe
+    GET /equipes/<nom>                    détail d'une équipe (?saison=)
+    GET /equipes/<nom>/matchs             matchs d'une équipe (?saison=)
+    GET /joueurs                          joueurs (?equipe=, ?poste=)
+    GET /joueurs/<nom>                    moyennes, records et forme d'un joueur
+    GET /joueurs/<nom>/statistiques       historique match par match (?saison=)
+    GET /matchs                           matchs (?saison=, ?equipe=)
+    GET /classement                       classement général ou d'une saison (?saison=)
+    GET /classement/elo                   notes Elo, actuelles ou à une date (?date=YYYY-MM-DD)
+    GET /leaders                          meilleurs joueurs (?critere=, ?saison=)
+    GET /face-a-face?equipe1=..&equipe2=..  confrontations directes (?saison=)
+
+Les réponses de type liste sont paginées (?page=1&par_page=50, au plus
+MAX_PAR_PAGE) dans une enveloppe {donnees, page, par_page, total, pages}.
+Chaque réponse porte un ETag calculé sur son contenu: une requête avec
+If-None-Match reçoit 304 tant que la réponse n'a pas changé. Les noms
+d'équipes et de joueurs sont reconnus malgré accents et casse; un nom
+inconnu reçoit 404, avec les noms approchants dans le champ suggestions.
+
+Les réponses sont mises en cache; le serveur s'abonne au bus d'événements
+du système et change de génération à chaque mutation validée, ce qui écarte
+les réponses calculées avant elle. Un verrou sérialise les accès au système:
+le code qui le modifie pendant que le serveur tourne doit le prendre.
+
+    serveur = ServeurAPI(systeme, port=8000)
+    serveur.demarrer()
+    with serveur.verrou:
+        systeme.ajouter_match(...)
+"""
+import hashlib
+import json
+import re
+import threading
+from datetime import date, datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from cache import CacheRequetes
+from dates import depuis_jour
+from match import parser_date
+from nba_system import ValidationError
+
+PAR_PAGE = 50
+MAX_PAR_PAGE = 500
+# Noms proposés dans une réponse 404 pour une équipe ou un joueur inconnu
+NB_SUGGESTIONS = 5
+CRITERES = ('points', 'passes', 'rebonds', 'efficacite_moyenne')
+
+
+class ErreurRequete(Exception):
+    """Erreur à renvoyer au client avec un statut HTTP"""
+
+    def __init__(self, statut, message, suggestions=None):
+        super().__init__(message)
+        self.statut = statut
+        self.suggestions = suggestions
+
+
+def _entier(parametres, nom, defaut=None, minimum=None):
+    valeur = parametres.get(nom)
+    if valeur is None:
+        return defaut
+    try:
+        valeur = int(valeur)
+    except ValueError:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Paramètre {nom} invalide: {valeur}")
+    if minimum is not None and valeur < minimum:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Paramètre {nom} inférieur à {minimum}")
+    return valeur
+
+
+def _requis(parametres, nom):
+    valeur = parametres.get(nom)
+    if not valeur:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Paramètre {nom} requis")
+    return valeur
+
+
+# Un nom inconnu n'est jamais remplacé par un nom proche (qui peut désigner une autre entité):
+# la réponse 404 propose les noms approchants
+def _trouver_equipe(systeme, texte):
+    nom = systeme.resoudre_nom_equipe(texte)
+    equipe = systeme.rechercher_equipe(nom) if nom else None
+    if equipe is None:
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Équipe {texte} non trouvée",
+                            systeme.rechercher(texte, NB_SUGGESTIONS, 'equipe'))
+    return equipe
+
+
+def _trouver_joueur(systeme, texte):
+    nom = systeme.resoudre_nom_joueur(texte)
+    joueur = systeme.rechercher_joueur(nom) if nom else None
+    if joueur is None:
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Joueur {texte} non trouvé",
+                            systeme.rechercher(texte, NB_SUGGESTIONS, 'joueur'))
+    return joueur
+
+
+def _annees(systeme, parametres):
+    """Saisons demandées: celle du paramètre saison, ou toutes"""
+    saison = _entier(parametres, 'saison')
+    if saison is None:
+        return systeme.obtenir_saisons()
+    systeme.obtenir_saison(saison)
+    return [saison]
+
+
+def _lignes_matchs(systeme, parametres):
+    """Matchs (domicile, extérieur, score domicile, score extérieur, date), saisons archivées comprises"""
+    for annee in _annees(systeme, parametres):
+        yield from systeme.obtenir_saison(annee).lignes_matchs()
+
+
+def _match(ligne):
+    domicile, exterieur, score_domicile, score_exterieur, date_match = ligne
+    return {
+        'date': date_match,
+        'domicile': domicile,
+        'exterieur': exterieur,
+        'score_domicile': score_domicile,
+        'score_exterieur': score_exterieur,
+        'vainqueur': (domicile if score_domicile > score_exterieur
+                      else exterieur if score_exterieur > score_domicile else None),
+    }
+
+
+def _bilan(victoires, defaites):
+    total = victoires + defaites
+    return {'victoires': victoires, 'defaites': defaites,
+            'pourcentage': round(100 * victoires / total, 1) if total else 0.0}
+
+
+def _resume_joueur(joueur):
+    return {
+        'nom': joueur.nom,
+        'poste': joueur.poste.value,
+        'equipe': joueur.equipe.nom if joueur.equipe else None,
+    }
+
+
+def lister_saisons(systeme, parametres):
+    return [{'annee': annee, 'etat': systeme.obtenir_saison(annee).etat} for annee in systeme.obtenir_saisons()]
+
+
+def lister_equipes(systeme, parametres):
+    return [dict({'nom': e.nom, 'ville': e.ville, 'joueurs': len(e.joueurs)}, **_bilan(e.victoires, e.defaites))
+            for e in systeme._equipes.values()]
+
+
+def detailler_equipe(systeme, parametres, nom):
+    equipe = _trouver_equipe(systeme, nom)
+    victoires, defaites = systeme.obtenir_bilan_equipe(equipe.nom, _annees(systeme, parametres))
+    return dict({'nom': equipe.nom, 'ville': equipe.ville,
+                 'effectif': [_resume_joueur(j) for j in equipe.joueurs]},
+                **_bilan(victoires, defaites))
+
+
+def lister_matchs_equipe(systeme, parametres, nom):
+    nom = _trouver_equipe(systeme, nom).nom
+    return [_match(l) for l in _lignes_matchs(systeme, parametres) if nom in (l[0], l[1])]
+
+
+def lister_joueurs(systeme, parametres):
+    joueurs = systeme._joueurs_index.values()
+    if 'equipe' in parametres:
+        equipe = _trouver_equipe(systeme, parametres['equipe'])
+        joueurs = [j for j in joueurs if j.equipe is equipe]
+    if 'poste' in parametres:
+        joueurs = [j for j in joueurs if j.poste.value == parametres['poste']]
+    return [_resume_joueur(j) for j in joueurs]
+
+
+def detailler_joueur(systeme, parametres, nom):
+    joueur = _trouver_joueur(systeme, nom)
+    return dict(_resume_joueur(joueur), origine=joueur.origine, annee_debut=joueur.annee_debut,
+                moyennes=joueur.calculer_moyennes(), records=joueur.obtenir_meilleures_stats(),
+                forme=systeme.obtenir_forme_joueur(joueur.nom))
+
+
+def lister_statistiques_joueur(systeme, parametres, nom):
+    """Historique du joueur saison par saison, y compris les saisons compactées"""
+    joueur = _trouver_joueur(systeme, nom)
+    lignes = []
+    for annee in _annees(systeme, parametres):
+        saison = systeme.obtenir_saison(annee)
+        if joueur.nom not in saison.noms_joueurs():
+            continue
+        if saison.etat in ('compactee', 'dechargee'):
+            lignes.extend(l[1:] for l in saison.lignes_statistiques() if l[0] == joueur.nom)
+            continue
+        premier_jour, jour_fin = saison.bornes
+        historique = joueur._statistiques
+        lignes.extend((t, p, pa, r, depuis_jour(jour))
+                      for t, p, pa, r, jour in zip(historique.temps_jeu, historique.points, historique.passes,
+                                                   historique.rebonds, historique.jour)
+                      if premier_jour <= jour < jour_fin)
+    return [{'date': d, 'temps_jeu': t, 'points': p, 'passes': pa, 'rebonds': r} for t, p, pa, r, d in lignes]
+
+
+def lister_matchs(systeme, parametres):
+    lignes = _lignes_matchs(systeme, parametres)
+    if 'equipe' in parametres:
+        nom = _trouver_equipe(systeme, parametres['equipe']).nom
+        lignes = (l for l in lignes if nom in (l[0], l[1]))
+    return [_match(l) for l in lignes]
+
+
+def classer_equipes(systeme, parametres):
+    saison = _entier(parametres, 'saison')
+    if saison is not None:
+        classement = systeme.obtenir_classement_saison(saison)
+    else:
+        classement = [(e, e.victoires, e.defaites) for e in systeme.obtenir_classement()]
+    return [dict({'rang': rang, 'equipe': e.nom}, **_bilan(v, d)) for rang, (e, v, d) in enumerate(classement, 1)]
+
+
+def classer_elo(systeme, parametres):
+    date_elo = parser_date(parametres['date']) if 'date' in parametres else None
+    return [{'rang': rang, 'equipe': equipe.nom, 'elo': round(note, 1)}
+            for rang, (equipe, note) in enumerate(systeme.obtenir_classement_elo(date_elo), 1)]
+
+
+def classer_joueurs(systeme, parametres):
+    critere = parametres.get('critere', 'points')
+    if critere not in CRITERES:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, f"Critère invalide: {critere}")
+    top = systeme.obtenir_top_joueurs(critere, len(systeme._joueurs_index), _entier(parametres, 'saison'))
+    return [dict(_resume_joueur(joueur), rang=rang, matchs=moyennes['matchs_joues'], valeur=moyennes[critere])
+            for rang, (joueur, moyennes) in enumerate(top, 1)]
+
+
+def comparer_equipes(systeme, parametres):
+    noms = (_trouver_equipe(systeme, _requis(parametres, 'equipe1')).nom,
+            _trouver_equipe(systeme, _requis(parametres, 'equipe2')).nom)
+    if noms[0] == noms[1]:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, "Les deux équipes doivent être différentes")
+    victoires = dict.fromkeys(noms, 0)
+    points = dict.fromkeys(noms, 0)
+    matchs = []
+    for ligne in _lignes_matchs(systeme, parametres):
+        if {ligne[0], ligne[1]} != set(noms):
+            continue
+        match = _match(ligne)
+        if match['vainqueur'] is not None:
+            victoires[match['vainqueur']] += 1
+        points[ligne[0]] += ligne[2]
+        points[ligne[1]] += ligne[3]
+        matchs.append(match)
+    return {'equipes': list(noms), 'victoires': victoires, 'points': points, 'matchs': matchs}
+
+
+ROUTES = [
+    (re.compile(r'/saisons'), lister_saisons),
+    (re.compile(r'/equipes'), lister_equipes),
+    (re.compile(r'/equipes/([^/]+)'), detailler_equipe),
+    (re.compile(r'/equipes/([^/]+)/matchs'), lister_matchs_equipe),
+    (re.compile(r'/joueurs'), lister_joueurs),
+    (re.compile(r'/joueurs/([^/]+)'), detailler_joueur),
+    (re.compile(r'/joueurs/([^/]+)/statistiques'), lister_statistiques_joueur),
+    (re.compile(r'/matchs'), lister_matchs),
+    (re.compile(r'/classement'), classer_equipes),
+    (re.compile(r'/classement/elo'), classer_elo),
+    (re.compile(r'/leaders'), classer_joueurs),
+    (re.compile(r'/face-a-face'), comparer_equipes),
+]
+
+
+def _paginer(lignes, parametres):
+    par_page = min(_entier(parametres, 'par_page', PAR_PAGE, minimum=1), MAX_PAR_PAGE)
+    page = _entier(parametres, 'page', 1, minimum=1)
+    debut = (page - 1) * par_page
+    return {
+        'donnees': lignes[debut:debut + par_page],
+        'page': page,
+        'par_page': par_page,
+        'total': len(lignes),
+        'pages': (len(lignes) + par_page - 1) // par_page,
+    }
+
+
+def _json_defaut(valeur):
+    if isinstance(valeur, (datetime, date)):
+        return valeur.strftime("%Y-%m-%d")
+    raise TypeError(f"Valeur non sérialisable: {valeur!r}")
+
+
+def repondre(systeme, chemin, parametres):
+    """Corps JSON (bytes) de la réponse à GET chemin?parametres"""
+    chemin = chemin.rstrip('/') or '/'
+    for motif, fonction in ROUTES:
+        correspondance = motif.fullmatch(chemin)
+        if correspondance:
+            break
+    else:
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, f"Ressource inconnue: {chemin}")
+
+    try:
+        resultat = fonction(systeme, parametres, *(unquote(g) for g in correspondance.groups()))
+    except ValidationError as e:
+        raise ErreurRequete(HTTPStatus.NOT_FOUND, str(e))
+    except ValueError as e:
+        raise ErreurRequete(HTTPStatus.BAD_REQUEST, str(e))
+    if isinstance(resultat, list):
+        resultat = _paginer(resultat, parametres)
+    return json.dumps(resultat, default=_json_defaut, ensure_ascii=False).encode('utf-8')
+
+
+class GestionnaireAPI(BaseHTTPRequestHandler):
+    """Traitement d'une requête HTTP (un thread par requête)"""
+
+    server_version = 'NBAApi/1.0'
+
+    def do_GET(self):
+        self._servir(avec_corps=True)
+
+    def do_HEAD(self):
+        self._servir(avec_corps=False)
+
+    def _servir(self, avec_corps):
+        url = urlsplit(self.path)
+        # Un paramètre répété garde sa dernière valeur
+        parametres = {nom: valeurs[-1] for nom, valeurs in parse_qs(url.query).items()}
+        try:
+            etag, corps = self.server.obtenir_reponse(url.path, parametres)
+        except ErreurRequete as e:
+            erreur = {'erreur': str(e)}
+            if e.suggestions is not None:
+                erreur['suggestions'] = e.suggestions
+            corps = json.dumps(erreur, ensure_ascii=False).encode('utf-8')
+            self._envoyer(e.statut, corps, avec_corps)
+            return
+
+        attendus = _etags(self.headers.get('If-None-Match'))
+        if etag in attendus or '*' in attendus:
+            self._envoyer(HTTPStatus.NOT_MODIFIED, b'', False, etag)
+        else:
+            self._envoyer(HTTPStatus.OK, corps, avec_corps, etag)
+
+    def _envoyer(self, statut, corps, avec_corps, etag=None):
+        self.send_response(statut)
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        if statut != HTTPStatus.NOT_MODIFIED:
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(corps)))
+        self.end_headers()
+        if avec_corps:
+            self.wfile.write(corps)
+
+    def log_message(self, format, *args):
+        if self.server.journaliser:
+            super().log_message(format, *args)
+
+
+def _etags(entete):
+    """ETags d'un en-tête If-None-Match (les ETags faibles W/ sont comparés comme forts)"""
+    if not entete:
+        return ()
+    return {e.strip().removeprefix('W/') for e in entete.split(',')}
+
+
+class ServeurAPI(ThreadingHTTPServer):
+    """Serveur HTTP de l'API, avec cache des réponses invalidé par le bus d'événements"""
+
+    daemon_threads = True
+
+    def __init__(self, systeme, hote='127.0.0.1', port=8000, taille_cache=256, journaliser=False):
+        super().__init__((hote, port), GestionnaireAPI)
+        self.systeme = systeme
+        self.journaliser = journaliser
+        # Sérialise requêtes et mutations: le système n'est pas prévu pour un accès concurrent
+        self.verrou = threading.RLock()
+        self._cache = CacheRequetes(taille_cache)
+        self._generation = 0
+        self._thread = None
+        # Non interne: une transaction en cours n'invalide le cache qu'une fois validée
+        self._abonnement = systeme.evenements.abonner(self._invalider, par_lots=True)
+
+    @property
+    def url(self):
+        hote, port = self.server_address[:2]
+        return f"http://{hote}:{port}"
+
+    def _invalider(self, evenements):
+        with self.verrou:
+            self._generation += 1
+
+    def obtenir_reponse(self, chemin, parametres):
+        """(ETag, corps JSON) de la réponse, calculée à la première demande depuis la dernière mutation"""
+        def calculer():
+            corps = repondre(self.systeme, chemin, parametres)
+            return f'"{hashlib.sha1(corps).hexdigest()[:20]}"', corps
+
+        with self.verrou:
+            cle = (self._generation, chemin.rstrip('/'), tuple(sorted(parametres.items())))
+            return self._cache.obtenir(cle, calculer)
+
+    def statistiques_cache(self):
+        with self.verrou:
+            return self._cache.statistiques()
+
+    def demarrer(self):
+        """Servir dans un thread d'arrière-plan; retourne l'URL du serveur"""
+        self._thread = threading.Thread(target=self.serve_forever, name='serveur-api', daemon=True)
+        self._thread.start()
+        return self.url
+
+    def fermer(self):
+        """Arrêter le serveur et se désabonner du bus"""
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.systeme.evenements.desabonner(self._abonnement)
+        self.server_close()
@@ -0,0 +1,95 @@
+import numpy as np
+from joueur import PosteJoueur
+
+
+# Caractéristiques par minute tirées de Joueur.calculer_moyennes: les moyennes par match
+# sont divisées par le temps de jeu moyen, l'efficacité est déjà une valeur par minute
+PAR_MATCH = ('points', 'passes', 'rebonds')
+CARACTERISTIQUES = PAR_MATCH + ('efficacite_moyenne',)
+POSTES = list(PosteJoueur)
+
+
+class IndexSimilarite:
+    """Recherche des joueurs au profil statistique le plus proche (k plus proches voisins)
+
+    Chaque joueur est décrit par ses moyennes par minute (points, passes,
+    rebonds, efficacité), centrées-réduites sur la ligue, et par son poste
+    (indicatrice pondérée). Les vecteurs sont conservés dans une matrice;
+    seules les lignes des joueurs dont le nombre de statistiques a changé
+    depuis le dernier calcul sont recalculées avant chaque requête.
+    """
+
+    def __init__(self, systeme, poids_poste=1.0):
+        self._systeme = systeme
+        self.poids_poste = poids_poste
+        self._noms = []
+        self._lignes = {}
+        self._valeurs = np.zeros((0, len(CARACTERISTIQUES)))
+        self._postes = np.zeros(0, dtype=np.int64)
+        # Nombre de lignes de statistiques prises en compte (-1: jamais calculé)
+        self._nb_statistiques = np.zeros(0, dtype=np.int64)
+
+    def _agrandir(self, capacite):
+        if capacite <= len(self._valeurs):
+            return
+        capacite = max(capacite, 2 * len(self._valeurs))
+        ajout = capacite - len(self._valeurs)
+        self._valeurs = np.vstack([self._valeurs, np.full((ajout, len(CARACTERISTIQUES)), np.nan)])
+        self._postes = np.concatenate([self._postes, np.zeros(ajout, dtype=np.int64)])
+        self._nb_statistiques = np.concatenate([self._nb_statistiques, np.full(ajout, -1, dtype=np.int64)])
+
+    def mettre_a_jour(self):
+        """Recalculer les vecteurs des nouveaux joueurs et de ceux ayant de nouvelles statistiques"""
+        joueurs = self._systeme._joueurs_index
+        self._agrandir(len(joueurs))
+        for nom, joueur in joueurs.items():
+            ligne = self._lignes.get(nom)
+            if ligne is None:
+                ligne = self._lignes[nom] = len(self._noms)
+                self._noms.append(nom)
+                self._postes[ligne] = POSTES.index(joueur.poste)
+            elif self._nb_statistiques[ligne] == len(joueur._statistiques):
+                continue
+
+            moyennes = joueur.calculer_moyennes()
+            if moyennes and moyennes['temps_jeu'] > 0:
+                self._valeurs[ligne] = ([moyennes[c] / moyennes['temps_jeu'] for c in PAR_MATCH]
+                                        + [moyennes['efficacite_moyenne']])
+            else:
+                self._valeurs[ligne] = np.nan
+            self._nb_statistiques[ligne] = len(joueur._statistiques)
+
+    def _matrice(self):
+        """Vecteurs centrés-réduits des joueurs avec statistiques, et masque de ces joueurs"""
+        n = len(self._noms)
+        valeurs = self._valeurs[:n]
+        actifs = ~np.isnan(valeurs[:, 0])
+
+        moyenne = valeurs[actifs].mean(axis=0) if actifs.any() else np.zeros(valeurs.shape[1])
+        ecart = valeurs[actifs].std(axis=0) if actifs.any() else np.ones(valeurs.shape[1])
+        ecart[ecart == 0] = 1.0
+
+        postes = np.zeros((n, len(POSTES)))
+        postes[np.arange(n), self._postes[:n]] = self.poids_poste
+        return np.hstack([(valeurs - moyenne) / ecart, postes]), actifs
+
+    def similaires(self, nom_joueur, k=5):
+        """Les k joueurs les plus proches: liste de (nom, distance) par distance croissante"""
+        self.mettre_a_jour()
+        ligne = self._lignes.get(nom_joueur)
+        if ligne is None:
+            raise KeyError(nom_joueur)
+
+        matrice, actifs = self._matrice()
+        if not actifs[ligne]:
+            return []
+        distances = np.sqrt(((matrice - matrice[ligne]) ** 2).sum(axis=1))
+        distances[~actifs] = np.inf
+        distances[ligne] = np.inf
+
+        k = min(k, int(actifs.sum()) - 1)
+        if k <= 0:
+            return []
+        proches = np.argpartition(distances, k - 1)[:k]
+        proches = proches[np.argsort(distances[proches], kind='stable')]
+        return [(self._noms[i], float(distances[i])) for i in proches]
@@ -0,0 +1,181 @@
+"""Simulation Monte-Carlo de la fin de saison (probabilités de playoffs et de places)
+
+Chaque lot de simulations tire une matrice (simulations x matchs restants) de
+résultats selon les probabilités Elo, puis obtient les victoires finales de
+chaque équipe par produit avec les matrices d'indicatrices domicile/extérieur
+(matchs x équipes). Les lots peuvent être répartis sur plusieurs processus;
+les générateurs aléatoires sont dérivés d'une même graine (SeedSequence.spawn),
+si bien que les résultats ne dépendent pas du nombre de processus.
+"""
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+
+TAILLE_LOT = 10000
+
+
+def _simuler_lot(probabilites, domicile, exterieur, victoires, nb_simulations, graine):
+    """Simuler un lot et retourner (histogramme des victoires, comptes des places)"""
+    rng = np.random.default_rng(graine)
+    nb_equipes = len(victoires)
+    victoires_max = len(probabilites) + int(victoires.max(initial=0))
+
+    # Indicatrices (matchs x équipes) de l'équipe à domicile et à l'extérieur
+    matchs = np.arange(len(probabilites))
+    indicatrices_domicile = np.zeros((len(probabilites), nb_equipes), dtype=np.float32)
+    indicatrices_exterieur = np.zeros((len(probabilites), nb_equipes), dtype=np.float32)
+    indicatrices_domicile[matchs, domicile] = 1
+    indicatrices_exterieur[matchs, exterieur] = 1
+
+    victoires_domicile = (rng.random((nb_simulations, len(probabilites)), dtype=np.float32)
+                          < probabilites).astype(np.float32)
+    finales = (victoires_domicile @ indicatrices_domicile
+               + (1 - victoires_domicile) @ indicatrices_exterieur).astype(np.int64) + victoires
+
+    # Histogramme des victoires finales par équipe
+    cles = np.arange(nb_equipes) * (victoires_max + 1) + finales
+    histogramme = np.bincount(cles.ravel(), minlength=nb_equipes * (victoires_max + 1))
+    histogramme = histogramme.reshape(nb_equipes, victoires_max + 1)
+
+    # Places: tri par victoires, égalités départagées au hasard
+    ordre = np.argsort(-(finales + rng.random(finales.shape) * 0.5), axis=1)
+    places = np.empty((nb_equipes, nb_equipes), dtype=np.int64)
+    for place in range(nb_equipes):
+        places[:, place] = np.bincount(ordre[:, place], minlength=nb_equipes)
+
+    return histogramme, places
+
+
+class ResultatSimulation:
+    """Distributions obtenues par simulation de la fin de saison"""
+
+    def __init__(self, noms_equipes, histogramme, places, nb_simulations, places_playoffs):
+        self.noms_equipes = list(noms_equipes)
+        # histogramme[i, v]: nombre de simulations où l'équipe i termine avec v victoires
+        self.histogramme = histogramme
+        # places[i, p]: nombre de simulations où l'équipe i termine à la place p (0 = première)
+        self.places = places
+        self.nb_simulations = nb_simulations
+        self.places_playoffs = places_playoffs
+
+    def victoires_moyennes(self):
+        """Nombre moyen de victoires finales par équipe"""
+        valeurs = np.arange(self.histogramme.shape[1])
+        moyennes = self.histogramme @ valeurs / self.nb_simulations
+        return dict(zip(self.noms_equipes, moyennes.tolist()))
+
+    def distribution_victoires(self, nom_equipe):
+        """Probabilité de chaque total de victoires pour une équipe: {victoires: probabilité}"""
+        ligne = self.histogramme[self.noms_equipes.index(nom_equipe)]
+        return {int(v): c / self.nb_simulations for v, c in enumerate(ligne.tolist()) if c}
+
+    def probabilites_playoffs(self):
+        """Probabilité de terminer dans les places qualificatives"""
+        probabilites = self.places[:, :self.places_playoffs].sum(axis=1) / self.nb_simulations
+        return dict(zip(self.noms_equipes, probabilites.tolist()))
+
+    def probabilites_places(self, nom_equipe):
+        """Probabilité de chaque place finale (1 = première) pour une équipe"""
+        ligne = self.places[self.noms_equipes.index(nom_equipe)]
+        return {p + 1: c / self.nb_simulations for p, c in enumerate(ligne.tolist()) if c}
+
+    def resume(self):
+        """Une ligne par équipe, par probabilité de playoffs décroissante"""
+        moyennes = self.victoires_moyennes()
+        playoffs = self.probabilites_playoffs()
+        premiere = self.places[:, 0] / self.nb_simulations
+        lignes = [{'equipe': nom, 'victoires_moyennes': moyennes[nom], 'playoffs': playoffs[nom],
+                   'premiere_place': float(premiere[i])}
+                  for i, nom in enumerate(self.noms_equipes)]
+        return sorted(lignes, key=lambda l: (l['playoffs'], l['victoires_moyennes']), reverse=True)
+
+
+class SimulateurSaison:
+    """Simulateur Monte-Carlo de la fin de saison à partir du classement actuel"""
+
+    def __init__(self, noms_equipes, victoires, notes, calendrier, avantage_domicile=100.0, places_playoffs=16):
+        self.noms_equipes = list(noms_equipes)
+        index = {nom: i for i, nom in enumerate(self.noms_equipes)}
+        try:
+            self._domicile = np.array([index[d] for d, _ in calendrier], dtype=np.int64)
+            self._exterieur = np.array([index[e] for _, e in calendrier], dtype=np.int64)
+        except KeyError as e:
+            raise ValueError(f"Équipe inconnue dans le calendrier: {e.args[0]}")
+        if np.any(self._domicile == self._exterieur):
+            raise ValueError("Une équipe ne peut pas jouer contre elle-même")
+
+        self._victoires = np.asarray(victoires, dtype=np.int64)
+        notes = np.asarray(notes, dtype=np.float64)
+        ecarts = notes[self._domicile] + avantage_domicile - notes[self._exterieur]
+        self._probabilites = (1.0 / (1.0 + 10 ** (-ecarts / 400.0))).astype(np.float32)
+        self.places_playoffs = min(places_playoffs, len(self.noms_equipes))
+
+    @classmethod
+    def depuis_systeme(cls, systeme, calendrier, places_playoffs=16, saison=None):
+        """Construire le simulateur à partir du bilan de la saison simulée (la dernière par défaut) et des notes Elo"""
+        noms = list(systeme._equipes)
+        bilans = bilans_saison(systeme, saison)
+        notes = dict((e.nom, note) for e, note in systeme.obtenir_classement_elo())
+        return cls(noms, [bilans[n][0] for n in noms], [notes[n] for n in noms],
+                   calendrier, systeme._elo.avantage_domicile, places_playoffs)
+
+    def simuler(self, nb_simulations=10000, graine=None, processus=1, taille_lot=TAILLE_LOT):
+        """Simuler la fin de saison nb_simulations fois
+
+        Les lots sont exécutés dans processus processus distincts si processus > 1.
+        """
+        if nb_simulations < 1:
+            raise ValueError("Le nombre de simulations doit être strictement positif")
+
+        tailles = [taille_lot] * (nb_simulations // taille_lot)
+        if nb_simulations % taille_lot:
+            tailles.append(nb_simulations % taille_lot)
+        graines = np.random.SeedSequence(graine).spawn(len(tailles))
+        arguments = [(self._probabilites, self._domicile, self._exterieur, self._victoires, n, g)
+                     for n, g in zip(tailles, graines)]
+
+        if processus > 1 and len(arguments) > 1:
+            with ProcessPoolExecutor(max_workers=processus) as executeur:
+                resultats = list(executeur.map(_simuler_lot, *zip(*arguments)))
+        else:
+            resultats = [_simuler_lot(*a) for a in arguments]
+
+        histogramme = sum(h for h, _ in resultats)
+        places = sum(p for _, p in resultats)
+        return ResultatSimulation(self.noms_equipes, histogramme, places, nb_simulations, self.places_playoffs)
+
+
+def bilans_saison(systeme, saison=None):
+    """Victoires et défaites de chaque équipe sur une saison (la dernière connue par défaut)
+
+    Les compteurs des équipes cumulent toutes les saisons: la simulation part
+    du bilan de la saison simulée.
+    """
+    if saison is None:
+        saisons = systeme.obtenir_saisons()
+        if not saisons:
+            return {nom: (0, 0) for nom in systeme._equipes}
+        saison = saisons[-1]
+    partition = systeme.obtenir_saison(saison)
+    return {nom: partition.bilan(nom) for nom in systeme._equipes}
+
+
+def completer_calendrier(systeme, matchs_par_equipe=82, graine=None, saison=None):
+    """Calendrier restant aléatoire amenant chaque équipe (au plus) à matchs_par_equipe matchs dans la saison"""
+    rng = random.Random(graine)
+    places = []
+    for nom, (victoires, defaites) in bilans_saison(systeme, saison).items():
+        places.extend([nom] * max(0, matchs_par_equipe - victoires - defaites))
+    rng.shuffle(places)
+
+    calendrier = []
+    while len(places) >= 2:
+        domicile = places.pop()
+        # Chercher un adversaire différent; abandonner la place si aucun n'existe
+        for i in range(len(places) - 1, -1, -1):
+            if places[i] != domicile:
+                calendrier.append((domicile, places.pop(i)))
+                break
+    return calendrier
@@ -1,16 +1,55 @@
+from array import array
 from datetime import datetime
+from dates import vers_jour, depuis_jour
+
+# Colonnes de comptage: entières, sauf si une valeur non entière doit y être rangée
+COMPTAGES = ('points', 'passes', 'rebonds')
+
+
+def convertir_comptage(valeur):
+    """Points, passes ou rebonds à conserver: entier si la valeur est entière, réel sinon"""
+    if isinstance(valeur, float) and valeur.is_integer():
+        return int(valeur)
+    return valeur
+
+
+def colonne_comptage(colonne, valeurs):
+    """Colonne capable de recevoir les valeurs: passée en réels ('d') si l'une n'est pas entière
+
+    Les moyennes (données d'exemple, anciennes sauvegardes) ont des points,
+    passes ou rebonds décimaux; seuls les historiques qui en contiennent
+    paient les 8 octets par valeur.
+    """
+    if colonne.typecode != 'd' and any(isinstance(v, float) for v in valeurs):
+        return array('d', colonne)
+    return colonne
+
 
 class StatistiqueJoueur:
     """Classe représentant les statistiques d'un joueur pour un match"""
 
+    __slots__ = ('_temps_jeu', '_points', '_passes', '_rebonds', '_jour')
+
     def __init__(self, temps_jeu, points, passes, rebonds, date_match=None):
         self._valider_statistiques(temps_jeu, points, passes, rebonds)
 
         self._temps_jeu = temps_jeu  # en minutes
-        self._points = points
-        self._passes = passes  # passes décisives
-        self._rebonds = rebonds
-        self._date_match = date_match or datetime.now()
+        self._points = convertir_comptage(points)
+        self._passes = convertir_comptage(passes)  # passes décisives
+        self._rebonds = convertir_comptage(rebonds)
+        # Date conservée sous forme d'ordinal de jour, datetime recréé à la lecture
+        self._jour = vers_jour(date_match or datetime.now())
+
+    @classmethod
+    def _depuis_colonnes(cls, temps_jeu, points, passes, rebonds, jour):
+        """Recréer une ligne déjà validée à partir des colonnes d'un historique"""
+        stat = cls.__new__(cls)
+        stat._temps_jeu = temps_jeu
+        stat._points = points
+        stat._passes = passes
+        stat._rebonds = rebonds
+        stat._jour = jour
+        return stat
 
     def _valider_statistiques(self, temps_jeu, points, passes, rebonds):
         """Valide les statistiques fournies"""
@@ -41,7 +80,12 @@ class StatistiqueJoueur:
 
     @property
     def date_match(self):
-        return self._date_match
+        return depuis_jour(self._jour)
+
+    @property
+    def jour(self):
+        """Ordinal du jour du match (date.toordinal)"""
+        return self._jour
 
     def calculer_efficacite(self):
         """Calcule un indice d'efficacité simple"""
@@ -51,3 +95,123 @@ class StatistiqueJoueur:
 
     def __str__(self):
         return f"Stats: {self._points}pts, {self._passes}pd, {self._rebonds}reb en {self._temps_jeu}min"
+
+
+class HistoriqueStatistiques:
+    """Lignes de statistiques d'un joueur rangées en colonnes typées (array)
+
+    Se comporte comme une liste de StatistiqueJoueur en lecture: chaque accès
+    recrée l'objet à partir des colonnes, qui occupent 24 octets par ligne au
+    lieu d'un objet, d'un float et d'un datetime par ligne. Une ligne est
+    ajoutée à toutes les colonnes ou à aucune.
+    """
+
+    __slots__ = ('temps_jeu', 'points', 'passes', 'rebonds', 'jour')
+
+    def __init__(self, statistiques=()):
+        self.temps_jeu = array('d')
+        self.points = array('i')
+        self.passes = array('i')
+        self.rebonds = array('i')
+        self.jour = array('i')
+        for stat in statistiques:
+            self.append(stat)
+
+    def append(self, stat):
+        """Ajouter une ligne à la fin de l'historique"""
+        self.etendre((stat.temps_jeu,), (stat.points,), (stat.passes,), (stat.rebonds,), (stat.jour,))
+
+    def etendre(self, temps_jeu, points, passes, rebonds, jours):
+        """Ajouter des lignes déjà validées, fournies colonne par colonne (séquences)"""
+        for nom, valeurs in zip(COMPTAGES, (points, passes, rebonds)):
+            setattr(self, nom, colonne_comptage(getattr(self, nom), valeurs))
+        longueur = len(self.jour)
+        try:
+            self.temps_jeu.extend(temps_jeu)
+            self.points.extend(points)
+            self.passes.extend(passes)
+            self.rebonds.extend(rebonds)
+            self.jour.extend(jours)
+        except BaseException:
+            # Valeur refusée par une colonne: les colonnes déjà étendues sont remises à longueur
+            for nom in HistoriqueStatistiques.__slots__:
+                del getattr(self, nom)[longueur:]
+            raise
+
+    def retirer_dernieres(self, nombre):
+        """Retirer les dernières lignes ajoutées (annulation d'une transaction)"""
+        if nombre:
+            for nom in HistoriqueStatistiques.__slots__:
+                del getattr(self, nom)[-nombre:]
+
+    def __len__(self):
+        return len(self.jour)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return StatistiqueJoueur._depuis_colonnes(self.temps_jeu[index], self.points[index], self.passes[index],
+                                                  self.rebonds[index], self.jour[index])
+
+    def __iter__(self):
+        return map(StatistiqueJoueur._depuis_colonnes, self.temps_jeu, self.points, self.passes,
+                   self.rebonds, self.jour)
+
+    def totaux(self):
+        """(matchs, temps, points, passes, rebonds, somme des efficacités) de l'historique"""
+        efficacite = sum((p + pa + r) / t if t else 0
+                         for t, p, pa, r in zip(self.temps_jeu, self.points, self.passes, self.rebonds))
+        return (len(self), sum(self.temps_jeu), sum(self.points), sum(self.passes), sum(self.rebonds),
+                efficacite)
+
+    def retirer_periode(self, premier_jour, jour_fin):
+        """Retirer les lignes datées de premier_jour inclus à jour_fin exclu; retourne leur nombre"""
+        conserves = [i for i, jour in enumerate(self.jour) if not premier_jour <= jour < jour_fin]
+        retires = len(self) - len(conserves)
+        if retires:
+            for nom in HistoriqueStatistiques.__slots__:
+                colonne = getattr(self, nom)
+                setattr(self, nom, array(colonne.typecode, [colonne[i] for i in conserves]))
+        return retires
+
+
+class HistoriqueDiffere(HistoriqueStatistiques):
+    """Historique dont les lignes ne sont lues qu'au premier accès à une colonne
+
+    Le nombre de lignes et les totaux sont connus dès la création (index de
+    la sauvegarde), si bien que les moyennes ne déclenchent pas la lecture.
+    charger() retourne les lignes (temps, points, passes, rebonds, jour).
+    """
+
+    __slots__ = ('_charger', '_nb_lignes', '_totaux')
+
+    def __init__(self, nb_lignes, totaux, charger):
+        self._charger = charger
+        self._nb_lignes = nb_lignes
+        self._totaux = tuple(totaux)
+
+    @property
+    def charge(self):
+        return self._charger is None
+
+    def __getattr__(self, nom):
+        # Appelé seulement pour une colonne pas encore lue (slot vide)
+        if nom in HistoriqueStatistiques.__slots__ and self._charger is not None:
+            self._materialiser()
+            return getattr(self, nom)
+        raise AttributeError(nom)
+
+    def _materialiser(self):
+        lignes = self._charger()
+        HistoriqueStatistiques.__init__(self)
+        if lignes:
+            self.etendre(*zip(*lignes))
+        self._charger = None
+
+    def __len__(self):
+        return self._nb_lignes if self._charger is not None else len(self.jour)
+
+    def totaux(self):
+        if self._charger is not None:
+            return self._totaux
+        return super().totaux()
@@ -0,0 +1,36 @@
+class JournalAnnulation:
+    """Journal d'annulation (undo log) des transactions de NBASystem
+
+    Chaque modification faite dans une transaction y note une fonction qui la
+    défait, ainsi que les entités touchées. Annuler coûte donc un appel par
+    modification, sans copie préalable du système; les noms touchés servent
+    ensuite à remettre en état les structures dérivées.
+    """
+
+    __slots__ = ('_entrees',)
+
+    def __init__(self):
+        self._entrees = []
+
+    def __len__(self):
+        return len(self._entrees)
+
+    def noter(self, annuler, joueurs=(), equipes=(), matchs=()):
+        """Noter une modification: fonction qui la défait, noms des joueurs et équipes, matchs ajoutés"""
+        self._entrees.append((annuler, joueurs, equipes, matchs))
+
+    def annuler_depuis(self, position):
+        """Défaire, de la plus récente à la plus ancienne, les modifications notées depuis position
+
+        Retourne (noms des joueurs, noms des équipes, matchs retirés) touchés
+        par les modifications défaites.
+        """
+        entrees = self._entrees[position:]
+        del self._entrees[position:]
+        joueurs, equipes, matchs = set(), set(), []
+        for annuler, noms_joueurs, noms_equipes, matchs_ajoutes in reversed(entrees):
+            annuler()
+            joueurs.update(noms_joueurs)
+            equipes.update(noms_equipes)
+            matchs.extend(matchs_ajoutes)
+        return joueurs, equipes, matchs